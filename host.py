@@ -0,0 +1,126 @@
+"""
+L'IA Survivante - Hébergement de plusieurs lives
+Fait tourner plusieurs lives TikTok dans un seul processus, avec un pool
+de workers de narration et un client Ollama partagés (voir src/stream_host.py),
+ou les répartit sur plusieurs processus (voir src/stream_supervisor.py)
+
+Usage:
+    python host.py streams.json
+    python host.py streams.json --workers 6 --max-per-stream 2
+    python host.py streams.json --processes 0              # un processus par cœur
+
+Format de streams.json (une entrée par live):
+    [
+        {"name": "alice", "username": "@alice"},
+        {"name": "bob", "username": "@bob", "output_dir": "obs_bob", "overlay_port": 8101,
+         "config": {"MONSTER_ATTACK_DAMAGE": 10}}
+    ]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import signal
+import sys
+
+from src.config import GameConfig
+from src.stream_host import STREAMS_DIR, StreamHost, overlay_url
+from src.stream_supervisor import StreamSupervisor
+
+
+def load_streams(path: str) -> list:
+    """
+    Lit la liste des lives à héberger
+
+    Args:
+        path: Fichier JSON (liste d'objets avec au moins "name" et "username")
+
+    Returns:
+        Entrées des lives
+
+    Raises:
+        ValueError: Si une entrée est incomplète
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        streams = json.load(f)
+    if not isinstance(streams, list):
+        raise ValueError("le fichier doit contenir une liste de lives")
+    for entry in streams:
+        if not isinstance(entry, dict) or not entry.get("name") or not entry.get("username"):
+            raise ValueError(f"entrée invalide (name et username obligatoires): {entry}")
+    return streams
+
+
+async def main(args):
+    """Démarre l'hôte et ses lives jusqu'au signal d'arrêt"""
+    host = StreamHost(workers=args.workers, max_per_stream=args.max_per_stream)
+    for entry in load_streams(args.streams):
+        stream = host.add_stream_spec(entry)
+        config = stream.engine.config
+        print(f"📺 {stream.name} (@{stream.username.lstrip('@')}) -> {stream.output_dir}"
+              f"{f', overlay port {config.OVERLAY_PUSH_PORT}' if config.OVERLAY_PUSH_ENABLED else ''}")
+        print(f"   🌐 {overlay_url(config.OBS_JSON_STATE_FILE, config.OVERLAY_PUSH_PORT)}")
+
+    # Configurer les handlers de signaux pour un arrêt propre
+    loop = asyncio.get_event_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        try:
+            loop.add_signal_handler(sig, lambda: asyncio.create_task(host.stop()))
+        except NotImplementedError:
+            # Windows ne supporte pas add_signal_handler
+            pass
+
+    await host.run()
+
+
+async def main_supervised(args):
+    """Répartit les lives sur plusieurs processus jusqu'au signal d'arrêt"""
+    supervisor = StreamSupervisor(args.processes or None, workers_per_process=args.workers,
+                                  max_per_stream=args.max_per_stream)
+    for entry in load_streams(args.streams):
+        index = supervisor.add_stream(entry)
+        print(f"📺 {entry['name']} (@{entry['username'].lstrip('@')}) -> processus {index}")
+        spec = supervisor.shards[index].specs[-1]
+        output_dir = spec.get("output_dir") or os.path.join(STREAMS_DIR, spec["name"])
+        state_file = spec.get("config", {}).get(
+            "OBS_JSON_STATE_FILE", os.path.join(output_dir, os.path.basename(GameConfig.OBS_JSON_STATE_FILE))
+        )
+        print(f"   🌐 {overlay_url(state_file, spec['overlay_port'])}")
+
+    loop = asyncio.get_event_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        try:
+            loop.add_signal_handler(sig, lambda: asyncio.create_task(supervisor.stop()))
+        except NotImplementedError:
+            pass
+
+    await supervisor.run()
+    totals = supervisor.get_stats()["totals"]
+    print(f"📊 {totals['streams']} lives, {sum(totals['events'].values())} événements, "
+          f"{totals['restarts']} relances de processus")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Héberge plusieurs lives dans un seul processus")
+    parser.add_argument("streams", help="Fichier JSON des lives à héberger")
+    parser.add_argument("--workers", type=int, default=GameConfig.NARRATION_WORKERS,
+                        help="Générations en parallèle, tous lives confondus (par processus avec --processes)")
+    parser.add_argument("--max-per-stream", type=int, default=None,
+                        help="Générations simultanées max pour un même live")
+    parser.add_argument("--processes", type=int, default=1,
+                        help="Processus entre lesquels répartir les lives (0: un par cœur)")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.streams):
+        print(f"❌ Fichier introuvable: {args.streams}")
+        sys.exit(1)
+
+    try:
+        asyncio.run(main(args) if args.processes == 1 else main_supervised(args))
+    except KeyboardInterrupt:
+        print("\n👋 Au revoir !")
+        sys.exit(0)
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
@@ -3,6 +3,9 @@ L'IA Survivante - Jeu TikTok Live Interactif
 Point d'entrée principal de l'application
 """
 
+import time
+STARTED_AT = time.perf_counter()
+
 import asyncio
 import signal
 import sys
@@ -35,13 +38,18 @@ class Application:
             print("⚙️  Initialisation du listener TikTok...")
             self.tiktok_listener = TikTokListener(self.game_engine)
             
-            # Démarrer la connexion TikTok
-            await self.tiktok_listener.start()
+            # Démarrer le moteur de jeu en premier: fichiers OBS et overlay prêts,
+            # événements acceptés pendant l'import de TikTokLive et la connexion
+            engine_task = asyncio.create_task(self.game_engine.start())
+            await self.game_engine.ready.wait()
+            print(f"⚡ Moteur prêt en {(time.perf_counter() - STARTED_AT) * 1000:.0f} ms")
             
             # Marquer comme en cours d'exécution
             self.running = True
             
-            # Démarrer le moteur de jeu (traitement de la queue API)
+            # Démarrer la connexion TikTok
+            await self.tiktok_listener.start()
+            
             print()
             print("=" * 50)
             print("✅ Système opérationnel !")
@@ -50,7 +58,7 @@ class Application:
             print("=" * 50)
             print()
             
-            await self.game_engine.start()
+            await engine_task
             
         except KeyboardInterrupt:
             print("\n⏸️  Interruption demandée par l'utilisateur")
@@ -69,14 +77,14 @@ class Application:
         
         self.running = False
         
-        # Arrêter le moteur de jeu
-        if self.game_engine:
-            self.game_engine.stop()
-        
-        # Déconnecter de TikTok
+        # Déconnecter de TikTok (les événements en file sont appliqués au moteur encore actif)
         if self.tiktok_listener:
             await self.tiktok_listener.stop()
         
+        # Arrêter le moteur de jeu (dernier état écrit après les derniers événements)
+        if self.game_engine:
+            self.game_engine.stop()
+        
         print("✅ Application arrêtée proprement")
     
     def handle_signal(self, signum, frame):
@@ -0,0 +1,179 @@
+"""
+Rejeu d'un live enregistré pour L'IA Survivante
+Injecte les événements d'un journal (voir EVENT_RECORD_FILE) dans le moteur de jeu,
+à vitesse réelle, accélérée ou maximale, puis affiche le comportement des files
+
+Usage:
+    python replay.py data/recordings/live.jsonl            # vitesse réelle
+    python replay.py data/recordings/live.jsonl --speed 4  # 4x plus vite
+    python replay.py data/recordings/live.jsonl --speed max
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+from src.config import GameConfig
+from src.event_recorder import load_recording
+from src.game_engine import GameEngine
+from src.tiktok_listener import TikTokListener
+
+
+def parse_speed(value: str) -> float:
+    """Vitesse de rejeu: un facteur (1, 2.5...) ou "max" (sans attente)"""
+    if value.lower() == "max":
+        return 0.0
+    speed = float(value)
+    if speed <= 0:
+        raise argparse.ArgumentTypeError("la vitesse doit être positive (ou 'max')")
+    return speed
+
+
+def replay_config(output_dir: str, base=GameConfig):
+    """
+    Configuration isolée du rejeu: rien n'est écrit dans les fichiers du live
+
+    Args:
+        output_dir: Dossier des fichiers OBS du rejeu (temporaire)
+        base: Configuration de départ
+
+    Returns:
+        Configuration sans overlay poussé, sauvegarde d'état, réserve de noms ni journaux sur disque
+    """
+    return base.with_overrides(
+        OBS_LAST_ACTION_FILE=os.path.join(output_dir, os.path.basename(base.OBS_LAST_ACTION_FILE)),
+        OBS_STATS_FILE=os.path.join(output_dir, os.path.basename(base.OBS_STATS_FILE)),
+        OBS_JSON_STATE_FILE=os.path.join(output_dir, os.path.basename(base.OBS_JSON_STATE_FILE)),
+        OVERLAY_PUSH_ENABLED=False,
+        STATE_DIR=None,
+        MONSTER_NAME_POOL_FILE=None,
+        TRACE_LOG_FILE=None,
+        EVENT_RECORD_FILE=None,
+    )
+
+
+async def replay(path: str, speed: float, drain_timeout: float) -> dict:
+    """
+    Rejoue un journal d'événements dans un moteur de jeu neuf (voir replay_config)
+
+    Args:
+        path: Journal JSON Lines produit par EventRecorder
+        speed: Facteur de vitesse (0: aussi vite que possible)
+        drain_timeout: Secondes max d'attente des narrations après le dernier événement
+
+    Returns:
+        Statistiques du rejeu (événements, durées, files d'ingestion et de narration)
+    """
+    with tempfile.TemporaryDirectory(prefix="replay-") as output_dir:
+        return await _replay(GameEngine(replay_config(output_dir)), path, speed, drain_timeout)
+
+
+async def _replay(game: GameEngine, path: str, speed: float, drain_timeout: float) -> dict:
+    """Rejoue le journal dans le moteur donné, puis l'arrête"""
+    listener = TikTokListener(game, record_path=None)
+    engine_task = asyncio.create_task(game.start())
+    listener.start_consumer()
+
+    # Démarrage du rejeu: le premier événement part tout de suite
+    loop = asyncio.get_running_loop()
+    started_at = loop.time()
+    first_offset = None
+    max_lag = 0.0
+    replayed = 0
+
+    for offset, event in load_recording(path):
+        if first_offset is None:
+            first_offset = offset
+        if speed:
+            due = started_at + (offset - first_offset) / speed
+            delay = due - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            else:
+                max_lag = max(max_lag, -delay)
+        else:
+            # Vitesse max: rendre la main pour que le consommateur avance
+            await asyncio.sleep(0)
+        event.received_at = time.monotonic()
+        listener.ingest(event)
+        replayed += 1
+
+    feed_duration = loop.time() - started_at
+
+    # Appliquer ce qui reste dans la file, puis attendre l'affichage des narrations
+    await listener.stop()
+    drain_deadline = loop.time() + drain_timeout
+    while game.pending_narration_count() and loop.time() < drain_deadline:
+        await asyncio.sleep(0.1)
+    total_duration = loop.time() - started_at
+
+    stats = {
+        "events": replayed,
+        "feed_duration": feed_duration,
+        "total_duration": total_duration,
+        "max_lag": max_lag,
+        "ingestion": listener.ingestion.get_stats(),
+        "narrations": game.api_queue.get_stats(),
+        "narrations_pending": game.pending_narration_count(),
+        "narrations_coalesced": game.narrations_coalesced,
+        "tracing": game.tracer.get_stats() if game.tracer else None,
+    }
+
+    game.stop()
+    engine_task.cancel()
+    try:
+        await engine_task
+    except asyncio.CancelledError:
+        pass
+    return stats
+
+
+def print_report(stats: dict):
+    """Affiche le bilan du rejeu"""
+    ingestion = stats["ingestion"]
+    print()
+    print("=" * 60)
+    print("📼 BILAN DU REJEU")
+    print("=" * 60)
+    print(f"Événements rejoués : {stats['events']} en {stats['feed_duration']:.2f}s "
+          f"(retard max sur le journal: {stats['max_lag'] * 1000:.0f} ms)")
+    print(f"Durée totale       : {stats['total_duration']:.2f}s")
+    print(f"Ingestion          : profondeur max {ingestion['max_depth']}, "
+          f"{ingestion['coalesced']} fusionnés, {ingestion['dropped']} ignorés")
+    print(f"Latence ingestion  : moy {ingestion['latency_avg'] * 1000:.1f} ms, "
+          f"p95 {ingestion['latency_p95'] * 1000:.1f} ms, max {ingestion['latency_max'] * 1000:.1f} ms")
+    print(f"Narrations         : {stats['narrations_coalesced']} fusionnées, "
+          f"{stats['narrations_pending']} encore en attente")
+    for name, queue in stats["narrations"].items():
+        print(f"  - {name:<8}: {queue['dequeued']} traitées, {queue['expired']} expirées, "
+              f"attente moy {queue['wait_avg']:.2f}s / max {queue['wait_max']:.2f}s")
+    if stats["tracing"]:
+        print("Latence de bout en bout (réception -> écriture):")
+        for kind, total in stats["tracing"]["total"].items():
+            print(f"  - {kind:<8}: p50 {total['p50_ms']:.0f} ms, p95 {total['p95_ms']:.0f} ms, "
+                  f"p99 {total['p99_ms']:.0f} ms, max {total['max_ms']:.0f} ms ({total['count']} événements)")
+
+
+def main():
+    """Point d'entrée du rejeu en ligne de commande"""
+    parser = argparse.ArgumentParser(description="Rejoue un live enregistré dans le moteur de jeu")
+    parser.add_argument("recording", help="Journal JSON Lines (voir EVENT_RECORD_FILE)")
+    parser.add_argument("--speed", type=parse_speed, default=1.0,
+                        help="Facteur de vitesse (1 = temps réel) ou 'max'")
+    parser.add_argument("--drain-timeout", type=float, default=60.0,
+                        help="Secondes max d'attente des narrations après le dernier événement")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.recording):
+        print(f"❌ Journal introuvable: {args.recording}")
+        sys.exit(1)
+    
+    stats = asyncio.run(replay(args.recording, args.speed, args.drain_timeout))
+    print_report(stats)
+
+
+if __name__ == "__main__":
+    main()
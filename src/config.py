@@ -1,6 +1,6 @@
 """
 Configuration pour L'IA Survivante
-Contient les paramètres du jeu, le prompt système et les mappings de cadeaux
+Contient les paramètres du jeu et le prompt système (cadeaux: voir src/gift_catalog.py)
 """
 
 import os
@@ -13,8 +13,8 @@ load_dotenv()
 # CONFIGURATION OLLAMA (IA LOCALE)
 # ============================================================================
 
-# URL de l'API Ollama locale
-OLLAMA_API_URL = "http://localhost:11434/api/generate"
+# URL de l'API Ollama locale (ou du faux serveur: python -m src.fake_ollama)
+OLLAMA_API_URL = os.getenv("OLLAMA_API_URL", "http://localhost:11434/api/generate")
 
 # Modèle Ollama à utiliser (léger et rapide)
 OLLAMA_MODEL = "llama3.2:3b"
@@ -61,115 +61,111 @@ class GameConfig:
     
     # Progression
     XP_PER_LEVEL = 100  # XP nécessaire pour passer au niveau suivant
+    MAX_HP_PER_LEVEL = 10  # HP max gagnés à chaque niveau
     
     # Likes
     LIKE_HEAL_AMOUNT = 1  # HP régénérés par like
     LIKE_THRESHOLD_FOR_REACTION = 50  # Réaction spéciale tous les X likes
+    LIKE_AGGREGATION_WINDOW = 0.25  # Secondes de likes regroupés en un seul traitement (0: aucun)
+    
+    # File d'ingestion entre le listener TikTok et le moteur
+    INGEST_QUEUE_SIZE = 1000  # Événements en attente avant application de la politique de débordement
+    # Politique si la file est pleine: "coalesce" (fusion), "keep" (jamais perdu), "drop" (ignoré)
+    INGEST_OVERFLOW_POLICY = {"like": "coalesce", "gift": "keep", "comment": "drop"}
+    
+    # Enregistrement des événements du live (rejouables avec replay.py)
+    EVENT_RECORD_FILE = os.getenv("EVENT_RECORD_FILE") or None  # ex: "data/recordings/live.jsonl"
+    
+    # Traçage de latence (réception -> application -> file -> LLM -> affichage -> écriture)
+    TRACING_ENABLED = True  # Histogrammes par étape, affichés à l'arrêt
+    TRACE_LOG_FILE = os.getenv("TRACE_LOG_FILE") or None  # Journal par événement, ex: "data/traces.jsonl"
+    
+    # Sauvegarde de l'état (reprise exacte après un crash): journal des changements + snapshots
+    STATE_DIR = os.getenv("STATE_DIR") or None  # ex: "data/state" (None: pas de sauvegarde)
+    STATE_SNAPSHOT_INTERVAL = 30.0  # Secondes max entre deux snapshots
+    STATE_SNAPSHOT_EVERY = 500  # Entrées du journal max entre deux snapshots
+    STATE_FSYNC = False  # fsync à chaque entrée (résiste aussi aux coupures de courant, plus lent)
     
     # Monster Attacks
     MONSTER_ATTACK_DAMAGE = 25  # Dégâts infligés au joueur par le monstre
     MONSTER_ATTACK_INTERVAL = 10  # Secondes entre chaque attaque
     
-    # Cooldown API
-    API_COOLDOWN_SECONDS = 2.0  # Temps minimum entre 2 appels API
+    # Réserve de noms de monstres (générés à l'avance pendant les temps morts)
+    MONSTER_NAME_POOL_SIZE = 10  # Noms gardés d'avance
+    MONSTER_NAME_POOL_FILE = "data/monster_names.json"  # Conservés entre deux lives
+    MONSTER_NAME_REFILL_INTERVAL = 2.0  # Secondes entre 2 vérifications de la réserve
+    
+    # Narrations
+    NARRATION_WORKERS = 3  # Générations en parallèle (aligner sur OLLAMA_NUM_PARALLEL)
+    MIN_ACTION_DISPLAY_SECONDS = 2.0  # Temps minimum d'affichage d'une narration
+    
+    # Fusion des narrations de cadeaux en attente (combos, vagues de cadeaux)
+    NARRATION_COALESCE_ACROSS_USERS = True  # Fusionner aussi le même cadeau de viewers différents
+    NARRATION_COALESCE_WINDOW = 3.0  # Fenêtre (secondes) de fusion entre viewers différents
+    
+    # Priorités des narrations: les cadeaux de valeur passent devant,
+    # les narrations trop anciennes sont remplacées par un texte sans IA
+    NARRATION_PRIORITY_NAMES = {0: "likes", 1: "commun", 2: "rare", 3: "épique"}
+    NARRATION_MAX_WAIT = {0: 10.0, 1: 20.0, 2: 45.0, 3: None}  # Secondes (None: jamais expirée)
+    
+    # Catalogue des cadeaux TikTok (index par identifiant, nom normalisé et alias, voir src/gift_catalog.py)
+    GIFT_CATALOG_FILE = os.getenv("GIFT_CATALOG_FILE") or os.path.join(
+        os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "assets", "gifts.json"
+    )
+    # Classes de valeur des cadeaux: valeur min (pièces TikTok), priorité de narration,
+    # dégâts au monstre par cadeau, HP/XP des cadeaux sans effets propres dans le catalogue
+    GIFT_VALUE_TIERS = {
+        "épique": {"min_value": 1000, "priority": 3, "damage": 25, "hp": 40, "xp": 100},
+        "rare": {"min_value": 500, "priority": 2, "damage": 10, "hp": 25, "xp": 50},
+        "moyen": {"min_value": 100, "priority": 1, "damage": 5, "hp": 12, "xp": 25},
+        "commun": {"min_value": 0, "priority": 1, "damage": 2, "hp": 5, "xp": 10},
+    }
+    
+    # Cache des narrations de cadeaux similaires (réponse instantanée, sans appel LLM)
+    NARRATION_CACHE_ENABLED = True
+    NARRATION_CACHE_SIZE = 256  # Signatures conservées (LRU)
+    NARRATION_CACHE_VARIANTS = 3  # Variantes générées par signature avant réutilisation
+    NARRATION_CACHE_TTL = 900.0  # Durée de vie d'une variante (secondes)
+    
+    # Streaming des narrations (affichage progressif pendant la génération)
+    OLLAMA_STREAMING = True
+    STREAM_UPDATE_INTERVAL = 0.25  # Secondes min entre 2 mises à jour du texte partiel
+    
+    # Client HTTP Ollama (pool de connexions partagé)
+    OLLAMA_MAX_CONNECTIONS = 4  # Requêtes simultanées max vers Ollama
+    OLLAMA_TIMEOUT = 60.0  # Timeout d'une narration (secondes)
+    OLLAMA_CONNECT_TIMEOUT = 5.0  # Timeout de connexion (secondes)
+    MONSTER_NAME_TIMEOUT = 10.0  # Timeout de génération d'un nom de monstre (secondes)
     
     # Fichiers OBS
     OBS_LAST_ACTION_FILE = "obs_files/last_action.txt"
     OBS_STATS_FILE = "obs_files/stats.txt"
-
-
-# ============================================================================
-# MAPPING DES CADEAUX TIKTOK
-# ============================================================================
-
-GIFT_ACTIONS = {
-    # Format: "nom_du_cadeau": {"hp": X, "xp": Y, "description": "text"}
-    
-    # Cadeaux communs (1-100 pièces)
-    "Rose": {
-        "hp": 5,
-        "xp": 10,
-        "action": "attaque un monstre avec la rose enchantée"
-    },
-    "TikTok": {
-        "hp": 3,
-        "xp": 5,
-        "action": "utilise le logo TikTok comme bouclier magique"
-    },
-    "Heart": {
-        "hp": 8,
-        "xp": 15,
-        "action": "absorbe l'énergie du coeur pour se régénérer"
-    },
-    "Finger Heart": {
-        "hp": 5,
-        "xp": 8,
-        "action": "lance un sort d'amour pour apaiser les monstres"
-    },
-    
-    # Cadeaux moyens (100-500 pièces)
-    "Perfume": {
-        "hp": 15,
-        "xp": 30,
-        "action": "utilise le parfum pour endormir les gardes"
-    },
-    "Football": {
-        "hp": 12,
-        "xp": 25,
-        "action": "lance le ballon pour déclencher un piège à distance"
-    },
-    "Sunglasses": {
-        "hp": 10,
-        "xp": 20,
-        "action": "porte les lunettes pour voir les passages secrets"
-    },
-    
-    # Cadeaux rares (500-1000 pièces)
-    "Swan": {
-        "hp": 25,
-        "xp": 50,
-        "action": "chevauche le cygne pour traverser une rivière de lave"
-    },
-    "Gaming Keyboard": {
-        "hp": 20,
-        "xp": 45,
-        "action": "hack le système de sécurité du donjon"
-    },
-    
-    # Cadeaux épiques (1000+ pièces)
-    "Lion": {
-        "hp": 40,
-        "xp": 100,
-        "action": "invoque un lion spirituel qui terrasse les ennemis"
-    },
-    "Falcon": {
-        "hp": 35,
-        "xp": 90,
-        "action": "envoie le faucon en reconnaissance pour éviter les pièges"
-    },
-    "Drama Queen": {
-        "hp": 50,
-        "xp": 120,
-        "action": "utilise l'énergie dramatique pour détruire un mur"
-    },
-    
-    # Cadeau par défaut pour les cadeaux non mappés
-    "default": {
-        "hp": 5,
-        "xp": 10,
-        "action": "utilise ce cadeau mystérieux avec ingéniosité"
-    }
-}
-
-
-def get_gift_info(gift_name: str) -> dict:
-    """
-    Récupère les informations d'un cadeau
+    OBS_JSON_STATE_FILE = "obs_files/game_state.json"
+    STATE_FLUSH_INTERVAL = 0.075  # Secondes entre 2 écritures des fichiers OBS (max)
+    OBS_WRITER_QUEUE_SIZE = 4  # Snapshots en attente pour le thread d'écriture
     
-    Args:
-        gift_name: Nom du cadeau TikTok
+    # Push de l'état vers l'overlay (Server-Sent Events)
+    OVERLAY_PUSH_ENABLED = True
+    OVERLAY_PUSH_HOST = "127.0.0.1"
+    OVERLAY_PUSH_PORT = 8001
+    
+    @classmethod
+    def with_overrides(cls, **overrides):
+        """
+        Crée une configuration dérivée (un live hébergé par StreamHost, par exemple)
+        
+        Les paramètres non surchargés restent ceux de la classe parente.
         
-    Returns:
-        Dictionnaire avec hp, xp et action
-    """
-    return GIFT_ACTIONS.get(gift_name, GIFT_ACTIONS["default"])
+        Args:
+            **overrides: Paramètres à remplacer (ex: OBS_STATS_FILE="streams/a/stats.txt")
+            
+        Returns:
+            Sous-classe de la configuration avec les valeurs surchargées
+            
+        Raises:
+            ValueError: Si un paramètre n'existe pas
+        """
+        unknown = [key for key in overrides if not key.isupper() or not hasattr(cls, key)]
+        if unknown:
+            raise ValueError(f"Paramètres de configuration inconnus: {', '.join(sorted(unknown))}")
+        return type(cls.__name__, (cls,), overrides)
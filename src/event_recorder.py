@@ -0,0 +1,184 @@
+"""
+Enregistrement des événements TikTok pour L'IA Survivante
+Chaque cadeau, like ou commentaire reçu est ajouté avec son horodatage à un
+journal JSON Lines compact, rejouable ensuite par replay.py.
+Chaque session (démarrage du live) commence par un en-tête {"session": ...}: les
+horodatages repartent de 0 et load_recording les remet bout à bout.
+Le journal est écrit par un thread dédié, jamais par la boucle asyncio.
+"""
+
+import json
+import os
+import queue
+import threading
+import time
+from typing import Iterator, Optional, Tuple
+
+from src.ingestion import IngestEvent
+
+# Secondes max entre deux écritures effectives du journal sur le disque
+RECORD_FLUSH_INTERVAL = 1.0
+
+
+def event_to_record(event: IngestEvent, offset: float) -> dict:
+    """
+    Convertit un événement en entrée compacte du journal
+
+    Args:
+        event: Événement normalisé
+        offset: Secondes écoulées depuis le début de l'enregistrement
+
+    Returns:
+        Dictionnaire {t, k, u} plus g (cadeau), i/v (identifiant/valeur du cadeau),
+        n (nombre) et c (commentaire) si utiles
+    """
+    record = {"t": round(offset, 3), "k": event.kind, "u": event.username}
+    if event.gift_name is not None:
+        record["g"] = event.gift_name
+    if event.gift_id is not None:
+        record["i"] = event.gift_id
+    if event.gift_value is not None:
+        record["v"] = event.gift_value
+    if event.count != 1:
+        record["n"] = event.count
+    if event.comment is not None:
+        record["c"] = event.comment
+    return record
+
+
+def record_to_event(record: dict) -> IngestEvent:
+    """Reconstruit un événement à partir d'une entrée du journal"""
+    return IngestEvent(
+        record["k"], record["u"], gift_name=record.get("g"),
+        count=record.get("n", 1), comment=record.get("c"),
+        gift_id=record.get("i"), gift_value=record.get("v")
+    )
+
+
+def load_recording(path: str) -> Iterator[Tuple[float, IngestEvent]]:
+    """
+    Lit un journal d'événements
+
+    Les sessions successives sont mises bout à bout: une session reprend au
+    dernier horodatage de la précédente (sans le temps d'arrêt entre les deux).
+
+    Args:
+        path: Fichier JSON Lines produit par EventRecorder
+
+    Yields:
+        (secondes depuis le début de l'enregistrement, événement)
+    """
+    session_start = 0.0  # Décalage de la session en cours dans le journal
+    last_offset = 0.0
+    with open(path, "r", encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+                if "session" in record:
+                    session_start = last_offset
+                    continue
+                last_offset = session_start + record["t"]
+                yield last_offset, record_to_event(record)
+            except (ValueError, KeyError) as e:
+                print(f"⚠️ Ligne {line_number} ignorée ({path}): {e}")
+
+
+class EventRecorder:
+    """Journal des événements reçus, horodatés depuis le début de la session"""
+
+    def __init__(self, path: str):
+        """
+        Initialise l'enregistreur
+
+        Args:
+            path: Fichier JSON Lines de destination (ajout en fin de fichier, une session par démarrage)
+        """
+        self.path = path
+        self._queue = queue.SimpleQueue()  # Jamais plein: aucun événement n'est perdu
+        self._thread = None
+        self._started_at = None
+        self.recorded_count = 0
+
+    @property
+    def is_threaded(self) -> bool:
+        """True si le thread d'écriture est actif"""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """Démarre une session et son thread d'écriture (appelé automatiquement au premier événement)"""
+        if self._started_at is not None:
+            return
+        self._started_at = time.monotonic()
+        self._thread = threading.Thread(target=self._run, name="event-recorder", daemon=True)
+        self._thread.start()
+
+    def record(self, event: IngestEvent):
+        """
+        Ajoute un événement au journal (appelé par la boucle asyncio, sans I/O)
+
+        Args:
+            event: Événement normalisé (horodaté à sa réception)
+        """
+        if self._started_at is None:
+            self.start()
+        self._queue.put(event_to_record(event, max(0.0, event.received_at - self._started_at)))
+        self.recorded_count += 1
+
+    def close(self, timeout: float = 5.0) -> Optional[str]:
+        """
+        Écrit les événements en attente, puis ferme le journal
+
+        Args:
+            timeout: Secondes max d'attente du thread d'écriture
+
+        Returns:
+            Chemin du journal, None si aucun événement n'a été enregistré
+        """
+        if self._started_at is None:
+            return None
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join(timeout)
+            self._thread = None
+        self._started_at = None
+        return self.path
+
+    def _run(self):
+        """Boucle du thread: ouvre le journal, écrit l'en-tête de session puis les événements"""
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            f = open(self.path, "a", encoding="utf-8")
+        except OSError as e:
+            print(f"⚠️ Journal des événements impossible à ouvrir ({self.path}): {e}")
+            # Vider la file jusqu'à l'arrêt (les événements ne sont pas enregistrés)
+            while self._queue.get() is not None:
+                pass
+            return
+
+        with f:
+            f.write(json.dumps({"session": round(time.time(), 3)}) + "\n")
+            last_flush = time.monotonic()
+            dirty = True
+            while True:
+                try:
+                    # Sans nouvel événement, écrire au plus tard après un intervalle
+                    record = self._queue.get(timeout=RECORD_FLUSH_INTERVAL if dirty else None)
+                except queue.Empty:
+                    record = False
+                if record is None:
+                    break
+                if record:
+                    f.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n")
+                    dirty = True
+
+                # Écritures bufferisées: au plus une écriture disque par intervalle
+                now = time.monotonic()
+                if dirty and (record is False or now - last_flush >= RECORD_FLUSH_INTERVAL):
+                    f.flush()
+                    last_flush = now
+                    dirty = False
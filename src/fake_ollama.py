@@ -0,0 +1,325 @@
+"""
+Faux serveur Ollama pour L'IA Survivante
+Imite /api/generate (streaming NDJSON et réponse complète) avec une latence,
+un débit, une limite de générations parallèles et des pannes configurables,
+pour mesurer les files de narration sans Ollama
+
+Usage:
+    python -m src.fake_ollama --profile laptop
+    python -m src.fake_ollama --ttft 0.5 --tokens-per-sec 20 --parallel 2 --error-rate 0.05
+Puis lancer le jeu avec OLLAMA_API_URL=http://127.0.0.1:11435/api/generate
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from datetime import datetime, timezone
+
+# Profils de latence (paramètres de FakeOllamaServer)
+LATENCY_PROFILES = {
+    # Réponse immédiate: coût du moteur seul
+    "instant": {"ttft": 0.0, "tokens_per_sec": 0.0, "parallel": 8},
+    # GPU dédié
+    "fast": {"ttft": 0.15, "tokens_per_sec": 80.0, "parallel": 4},
+    # llama3.2:3b sur le CPU d'un PC de streamer, OLLAMA_NUM_PARALLEL=1
+    "laptop": {"ttft": 0.6, "tokens_per_sec": 25.0, "parallel": 1},
+    # Machine saturée (jeu + OBS + LLM): lent, erreurs et générations bloquées
+    "overloaded": {"ttft": 2.0, "tokens_per_sec": 8.0, "parallel": 1,
+                   "error_rate": 0.05, "timeout_rate": 0.02},
+}
+
+# Texte renvoyé (découpé en tokens d'un mot)
+RESPONSE_TEXT = (
+    "Merci pour ce cadeau ! Je brandis ma lame et je fonce sur le monstre, "
+    "l'énergie des viewers me donne des ailes. Le donjon n'a qu'à bien se tenir !"
+)
+
+
+class FakeOllamaServer:
+    """Serveur HTTP asyncio compatible avec /api/generate d'Ollama"""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 11435, ttft: float = 0.5,
+                 tokens_per_sec: float = 25.0, parallel: int = 1, error_rate: float = 0.0,
+                 timeout_rate: float = 0.0, hang_seconds: float = 300.0,
+                 response_tokens: int = 30, seed: int = 0):
+        """
+        Initialise le serveur
+
+        Args:
+            host: Adresse d'écoute
+            port: Port d'écoute (0: port libre choisi par le système)
+            ttft: Secondes avant le premier token (time-to-first-token)
+            tokens_per_sec: Débit de génération (0: tous les tokens d'un coup)
+            parallel: Générations simultanées max (les autres attendent, comme OLLAMA_NUM_PARALLEL)
+            error_rate: Proportion de requêtes en erreur HTTP 500
+            timeout_rate: Proportion de requêtes bloquées hang_seconds sans réponse
+            hang_seconds: Durée de blocage d'une requête qui "timeout"
+            response_tokens: Nombre de tokens par réponse
+            seed: Graine du tirage des erreurs (même scénario à chaque lancement)
+        """
+        self.host = host
+        self.port = port
+        self.ttft = ttft
+        self.tokens_per_sec = tokens_per_sec
+        self.parallel = parallel
+        self.error_rate = error_rate
+        self.timeout_rate = timeout_rate
+        self.hang_seconds = hang_seconds
+        self.response_tokens = response_tokens
+        self.server = None
+        self._random = random.Random(seed)
+        self._slots = asyncio.Semaphore(parallel)
+        self._tokens = RESPONSE_TEXT.split(" ")
+
+        self.request_count = 0
+        self.error_count = 0
+        self.timeout_count = 0
+        self.completed_count = 0
+        self.active_count = 0
+        self.waiting_count = 0
+        self.max_active = 0
+        self.max_waiting = 0
+
+    @classmethod
+    def from_profile(cls, name: str, **overrides) -> "FakeOllamaServer":
+        """
+        Crée un serveur à partir d'un profil de LATENCY_PROFILES
+
+        Args:
+            name: Nom du profil
+            **overrides: Paramètres qui remplacent ceux du profil
+        """
+        params = dict(LATENCY_PROFILES[name])
+        params.update({key: value for key, value in overrides.items() if value is not None})
+        return cls(**params)
+
+    @property
+    def api_url(self) -> str:
+        """URL à utiliser comme OLLAMA_API_URL"""
+        return f"http://{self.host}:{self.port}/api/generate"
+
+    async def start(self):
+        """Démarre l'écoute"""
+        self.server = await asyncio.start_server(self._handle_client, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]  # Port réel si port=0
+
+    async def close(self):
+        """Arrête l'écoute"""
+        if self.server:
+            self.server.close()
+            await self.server.wait_closed()
+            self.server = None
+
+    def get_stats(self) -> dict:
+        """
+        Retourne les compteurs du serveur
+
+        Returns:
+            Dictionnaire des compteurs (requêtes, erreurs, concurrence max...)
+        """
+        return {
+            "requests": self.request_count,
+            "completed": self.completed_count,
+            "errors": self.error_count,
+            "timeouts": self.timeout_count,
+            "active": self.active_count,
+            "waiting": self.waiting_count,
+            "max_active": self.max_active,
+            "max_waiting": self.max_waiting,
+        }
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Gère une connexion (plusieurs requêtes en keep-alive, comme avec le pool httpx)"""
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except asyncio.IncompleteReadError:
+                    return  # Connexion fermée par le client
+                lines = head.decode("latin-1").split("\r\n")
+                method, target = lines[0].split(" ", 2)[:2]
+                headers = {}
+                for line in lines[1:]:
+                    name, _, value = line.partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+
+                if method != "POST" or target.partition("?")[0] != "/api/generate":
+                    await self._send_json(writer, "404 Not Found", {"error": "not found"})
+                else:
+                    await self._generate(writer, json.loads(body or b"{}"))
+
+                if headers.get("connection", "").lower() == "close":
+                    return
+        except (asyncio.LimitOverrunError, ValueError):
+            pass
+        except (ConnectionError, OSError):
+            pass
+        finally:
+            writer.close()
+
+    async def _generate(self, writer: asyncio.StreamWriter, payload: dict):
+        """Répond à /api/generate après attente d'un créneau de génération"""
+        self.request_count += 1
+        draw = self._random.random()
+
+        self.waiting_count += 1
+        self.max_waiting = max(self.max_waiting, self.waiting_count)
+        async with self._slots:
+            self.waiting_count -= 1
+            self.active_count += 1
+            self.max_active = max(self.max_active, self.active_count)
+            try:
+                if draw < self.error_rate:
+                    self.error_count += 1
+                    await asyncio.sleep(self.ttft)
+                    await self._send_json(writer, "500 Internal Server Error", {"error": "model runner crashed"})
+                    return
+                if draw < self.error_rate + self.timeout_rate:
+                    self.timeout_count += 1
+                    await asyncio.sleep(self.hang_seconds)
+                    raise ConnectionError("génération bloquée")
+
+                model = payload.get("model", "fake")
+                if payload.get("stream", True):
+                    await self._stream(writer, model)
+                else:
+                    await self._complete(writer, model)
+                self.completed_count += 1
+            finally:
+                self.active_count -= 1
+
+    def _response_tokens(self) -> list:
+        """Tokens de la réponse (texte répété si besoin), espace inclus"""
+        count = max(1, self.response_tokens)
+        words = [self._tokens[i % len(self._tokens)] for i in range(count)]
+        return [word + " " for word in words[:-1]] + [words[-1]]
+
+    def _token_delay(self) -> float:
+        """Secondes entre deux tokens"""
+        return 1.0 / self.tokens_per_sec if self.tokens_per_sec > 0 else 0.0
+
+    def _final_fields(self, model: str, tokens: int, started_at: float, first_token_at: float) -> dict:
+        """Champs de fin de génération (mêmes noms et unités, en nanosecondes, qu'Ollama)"""
+        now = time.perf_counter()
+        return {
+            "model": model,
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "done": True,
+            "done_reason": "stop",
+            "total_duration": int((now - started_at) * 1e9),
+            "load_duration": 0,
+            "prompt_eval_count": 0,
+            "prompt_eval_duration": int((first_token_at - started_at) * 1e9),
+            "eval_count": tokens,
+            "eval_duration": int((now - first_token_at) * 1e9) or 1,
+        }
+
+    async def _stream(self, writer: asyncio.StreamWriter, model: str):
+        """Envoie la réponse en NDJSON chunké, un token à la fois"""
+        started_at = time.perf_counter()
+        writer.write((
+            "HTTP/1.1 200 OK\r\n"
+            "Content-Type: application/x-ndjson\r\n"
+            "Transfer-Encoding: chunked\r\n\r\n"
+        ).encode("latin-1"))
+        await asyncio.sleep(self.ttft)
+        first_token_at = time.perf_counter()
+
+        tokens = self._response_tokens()
+        delay = self._token_delay()
+        for i, token in enumerate(tokens):
+            if i and delay:
+                await asyncio.sleep(delay)
+            self._write_chunk(writer, {
+                "model": model, "created_at": datetime.now(timezone.utc).isoformat(),
+                "response": token, "done": False
+            })
+            await writer.drain()
+
+        self._write_chunk(writer, {"response": "", **self._final_fields(model, len(tokens), started_at, first_token_at)})
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+
+    async def _complete(self, writer: asyncio.StreamWriter, model: str):
+        """Envoie la réponse complète après le temps de génération de tous les tokens"""
+        started_at = time.perf_counter()
+        await asyncio.sleep(self.ttft)
+        first_token_at = time.perf_counter()
+
+        tokens = self._response_tokens()
+        await asyncio.sleep(self._token_delay() * (len(tokens) - 1))
+        await self._send_json(writer, "200 OK", {
+            "response": "".join(tokens), **self._final_fields(model, len(tokens), started_at, first_token_at)
+        })
+
+    def _write_chunk(self, writer: asyncio.StreamWriter, data: dict):
+        """Écrit une ligne NDJSON dans un chunk HTTP"""
+        line = (json.dumps(data, ensure_ascii=False) + "\n").encode("utf-8")
+        writer.write(f"{len(line):x}\r\n".encode("latin-1") + line + b"\r\n")
+
+    async def _send_json(self, writer: asyncio.StreamWriter, status: str, data: dict):
+        """Envoie une réponse JSON complète"""
+        payload = json.dumps(data, ensure_ascii=False).encode("utf-8")
+        writer.write((
+            f"HTTP/1.1 {status}\r\n"
+            "Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(payload)}\r\n\r\n"
+        ).encode("latin-1") + payload)
+        await writer.drain()
+
+
+async def serve(server: FakeOllamaServer):
+    """Fait tourner le serveur et affiche ses compteurs régulièrement"""
+    await server.start()
+    print(f"🦙 Faux Ollama: {server.api_url}")
+    print(f"   TTFT {server.ttft}s, {server.tokens_per_sec} tokens/s, {server.parallel} en parallèle, "
+          f"{server.error_rate:.0%} d'erreurs, {server.timeout_rate:.0%} bloquées")
+    print(f"💡 Lancer le jeu avec OLLAMA_API_URL={server.api_url}")
+    last = None
+    try:
+        while True:
+            await asyncio.sleep(5)
+            stats = server.get_stats()
+            if stats != last:
+                print(f"📊 {stats['requests']} requêtes, {stats['completed']} terminées, "
+                      f"{stats['errors']} erreurs, {stats['timeouts']} bloquées, "
+                      f"{stats['active']} en cours, {stats['waiting']} en attente")
+                last = stats
+    finally:
+        await server.close()
+
+
+def main():
+    """Point d'entrée en ligne de commande"""
+    parser = argparse.ArgumentParser(description="Faux serveur Ollama (/api/generate)")
+    parser.add_argument("--profile", choices=sorted(LATENCY_PROFILES), default="laptop",
+                        help="Profil de latence de base")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=11435)
+    parser.add_argument("--ttft", type=float, help="Secondes avant le premier token")
+    parser.add_argument("--tokens-per-sec", type=float, help="Débit de génération")
+    parser.add_argument("--parallel", type=int, help="Générations simultanées max")
+    parser.add_argument("--error-rate", type=float, help="Proportion de réponses HTTP 500")
+    parser.add_argument("--timeout-rate", type=float, help="Proportion de requêtes bloquées")
+    parser.add_argument("--hang-seconds", type=float, help="Durée de blocage d'une requête")
+    parser.add_argument("--response-tokens", type=int, help="Tokens par réponse")
+    parser.add_argument("--seed", type=int, help="Graine du tirage des erreurs")
+    args = parser.parse_args()
+
+    server = FakeOllamaServer.from_profile(
+        args.profile, host=args.host, port=args.port, ttft=args.ttft,
+        tokens_per_sec=args.tokens_per_sec, parallel=args.parallel,
+        error_rate=args.error_rate, timeout_rate=args.timeout_rate,
+        hang_seconds=args.hang_seconds, response_tokens=args.response_tokens, seed=args.seed
+    )
+    try:
+        asyncio.run(serve(server))
+    except KeyboardInterrupt:
+        print("\n👋 Faux Ollama arrêté")
+
+
+if __name__ == "__main__":
+    main()
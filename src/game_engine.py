@@ -7,22 +7,47 @@ import asyncio
 import time
 import os
 import json
-import requests
+from collections import deque
 from typing import Optional
 from src.config import (
-    OLLAMA_MODEL, OLLAMA_API_URL, SYSTEM_PROMPT, GameConfig, get_gift_info
+    OLLAMA_MODEL, OLLAMA_API_URL, SYSTEM_PROMPT, GameConfig
 )
+from src.gift_catalog import get_gift_catalog
+from src.llm_client import OllamaClient, OllamaError
+from src.metrics import EngineMetrics
+from src.monster_names import MonsterNamePool
+from src.narration import GiftNarration, NarrationJob, NarrationQueue, NarrationRequest
+from src.event_recorder import event_to_record
+from src.narration_cache import NarrationCache
+from src.obs_writer import ObsWriter
+from src.overlay_server import OverlayPushServer
+from src.state_channel import StateChannel
+from src.state_store import StateStore
+from src.tracing import (
+    EventTrace, LatencyTracer, STAGE_DISPLAYED, STAGE_ENQUEUED, STAGE_LLM_DONE, STAGE_LLM_START, STAGE_WRITTEN
+)
+
+
+# Textes affichés quand l'IA ne peut pas répondre (jamais mis en cache)
+AI_ERROR_TEXT = "💀 L'aventurier est momentanément désorienté... (erreur IA)"
+AI_UNAVAILABLE_TEXT = "💀 L'IA locale n'est pas disponible..."
 
 
 class Character:
     """Représente le personnage joueur avec ses statistiques"""
     
-    def __init__(self):
-        """Initialise le personnage avec les stats de départ"""
-        self.hp = GameConfig.STARTING_HP
-        self.max_hp = GameConfig.MAX_HP
-        self.level = GameConfig.STARTING_LEVEL
-        self.xp = GameConfig.STARTING_XP
+    def __init__(self, config=GameConfig):
+        """
+        Initialise le personnage avec les stats de départ
+        
+        Args:
+            config: Configuration du jeu (GameConfig ou GameConfig.with_overrides)
+        """
+        self.config = config
+        self.hp = self.config.STARTING_HP
+        self.max_hp = self.config.MAX_HP
+        self.level = self.config.STARTING_LEVEL
+        self.xp = self.config.STARTING_XP
         self.recent_items = []  # Last 3 items used (for display only)
         
     def add_hp(self, amount: int) -> int:
@@ -52,31 +77,40 @@ class Character:
         self.hp = max(0, self.hp - amount)
         return self.hp > 0
     
-    def add_xp(self, amount: int) -> bool:
+    def add_xp(self, amount: int) -> int:
         """
         Ajoute de l'XP et gère le level up
         
+        Le nombre de niveaux gagnés est calculé directement (division entière):
+        un gain de plusieurs milliers d'XP coûte autant qu'un gain de 10.
+        
         Args:
             amount: Quantité d'XP à ajouter
             
         Returns:
-            True si level up, False sinon
+            Nombre de niveaux gagnés (0 si aucun level up)
         """
         self.xp += amount
         
-        # Vérifier si level up
-        if self.xp >= GameConfig.XP_PER_LEVEL:
-            self.level_up()
-            return True
-        return False
+        # Vérifier si level up (un gros gain peut valoir plusieurs niveaux)
+        levels = self.xp // self.config.XP_PER_LEVEL
+        if levels > 0:
+            self.level_up(levels)
+            return levels
+        return 0
     
-    def level_up(self):
-        """Monte le personnage de niveau"""
-        self.level += 1
-        self.xp -= GameConfig.XP_PER_LEVEL
+    def level_up(self, levels: int = 1):
+        """
+        Monte le personnage de niveau
+        
+        Args:
+            levels: Nombre de niveaux gagnés
+        """
+        self.level += levels
+        self.xp -= self.config.XP_PER_LEVEL * levels
         
         # Augmenter le HP max et restaurer complètement
-        self.max_hp += 10
+        self.max_hp += self.config.MAX_HP_PER_LEVEL * levels
         self.hp = self.max_hp
     
     def add_consumed_item(self, item: str):
@@ -99,7 +133,7 @@ class Character:
         Returns:
             String formaté pour l'affichage OBS
         """
-        xp_progress = f"{self.xp}/{GameConfig.XP_PER_LEVEL}"
+        xp_progress = f"{self.xp}/{self.config.XP_PER_LEVEL}"
         hp_bar = "❤️ " * (self.hp // 10) + "🖤 " * ((self.max_hp - self.hp) // 10)
         
         return f"""╔══════════════════════════════╗
@@ -119,64 +153,222 @@ class Character:
 class GameEngine:
     """Moteur principal du jeu avec intégration API Gemini"""
     
-    def __init__(self):
-        """Initialise le moteur de jeu"""
-        self.character = Character()
-        self.last_api_call = 0  # Timestamp du dernier appel API
-        self.api_queue = asyncio.Queue()  # File d'attente pour les requêtes
+    def __init__(self, config=GameConfig, llm_client: OllamaClient = None):
+        """
+        Initialise le moteur de jeu
+        
+        Args:
+            config: Configuration du jeu (GameConfig ou GameConfig.with_overrides pour un live hébergé)
+            llm_client: Client Ollama partagé entre plusieurs moteurs (créé par le moteur si None)
+        """
+        self.config = config
+        self.character = Character(config)
+        # File d'attente des narrations à générer (par priorité)
+        self.api_queue = NarrationQueue(self.config.NARRATION_PRIORITY_NAMES)
+        
+        # Narrations en cours, affichées par priorité puis ordre d'arrivée
+        self._next_narration_seq = 0
+        self._pending_narrations = []
+        self._narration_added = asyncio.Event()
+        self._current_narration = None
+        
+        # Narrations encore en attente, fusionnables (clé de fusion -> job)
+        self._coalescable_narrations = {}
+        self.narrations_coalesced = 0
+        
+        # Cache des narrations de cadeaux similaires
+        self.narration_cache = NarrationCache(
+            max_keys=self.config.NARRATION_CACHE_SIZE,
+            variants=self.config.NARRATION_CACHE_VARIANTS,
+            ttl=self.config.NARRATION_CACHE_TTL
+        ) if self.config.NARRATION_CACHE_ENABLED else None
         self.is_running = False
+        self.ready = asyncio.Event()  # Fichiers OBS et overlay prêts (voir start)
         
         # Monster State
         self.current_monster_name = None
         self.current_monster_hp = 0
         self.current_monster_max_hp = 100
         
+        # Noms de monstres générés à l'avance (l'apparition n'attend jamais le LLM)
+        self.monster_names = MonsterNamePool(
+            self.config.MONSTER_NAME_POOL_FILE, self.config.MONSTER_NAME_POOL_SIZE
+        )
+        self.monster_names.load()
+        
+        # Catalogue des cadeaux (chargé une fois, partagé par les moteurs du processus)
+        self.gift_catalog = get_gift_catalog(self.config)
+        
         # Like Milestone System
         self.total_likes = 0  # Total likes accumulated for milestone damage
         
         # Monster Attack System
         self.last_monster_attack = time.time()  # Track last auto-attack time
         
+        # Statistiques de la dernière narration (durée, tokens/s)
+        self.last_generation = None
+        
+        # Client HTTP partagé (pool keep-alive) pour tous les appels Ollama
+        self._owns_llm_client = llm_client is None
+        self.llm_client = llm_client or OllamaClient(
+            OLLAMA_API_URL,
+            max_connections=self.config.OLLAMA_MAX_CONNECTIONS,
+            timeout=self.config.OLLAMA_TIMEOUT,
+            connect_timeout=self.config.OLLAMA_CONNECT_TIMEOUT
+        )
+        
+        # Pool de workers de narration partagé entre plusieurs lives (voir StreamHost)
+        self.narration_pool = None
+        
+        # Fichiers OBS (écritures regroupées, voir flush_state)
+        self.last_action = None
+        self.obs_writer = ObsWriter(self.config.OBS_WRITER_QUEUE_SIZE)
+        self._state_dirty = False
+        self._state_changed = asyncio.Event()  # Réveille la boucle de flush
+        
+        # Traçage de latence des événements (réception -> écriture des fichiers OBS)
+        self.tracer = LatencyTracer(self.config.TRACE_LOG_FILE) if self.config.TRACING_ENABLED else None
+        self._traces_awaiting_write = []  # Narrations affichées, pas encore écrites sur le disque
+        self._traces_written = deque()  # (traces, écrites à) signalées par le thread d'écriture
+        
+        # Métriques du moteur (/stats, /metrics sur le serveur de push)
+        self.metrics = EngineMetrics(self)
+        
+        # Push de l'état (versionné, par deltas) vers les overlays connectés
+        self.state_channel = StateChannel()
+        self.overlay_server = OverlayPushServer(
+            self.config.OVERLAY_PUSH_HOST, self.config.OVERLAY_PUSH_PORT, self.state_channel, self.metrics
+        ) if self.config.OVERLAY_PUSH_ENABLED else None
+        
         # Ollama ne nécessite pas de configuration spéciale
         # L'API locale est toujours disponible
         print(f"🤖 IA locale configurée: {OLLAMA_MODEL}")
         
         # Créer les dossiers OBS si nécessaire
-        os.makedirs("obs_files", exist_ok=True)
+        for path in (self.config.OBS_LAST_ACTION_FILE, self.config.OBS_STATS_FILE, self.config.OBS_JSON_STATE_FILE):
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
         
-        # Initialiser les fichiers OBS
-        self._write_stats()
-        self._write_action("🎮 L'aventure commence ! En attente des viewers...")
+        # Sauvegarde de l'état: reprise là où le live s'est arrêté
+        self.state_store = StateStore(
+            self.config.STATE_DIR,
+            snapshot_interval=self.config.STATE_SNAPSHOT_INTERVAL,
+            snapshot_every=self.config.STATE_SNAPSHOT_EVERY,
+            fsync=self.config.STATE_FSYNC
+        ) if self.config.STATE_DIR else None
+        self._applied_events = []  # Événements appliqués depuis la dernière entrée du journal
+        restored = self.state_store.load() if self.state_store else None
+        if restored:
+            self.restore_state(restored)
+            stats = self.state_store.get_stats()
+            print(f"🔄 État restauré: {self.character.hp} HP, Niveau {self.character.level} "
+                  f"({stats['replayed']} entrées rejouées en {stats['restore_ms']:.1f} ms)")
+        
+        # Fichiers OBS initiaux: écrits par le thread du writer au démarrage (voir start),
+        # ou au premier changement d'état si le moteur n'est pas démarré
+        if restored:
+            self.last_action = "🔄 L'aventure reprend ! En attente des viewers..."
+        else:
+            self.last_action = "🎮 L'aventure commence ! En attente des viewers..."
+        self._state_dirty = True
+    
+    def get_state(self) -> dict:
+        """
+        Retourne l'état du jeu à sauvegarder (personnage, monstre, likes)
+        
+        Returns:
+            Dictionnaire compact de valeurs JSON
+        """
+        return {
+            "hp": self.character.hp,
+            "max_hp": self.character.max_hp,
+            "level": self.character.level,
+            "xp": self.character.xp,
+            "items": self.character.recent_items.copy(),
+            "monster": self.current_monster_name,
+            "monster_hp": self.current_monster_hp,
+            "monster_max_hp": self.current_monster_max_hp,
+            "likes": self.total_likes,
+        }
+    
+    def restore_state(self, state: dict):
+        """
+        Restaure un état sauvegardé (les champs absents gardent leur valeur)
+        
+        Args:
+            state: État produit par get_state
+        """
+        character = self.character
+        character.hp = state.get("hp", character.hp)
+        character.max_hp = state.get("max_hp", character.max_hp)
+        character.level = state.get("level", character.level)
+        character.xp = state.get("xp", character.xp)
+        character.recent_items = list(state.get("items", character.recent_items))
+        self.current_monster_name = state.get("monster", self.current_monster_name)
+        self.current_monster_hp = state.get("monster_hp", self.current_monster_hp)
+        self.current_monster_max_hp = state.get("monster_max_hp", self.current_monster_max_hp)
+        self.total_likes = state.get("likes", self.total_likes)
+    
+    def log_applied_event(self, event):
+        """
+        Ajoute un événement appliqué à la prochaine entrée du journal d'état
+        
+        Args:
+            event: IngestEvent appliqué au moteur
+        """
+        if self.state_store:
+            record = event_to_record(event, 0)
+            del record["t"]  # L'entrée du journal est déjà horodatée
+            self._applied_events.append(record)
+    
+    def _record_state(self):
+        """Journalise les changements d'état (écriture par le thread du StateStore)"""
+        if self.state_store:
+            self.state_store.record(self.get_state(), self._applied_events)
+            self._applied_events = []
     
     def _write_stats(self):
-        """Écrit les stats dans le fichier OBS"""
-        with open(GameConfig.OBS_STATS_FILE, "w", encoding="utf-8") as f:
-            f.write(self.character.get_stats_text())
-        self._write_json_state()
+        """Signale que les stats ont changé (écrites au prochain flush)"""
+        self._mark_state_dirty()
     
     def _write_action(self, action: str):
         """
-        Écrit la dernière action dans le fichier OBS
+        Met à jour la dernière action (écrite au prochain flush)
         
         Args:
             action: Texte de l'action à afficher
         """
-        with open(GameConfig.OBS_LAST_ACTION_FILE, "w", encoding="utf-8") as f:
-            f.write(action)
-        self._write_json_state(action)
+        self.last_action = action
+        self._mark_state_dirty()
     
-    def _write_json_state(self, last_action: str = None):
-        """
-        Écrit l'état du jeu en JSON pour l'overlay HTML
+    def _mark_state_dirty(self):
+        """Marque l'état comme modifié pour la prochaine écriture des fichiers OBS"""
+        self._state_dirty = True
         
-        Args:
-            last_action: Dernière action à inclure (optionnel)
+        # Sans boucle de flush (moteur non démarré), écrire immédiatement
+        if not self.is_running:
+            self.flush_state()
+        else:
+            self._state_changed.set()
+    
+    def flush_state(self):
+        """Envoie un snapshot des fichiers OBS au writer si l'état a changé depuis le dernier flush"""
+        if not self._state_dirty:
+            return
+        self._state_dirty = False
+        self._write_json_state()
+        self._record_state()
+    
+    def _write_json_state(self):
         """
+        Envoie l'état du jeu (stats, dernière action, JSON de l'overlay) au writer
+        et le pousse aux overlays connectés
+        """
+        last_action = self.last_action
         state = {
             "hp": self.character.hp,
             "max_hp": self.character.max_hp,
             "xp": self.character.xp,
-            "xp_for_next_level": GameConfig.XP_PER_LEVEL,
+            "xp_for_next_level": self.config.XP_PER_LEVEL,
             "level": self.character.level,
             "recent_items": self.character.recent_items.copy(),
             "last_action": last_action if last_action else "🎮 En attente d'événements...",
@@ -192,18 +384,110 @@ class GameEngine:
             } if self.current_monster_name else None
         }
         
-        json_file = "obs_files/game_state.json"
-        with open(json_file, "w", encoding="utf-8") as f:
-            json.dump(state, f, ensure_ascii=False, indent=2)
+        files = {
+            self.config.OBS_STATS_FILE: self.character.get_stats_text(),
+            self.config.OBS_JSON_STATE_FILE: json.dumps(state, ensure_ascii=False, separators=(",", ":"))
+        }
+        if last_action is not None:
+            files[self.config.OBS_LAST_ACTION_FILE] = last_action
+        
+        # Les fichiers sont écrits par le thread du writer, jamais par la boucle asyncio
+        on_written = None
+        if self._traces_awaiting_write:
+            on_written = self._trace_writer_callback(self._traces_awaiting_write)
+            self._traces_awaiting_write = []
+        self.obs_writer.submit(files, on_written)
+        
+        if self.overlay_server:
+            self.overlay_server.publish(state)
+    
+    def _trace_writer_callback(self, traces: list):
+        """
+        Crée le callback du writer qui termine les traces une fois les fichiers écrits
+        
+        Args:
+            traces: Traces des narrations contenues dans le snapshot
+            
+        Returns:
+            Callback appelé depuis le thread d'écriture (ou directement sans thread)
+        """
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        
+        def on_written():
+            self._traces_written.append((traces, time.monotonic()))
+            if loop is not None and not loop.is_closed():
+                loop.call_soon_threadsafe(self._finish_written_traces)
+            else:
+                self._finish_written_traces()
+        
+        return on_written
+    
+    def _finish_written_traces(self):
+        """Termine les traces signalées écrites par le thread d'écriture (sur la boucle, ou à l'arrêt)"""
+        while self._traces_written:
+            traces, written_at = self._traces_written.popleft()
+            self._finish_traces(traces, STAGE_WRITTEN, written_at)
+    
+    def finish_traces_on_write(self, traces: list):
+        """
+        Termine des traces à la prochaine écriture des fichiers OBS (état modifié par leurs événements)
+        
+        Sans changement d'état en attente d'écriture, les traces sont terminées tout de suite.
+        
+        Args:
+            traces: Traces des événements appliqués
+        """
+        if not self.tracer or not traces:
+            return
+        if self._state_dirty:
+            self._traces_awaiting_write.extend(traces)
+        else:
+            self._finish_traces(traces)
+    
+    def _mark_traces(self, job: NarrationJob, stage: str):
+        """Horodate une étape pour tous les événements d'une narration"""
+        now = time.monotonic()
+        for trace in job.traces:
+            trace.mark(stage, now)
+    
+    def _finish_traces(self, traces: list, stage: str = None, at: float = None):
+        """Horodate la dernière étape (optionnelle) et termine les traces"""
+        if not self.tracer:
+            return
+        for trace in traces:
+            if stage:
+                trace.mark(stage, at)
+            self.tracer.finish(trace)
+    
+    async def _state_flush_loop(self):
+        """
+        Boucle d'écriture des fichiers OBS
+        
+        Le premier changement est écrit (et poussé) immédiatement, les suivants
+        sont regroupés pendant STATE_FLUSH_INTERVAL.
+        """
+        while self.is_running:
+            try:
+                await asyncio.wait_for(self._state_changed.wait(), timeout=1.0)
+            except asyncio.TimeoutError:
+                continue
+            
+            self._state_changed.clear()
+            self.flush_state()
+            
+            await asyncio.sleep(self.config.STATE_FLUSH_INTERVAL)
     
     async def _monster_attack_loop(self):
         """Boucle d'attaques automatiques du monstre"""
         while self.is_running:
-            await asyncio.sleep(GameConfig.MONSTER_ATTACK_INTERVAL)
+            await asyncio.sleep(self.config.MONSTER_ATTACK_INTERVAL)
             
             # Attaquer seulement si un monstre est vivant
             if self.current_monster_hp > 0:
-                damage = GameConfig.MONSTER_ATTACK_DAMAGE
+                damage = self.config.MONSTER_ATTACK_DAMAGE
                 is_alive = self.character.remove_hp(damage)
                 self._write_stats()
                 
@@ -213,76 +497,255 @@ class GameEngine:
                     print("💀 GAME OVER ! Le joueur est mort...")
                     # Optionnel: arrêter le jeu ou notifier
     
+    async def _enqueue_narration(self, request: NarrationRequest, merge_keys: list = (), priority: int = 0,
+                                 trace: EventTrace = None):
+        """
+        Ajoute une narration à générer (affichée par priorité puis ordre d'arrivée)
+        
+        Si une narration de même clé attend encore un worker, la demande y est
+        fusionnée au lieu de créer un nouvel appel LLM.
+        
+        Args:
+            request: Demande de narration
+            merge_keys: Clés de fusion (clé, fenêtre en secondes ou None), par ordre de préférence
+            priority: Classe de priorité (GameConfig.NARRATION_PRIORITY_NAMES)
+            trace: Trace de latence de l'événement à l'origine de la narration (optionnel)
+        """
+        now = time.monotonic()
+        if trace:
+            trace.mark(STAGE_ENQUEUED, now)
+        for key, window in merge_keys:
+            pending = self._coalescable_narrations.get(key)
+            if (pending and not pending.started
+                    and (window is None or now - pending.created_at <= window)
+                    and pending.request.merge(request)):
+                self.narrations_coalesced += 1
+                if trace:
+                    pending.traces.append(trace)
+                return
+        
+        job = NarrationJob(
+            self._next_narration_seq, request, keys=[key for key, _ in merge_keys],
+            priority=priority, max_wait=self.config.NARRATION_MAX_WAIT.get(priority)
+        )
+        if trace:
+            job.traces.append(trace)
+        self._next_narration_seq += 1
+        self._pending_narrations.append(job)
+        for key in job.keys:
+            self._coalescable_narrations[key] = job
+        self._narration_added.set()
+        await self.api_queue.put(job)
+        if self.narration_pool:
+            self.narration_pool.notify()
+    
+    def _gift_merge_keys(self, username: str, gift_name: str) -> list:
+        """
+        Clés de fusion d'une narration de cadeau
+        
+        Le même cadeau du même viewer est toujours fusionné tant qu'il attend ;
+        celui d'autres viewers seulement dans NARRATION_COALESCE_WINDOW.
+        """
+        keys = [(("gift", gift_name, username), None)]
+        if self.config.NARRATION_COALESCE_ACROSS_USERS:
+            keys.append((("gift", gift_name), self.config.NARRATION_COALESCE_WINDOW))
+        return keys
+    
     async def _process_api_queue(self):
-        """Traite la file d'attente des appels API avec cooldown"""
+        """Traite la file d'attente: N workers en parallèle, affichage par priorité puis ordre d'arrivée"""
+        await asyncio.gather(
+            self._narration_sequencer(),
+            *(self._narration_worker() for _ in range(self.config.NARRATION_WORKERS))
+        )
+    
+    async def _narration_worker(self):
+        """Génère les narrations de la file (plusieurs workers en parallèle)"""
         while self.is_running:
             try:
                 # Attendre une requête dans la queue
-                request_data = await asyncio.wait_for(
-                    self.api_queue.get(), 
-                    timeout=1.0
-                )
-                
-                # Vérifier le cooldown
-                time_since_last_call = time.time() - self.last_api_call
-                if time_since_last_call < GameConfig.API_COOLDOWN_SECONDS:
-                    wait_time = GameConfig.API_COOLDOWN_SECONDS - time_since_last_call
-                    await asyncio.sleep(wait_time)
-                
-                # Effectuer l'appel API
-                response = await self._call_ollama_api(request_data)
-                
-                # Mettre à jour le timestamp
-                self.last_api_call = time.time()
-                
-                # Écrire la réponse dans le fichier OBS
-                self._write_action(response)
-                
+                job = await asyncio.wait_for(self.api_queue.get(), timeout=1.0)
             except asyncio.TimeoutError:
                 # Pas de requête dans la queue, continuer
                 continue
-            except Exception as e:
-                print(f"❌ Erreur lors du traitement de la queue API: {e}")
-                await asyncio.sleep(1)
-
-    async def generate_monster_name(self):
-        """Génère un nom de monstre effrayant via Ollama"""
+            
+            await self.run_narration_job(job)
+    
+    async def run_narration_job(self, job: NarrationJob):
+        """
+        Génère le texte d'un job retiré de la file (worker du moteur ou pool partagé)
+        
+        Args:
+            job: Job à générer
+        """
+        # Déjà remplacé par son texte de secours
+        if job.started:
+            return
+        
+        # Trop ancienne: texte de secours sans appel LLM
+        if job.is_expired():
+            self._expire_narration(job)
+            return
+        
+        # Plus de fusion possible une fois la génération lancée
+        self._start_narration(job)
+        self._mark_traces(job, STAGE_LLM_START)
+        
+        # Narration similaire en cache: affichage immédiat, sans appel LLM
+        cached = self.narration_cache.get(job.request) if self.narration_cache else None
+        if cached:
+            self._mark_traces(job, STAGE_LLM_DONE)
+            job.finish(cached)
+            return
+        
+        text = AI_ERROR_TEXT
         try:
-            prompt = "Donne-moi un nom court et effrayant pour un monstre de fantasy (ex: 'Le Dévoreur d'Âmes', 'Gobelin enragé'). Réponds UNIQUEMENT par le nom, sans guillemets ni intro."
+            # Le texte partiel s'affiche pendant le streaming si c'est le tour du job
+            text = await self._call_ollama_api(
+                job.prompt, on_partial=lambda partial: self._show_partial(job, partial)
+            )
+            if self.narration_cache and text not in (AI_ERROR_TEXT, AI_UNAVAILABLE_TEXT):
+                self.narration_cache.put(job.request, text)
+        except Exception as e:
+            print(f"❌ Erreur lors du traitement de la queue API: {e}")
+        finally:
+            self._mark_traces(job, STAGE_LLM_DONE)
+            job.finish(text)
+    
+    def _start_narration(self, job: NarrationJob):
+        """Marque un job comme lancé (il ne peut plus être fusionné)"""
+        job.started = True
+        for key in job.keys:
+            if self._coalescable_narrations.get(key) is job:
+                del self._coalescable_narrations[key]
+    
+    def _expire_narration(self, job: NarrationJob):
+        """Termine un job expiré avec son texte de secours (ou rien)"""
+        self._start_narration(job)
+        self.api_queue.record_expired(job)
+        job.finish(job.request.fallback_text())
+    
+    def _show_partial(self, job: NarrationJob, text: str):
+        """Affiche le texte partiel d'un job si c'est la narration à l'écran"""
+        job.partial = text
+        if job is self._current_narration:
+            self._write_action(text)
+    
+    async def _narration_sequencer(self):
+        """
+        Affiche les narrations par priorité puis ordre d'arrivée
+        
+        Chaque narration reste affichée au moins MIN_ACTION_DISPLAY_SECONDS
+        avant que la suivante (même déjà générée) ne la remplace. Une narration
+        expirée avant sa génération affiche son texte de secours (ou rien).
+        """
+        last_release = 0.0
+        
+        while self.is_running:
+            if not self._pending_narrations:
+                self._narration_added.clear()
+                try:
+                    await asyncio.wait_for(self._narration_added.wait(), timeout=1.0)
+                except asyncio.TimeoutError:
+                    pass
+                continue
             
-            payload = {
-                "model": OLLAMA_MODEL,
-                "prompt": prompt,
-                "stream": False,
-                "options": {"temperature": 1.0}
-            }
+            # Temps d'affichage minimum de la narration précédente
+            wait_time = last_release + self.config.MIN_ACTION_DISPLAY_SECONDS - time.monotonic()
+            if wait_time > 0:
+                await asyncio.sleep(wait_time)
             
-            response = await asyncio.to_thread(
-                requests.post,
-                OLLAMA_API_URL,
-                json=payload,
-                timeout=10
-            ) 
+            job = min(self._pending_narrations, key=lambda pending: pending.sort_key)
+            if not job.started and job.is_expired():
+                self._expire_narration(job)
             
-            if response.status_code == 200:
-                name = response.json().get("response", "Monstre Inconnu").strip()
-                # Nettoyage basique
-                name = name.replace('"', '').replace('.', '')
-                self.current_monster_name = name
+            self._current_narration = job
+            if job.partial and not job.done.is_set():
+                self._write_action(job.partial)
+            
+            await job.done.wait()
+            self._pending_narrations.remove(job)
+            
+            # Écrire la réponse dans le fichier OBS (rien pour une narration abandonnée)
+            if job.text:
+                self._mark_traces(job, STAGE_DISPLAYED)
+                if self.tracer:
+                    self._traces_awaiting_write.extend(job.traces)
+                self._write_action(job.text)
+                last_release = time.monotonic()
             else:
-                self.current_monster_name = "Ombre Menaçante"
-                
+                self._finish_traces(job.traces)
+    
+    async def _request_monster_name(self) -> str:
+        """
+        Demande un nom de monstre effrayant à Ollama
+        
+        Returns:
+            Nom nettoyé
+            
+        Raises:
+            OllamaError: Si Ollama répond avec un code d'erreur
+            httpx.HTTPError: Si la connexion échoue ou expire
+        """
+        prompt = "Donne-moi un nom court et effrayant pour un monstre de fantasy (ex: 'Le Dévoreur d'Âmes', 'Gobelin enragé'). Réponds UNIQUEMENT par le nom, sans guillemets ni intro."
+        
+        payload = {
+            "model": OLLAMA_MODEL,
+            "prompt": prompt,
+            "stream": False,
+            "options": {"temperature": 1.0}
+        }
+        
+        result = await self.llm_client.generate(payload, timeout=self.config.MONSTER_NAME_TIMEOUT)
+        name = result.get("response", "Monstre Inconnu").strip()
+        # Nettoyage basique
+        return name.replace('"', '').replace('.', '')
+    
+    async def generate_monster_name(self):
+        """Génère un nom de monstre effrayant via Ollama"""
+        try:
+            self.current_monster_name = await self._request_monster_name()
+        except OllamaError:
+            self.current_monster_name = "Ombre Menaçante"
         except Exception as e:
             print(f"⚠️ Erreur génération nom monstre: {e}")
             self.current_monster_name = "La Bête"
+    
+    async def _prefetch_monster_name(self) -> Optional[str]:
+        """Génère un nom pour la réserve (None si Ollama ne répond pas)"""
+        import httpx  # Déjà chargé par le client (import différé au démarrage)
+        
+        try:
+            if self.narration_pool:
+                # Pool partagé: un worker du pool, après les narrations de tous les lives
+                return await self.narration_pool.run_background(self, self._request_monster_name)
+            return await self._request_monster_name()
+        except (OllamaError, httpx.HTTPError, ValueError):
+            return None
+    
+    def pending_narration_count(self) -> int:
+        """Nombre de narrations en attente de génération ou d'affichage"""
+        return len(self._pending_narrations)
+    
+    def _llm_is_idle(self) -> bool:
+        """True si aucune narration n'est en attente ou en cours de génération"""
+        return self.api_queue.empty() and all(job.done.is_set() for job in self._pending_narrations)
+    
+    async def _monster_name_refill_loop(self):
+        """Remplit la réserve de noms de monstres pendant les temps morts"""
+        await self.monster_names.refill(
+            self._prefetch_monster_name,
+            is_idle=self._llm_is_idle,
+            is_running=lambda: self.is_running,
+            interval=self.config.MONSTER_NAME_REFILL_INTERVAL
+        )
 
     async def spawn_monster(self):
-        """Fait apparaître un nouveau monstre si aucun n'est présent"""
+        """Fait apparaître un nouveau monstre si aucun n'est présent (sans attendre le LLM)"""
         if self.current_monster_hp > 0:
             return # Déjà un monstre
             
         print("👹 Apparition d'un nouveau monstre...")
-        await self.generate_monster_name()
+        self.current_monster_name = self.monster_names.take()
         self.current_monster_max_hp = 100 + (self.character.level * 20) # Scaling
         self.current_monster_hp = self.current_monster_max_hp
         self._write_stats() # Update JSON
@@ -304,49 +767,114 @@ class GameEngine:
             self._write_stats()
             # Le monstre disparaît (HP=0), prochain spawn au prochain cadeau
     
-    async def _call_ollama_api(self, prompt: str) -> str:
+    async def _call_ollama_api(self, prompt: str, on_partial=None) -> str:
         """
         Appelle l'API Ollama locale de manière asynchrone
         
         Args:
             prompt: Texte du prompt à envoyer
+            on_partial: Callback appelé avec le texte partiel pendant le streaming (optionnel)
             
         Returns:
             Réponse générée par l'IA
         """
+        import httpx  # Déjà chargé par le client (import différé au démarrage)
+        
         try:
             # Préparer la requête pour Ollama
             payload = {
                 "model": OLLAMA_MODEL,
                 "prompt": f"{SYSTEM_PROMPT}\n\nUtilisateur: {prompt}\n\nAssistant:",
-                "stream": False,
+                "stream": self.config.OLLAMA_STREAMING,
                 "options": {
                     "temperature": 0.9,
                     "top_p": 0.9
                 }
             }
             
-            # Appeler l'API Ollama locale
-            response = await asyncio.to_thread(
-                requests.post,
-                OLLAMA_API_URL,
-                json=payload,
-                timeout=60  # Timeout augmenté pour IA locale
-            )
+            started_at = time.perf_counter()
             
-            if response.status_code == 200:
-                result = response.json()
-                return result.get("response", "").strip()
+            if self.config.OLLAMA_STREAMING:
+                text, result = await self._stream_ollama(payload, on_partial)
             else:
-                print(f"❌ Erreur Ollama ({response.status_code}): {response.text}")
-                return "💀 L'aventurier est momentanément désorienté... (erreur IA)"
+                # Appeler l'API Ollama locale
+                result = await self.llm_client.generate(payload)
+                text = result.get("response", "")
+            
+            stats = self._record_generation(result, started_at)
+            ttft = f", 1er token {stats['time_to_first_token']:.2f}s" if stats["time_to_first_token"] else ""
+            print(f"⏱️ Narration: {stats['duration']:.2f}s{ttft}, "
+                  f"{stats['tokens']} tokens ({stats['tokens_per_sec']:.1f} tok/s)")
+            return text.strip()
                 
-        except requests.exceptions.ConnectionError:
+        except OllamaError as e:
+            print(f"❌ Erreur Ollama ({e.status_code}): {e.text}")
+            return AI_ERROR_TEXT
+        except httpx.ConnectError:
             print("❌ Ollama n'est pas démarré. Lance `ollama serve` dans un terminal.")
-            return "💀 L'IA locale n'est pas disponible..."
+            return AI_UNAVAILABLE_TEXT
         except Exception as e:
             print(f"❌ Erreur API Ollama: {e}")
-            return "💀 L'aventurier est momentanément désorienté... (erreur IA)"
+            return AI_ERROR_TEXT
+    
+    async def _stream_ollama(self, payload: dict, on_partial=None) -> tuple:
+        """
+        Consomme le flux NDJSON d'Ollama token par token
+        
+        Le texte partiel est transmis à on_partial au plus une fois par
+        STREAM_UPDATE_INTERVAL.
+        
+        Args:
+            payload: Requête Ollama
+            on_partial: Callback appelé avec le texte partiel (optionnel)
+            
+        Returns:
+            Tuple (texte généré, dernier chunk Ollama)
+        """
+        text = ""
+        result = {}
+        first_token_at = None
+        last_update = 0.0
+        
+        async for chunk in self.llm_client.stream(payload):
+            token = chunk.get("response", "")
+            if token and first_token_at is None:
+                first_token_at = time.perf_counter()
+            text += token
+            if chunk.get("done"):
+                result = chunk
+            
+            now = time.perf_counter()
+            if on_partial and token and now - last_update >= self.config.STREAM_UPDATE_INTERVAL:
+                last_update = now
+                on_partial(text.strip())
+        
+        result["first_token_at"] = first_token_at
+        return text, result
+    
+    def _record_generation(self, result: dict, started_at: float):
+        """
+        Enregistre la durée et le débit d'une génération
+        
+        Args:
+            result: Réponse (ou dernier chunk) Ollama avec eval_count/eval_duration
+            started_at: Début de l'appel (time.perf_counter)
+            
+        Returns:
+            Statistiques de la génération
+        """
+        duration = time.perf_counter() - started_at
+        tokens = result.get("eval_count", 0)
+        eval_seconds = result.get("eval_duration", 0) / 1e9
+        first_token_at = result.get("first_token_at")
+        
+        self.last_generation = {
+            "duration": duration,
+            "time_to_first_token": first_token_at - started_at if first_token_at else None,
+            "tokens": tokens,
+            "tokens_per_sec": tokens / eval_seconds if eval_seconds > 0 else 0.0
+        }
+        return self.last_generation
     
     async def handle_gift(self, username: str, gift_name: str):
         """
@@ -356,33 +884,91 @@ class GameEngine:
             username: Nom de l'utilisateur qui a envoyé le cadeau
             gift_name: Nom du cadeau
         """
+        await self.handle_gift_batch(username, gift_name, 1)
+    
+    async def handle_gift_batch(self, username: str, gift_name: str, count: int, trace: EventTrace = None,
+                                gift_id: int = None, gift_value: int = None):
+        """
+        Gère un combo de cadeaux identiques en une seule fois
+        
+        Les HP, l'XP et les dégâts du combo sont appliqués en bloc: le coût est le même
+        pour 1 ou 500 cadeaux (une écriture d'état, une narration).
+        
+        Args:
+            username: Nom de l'utilisateur qui a envoyé le combo
+            gift_name: Nom du cadeau
+            count: Nombre de cadeaux du combo
+            trace: Trace de latence de l'événement (terminée à l'écriture de la narration)
+            gift_id: Identifiant TikTok du cadeau (si connu)
+            gift_value: Valeur en pièces TikTok (classe d'un cadeau absent du catalogue)
+        """
+        if count <= 0:
+            self._finish_traces([trace] if trace else [])
+            return
+        
         # S'assurer qu'un monstre est là pour le combat
         if self.current_monster_hp <= 0:
             await self.spawn_monster()
 
-        # Récupérer les infos du cadeau
-        gift_info = get_gift_info(gift_name)
+        # Récupérer les infos du cadeau (nom canonique: variantes et noms localisés regroupés)
+        gift = self.gift_catalog.lookup(gift_name, gift_id, gift_value)
+        gift_name = gift.name or gift_name
         
-        # Appliquer les effets
-        hp_gained = self.character.add_hp(gift_info["hp"])
-        leveled_up = self.character.add_xp(gift_info["xp"])
-        self.character.add_consumed_item(gift_name)
+        # Appliquer les effets du combo entier
+        hp_gained, xp_gained, levels_gained = await self._apply_gift_combo(gift, count)
+        # Seuls les 3 derniers objets sont affichés
+        for _ in range(min(count, 3)):
+            self.character.add_consumed_item(gift_name)
         
         # Mettre à jour les stats OBS
         self._write_stats()
         
-        # Créer le prompt pour l'IA
+        # Créer la narration pour l'IA (fusionnée avec les cadeaux identiques en attente)
         monster_info = f" Face à {self.current_monster_name} (HP: {self.current_monster_hp}/{self.current_monster_max_hp})," if self.current_monster_hp > 0 else ""
-        level_info = f" 🎉 LEVEL UP ! Niveau {self.character.level} !" if leveled_up else ""
+        narration = GiftNarration(
+            username, gift_name, gift.action,
+            hp=hp_gained, xp=xp_gained,
+            level=self.character.level, levels_gained=levels_gained,
+            monster_info=monster_info, monster_name=self.current_monster_name,
+            count=count
+        )
         
-        prompt = f"""L'utilisateur @{username} t'envoie un cadeau: {gift_name}.{monster_info}
-Tu {gift_info['action']}.
-Tu gagnes {hp_gained} HP et {gift_info['xp']} XP.{level_info}
-
-Réponds en 1-2 phrases maximum. Remercie @{username} et décris brièvement ton action."""
+        # Ajouter à la queue API (les cadeaux de valeur passent devant)
+        await self._enqueue_narration(
+            narration, self._gift_merge_keys(username, gift_name),
+            priority=gift.priority, trace=trace
+        )
+    
+    async def _apply_gift_combo(self, gift, count: int) -> tuple:
+        """
+        Applique les HP, l'XP et les dégâts au monstre d'un combo
         
-        # Ajouter à la queue API
-        await self.api_queue.put(prompt)
+        Même résultat que les cadeaux appliqués un par un: le combo est découpé aux
+        monstres vaincus (le suivant apparaît au cadeau d'après), le coût dépend du
+        nombre de monstres vaincus et non de la taille du combo.
+        
+        Args:
+            gift: Cadeau du catalogue (GiftRecord)
+            count: Nombre de cadeaux du combo
+            
+        Returns:
+            (HP gagnés, XP gagnée, niveaux gagnés, bonus des monstres vaincus compris)
+        """
+        hp_gained = xp_gained = 0
+        level_before = self.character.level
+        remaining = count
+        while remaining > 0:
+            if self.current_monster_hp <= 0:
+                await self.spawn_monster()
+            # Cadeaux jusqu'au coup fatal (tout le reste si le cadeau ne fait pas de dégâts)
+            batch = min(remaining, -(-self.current_monster_hp // gift.damage)) if gift.damage > 0 else remaining
+            hp_gained += self.character.add_hp(gift.hp * batch)
+            xp_gained += gift.xp * batch
+            self.character.add_xp(gift.xp * batch)
+            if gift.damage > 0:
+                await self.damage_monster(gift.damage * batch)
+            remaining -= batch
+        return hp_gained, xp_gained, self.character.level - level_before
     
     async def handle_like(self, count: int = 1):
         """
@@ -392,7 +978,7 @@ Réponds en 1-2 phrases maximum. Remercie @{username} et décris brièvement ton
             count: Nombre de likes reçus
         """
         # Soin joueur (inchangé)
-        total_heal = GameConfig.LIKE_HEAL_AMOUNT * count
+        total_heal = self.config.LIKE_HEAL_AMOUNT * count
         hp_gained = self.character.add_hp(total_heal)
         
         # Système de paliers pour les dégâts monstre
@@ -414,15 +1000,16 @@ Réponds en 1-2 phrases maximum. Remercie @{username} et décris brièvement ton
         if hp_gained > 0 or self.current_monster_hp > 0:
             self._write_stats()
     
-    async def handle_like_milestone(self, total_likes: int):
+    async def handle_like_milestone(self, total_likes: int, milestones: int = 1):
         """
         Gère un palier de likes pour une réaction spéciale
         
         Args:
             total_likes: Nombre total de likes reçus
+            milestones: Nombre de paliers franchis d'un coup (une seule réaction)
         """
-        hp_bonus = 5
-        xp_bonus = 10
+        hp_bonus = 5 * milestones
+        xp_bonus = 10 * milestones
         
         self.character.add_hp(hp_bonus)
         self.character.add_xp(xp_bonus)
@@ -433,7 +1020,7 @@ Cette vague d'énergie positive te régénère. +{hp_bonus} HP, +{xp_bonus} XP !
 
 Réagis avec enthousiasme en 1-2 phrases."""
         
-        await self.api_queue.put(prompt)
+        await self._enqueue_narration(NarrationRequest(prompt))
     
     async def start(self):
         """Démarre le moteur de jeu"""
@@ -441,13 +1028,74 @@ Réagis avec enthousiasme en 1-2 phrases."""
         print("✅ Moteur de jeu démarré")
         print(f"📊 Stats initiales: {self.character.hp} HP, Niveau {self.character.level}")
         
+        # Thread d'écriture des fichiers OBS
+        self.obs_writer.start()
+        
+        # Thread du journal d'état et des snapshots
+        if self.state_store:
+            self.state_store.start()
+        
+        # Fichiers OBS initiaux (thread d'écriture déjà actif)
+        self.flush_state()
+        self.ready.set()
+        
+        # Serveur de push pour l'overlay
+        if self.overlay_server:
+            await self.overlay_server.start()
+        
+        # Narrations générées par les workers du moteur, ou par le pool partagé d'un StreamHost
+        narrations = self._narration_sequencer() if self.narration_pool else self._process_api_queue()
+        
         # Lancer les workers asynchrones en parallèle
-        await asyncio.gather(
-            self._process_api_queue(),
-            self._monster_attack_loop()
-        )
+        try:
+            await asyncio.gather(
+                # Pool de connexions vers Ollama (httpx importé sans bloquer la boucle)
+                self.llm_client.warm_up(),
+                narrations,
+                self._monster_attack_loop(),
+                self._state_flush_loop(),
+                self._monster_name_refill_loop(),
+                self.metrics.loop_lag.run(lambda: self.is_running)
+            )
+        finally:
+            if self._owns_llm_client:
+                await self.llm_client.close()
     
     def stop(self):
         """Arrête le moteur de jeu"""
         self.is_running = False
+        
+        # Écrire le dernier état en attente
+        self.flush_state()
+        self.obs_writer.stop()
+        # Traces des derniers snapshots: terminées avant les statistiques et la fermeture du traceur
+        self._finish_written_traces()
+        try:
+            # Noms servis depuis la dernière sauvegarde: pas resservis au prochain live
+            self.monster_names.save()
+        except OSError as e:
+            print(f"⚠️ Erreur sauvegarde réserve de noms: {e}")
+        if self.state_store:
+            # Événements appliqués sans changement d'état, puis dernier snapshot
+            self._record_state()
+            self.state_store.stop()
+        stats = self.obs_writer.get_stats()
+        print(f"💾 Fichiers OBS: {stats['written']} écritures, "
+              f"{stats['superseded']} snapshots remplacés, {stats['skipped']} inchangés")
+        if self.narration_cache:
+            cache = self.narration_cache.get_stats()
+            print(f"🧠 Cache narrations: {cache['hit_rate']:.0%} de réussite "
+                  f"({cache['hits']} hits, {cache['misses']} miss)")
+        names = self.monster_names.get_stats()
+        print(f"👹 Noms de monstres: {names['served']} d'avance, {names['fallback']} de secours, "
+              f"{names['size']} en réserve")
+        if self.tracer:
+            tracing = self.tracer.get_stats()
+            for stage, stats in tracing["stages"].items():
+                print(f"⏱️ {stage}: p50 {stats['p50_ms']:.0f} ms, p95 {stats['p95_ms']:.0f} ms, "
+                      f"max {stats['max_ms']:.0f} ms ({stats['count']} événements)")
+            self.tracer.close()
+        
+        if self.overlay_server:
+            self.overlay_server.close()
         print("⏹️  Moteur de jeu arrêté")
@@ -0,0 +1,260 @@
+"""
+Catalogue des cadeaux TikTok pour L'IA Survivante
+Chargé une seule fois au démarrage depuis un fichier de données (assets/gifts.json):
+index par identifiant TikTok et par nom normalisé, table d'alias (noms localisés,
+variantes) et classes de valeur précalculées (priorité de narration, dégâts au monstre).
+Une recherche est un accès dict, sans allocation pour un nom déjà rencontré.
+"""
+
+import json
+import unicodedata
+from typing import NamedTuple, Optional
+
+from src.config import GameConfig
+
+# Variantes de noms inconnus mémorisées (le coût de la normalisation n'est payé qu'une fois)
+MAX_SEEN_NAMES = 4096
+
+
+class GiftRecord(NamedTuple):
+    """Cadeau du catalogue (immuable, effets précalculés)"""
+    gift_id: Optional[int]  # Identifiant TikTok (None si inconnu)
+    name: Optional[str]  # Nom canonique (None: cadeau absent du catalogue)
+    value: int  # Valeur en pièces TikTok
+    tier: str  # Classe de valeur (GameConfig.GIFT_VALUE_TIERS)
+    priority: int  # Priorité de la narration
+    hp: int  # HP rendus par cadeau
+    xp: int  # XP gagnée par cadeau
+    damage: int  # Dégâts infligés au monstre par cadeau
+    action: str  # Action effectuée avec le cadeau (narration)
+
+
+def normalize_gift_name(name: str) -> str:
+    """
+    Clé de recherche d'un nom de cadeau: sans casse, accents, espaces ni ponctuation
+
+    Args:
+        name: Nom du cadeau tel que reçu ("  finger-heart ", "Cygne"...)
+
+    Returns:
+        Nom normalisé ("fingerheart", "cygne"...)
+    """
+    decomposed = unicodedata.normalize("NFKD", name)
+    return "".join(char for char in decomposed.casefold() if char.isalnum())
+
+
+class GiftCatalog:
+    """Index immuable des cadeaux (identifiant, nom normalisé, alias)"""
+
+    def __init__(self, gifts: list, aliases: dict = None, default: dict = None,
+                 tiers: dict = GameConfig.GIFT_VALUE_TIERS, max_seen: int = MAX_SEEN_NAMES):
+        """
+        Construit les index du catalogue
+
+        Args:
+            gifts: Entrées {"name", "value", "id"?, "hp"?, "xp"?, "damage"?, "action"?}
+                   (hp, xp et dégâts absents: ceux de la classe de valeur)
+            aliases: Noms alternatifs ({alias: nom canonique})
+            default: Effets des cadeaux absents du catalogue ({"hp", "xp", "action"})
+            tiers: Classes de valeur ({nom: {"min_value", "priority", "damage", "hp", "xp"}})
+            max_seen: Variantes de noms mémorisées au plus
+        """
+        default = default or {}
+        self._default_action = default.get("action", "utilise ce cadeau mystérieux avec ingéniosité")
+        self._tier_specs = tiers
+        # Classes de la plus haute à la plus basse valeur
+        self._tiers = tuple(sorted(
+            ((spec["min_value"], name, spec) for name, spec in tiers.items()), key=lambda tier: -tier[0]
+        ))
+
+        # Cadeaux absents du catalogue: effets par défaut, ou ceux de leur classe si la valeur est connue
+        _, lowest_tier, lowest_spec = self._tiers[-1]
+        self.default = GiftRecord(
+            None, None, 0, lowest_tier, lowest_spec["priority"],
+            default.get("hp", lowest_spec["hp"]), default.get("xp", lowest_spec["xp"]),
+            default.get("damage", lowest_spec["damage"]), self._default_action
+        )
+        self._unknown_by_tier = {
+            name: GiftRecord(None, None, min_value, name, spec["priority"], spec["hp"], spec["xp"],
+                             spec["damage"], self._default_action)
+            for min_value, name, spec in self._tiers
+        }
+
+        self._by_id = {}
+        self._by_key = {}  # Nom normalisé -> cadeau
+        for entry in gifts:
+            record = self._make_record(entry)
+            key = normalize_gift_name(record.name)
+            if key in self._by_key:
+                print(f"⚠️ Cadeau en double ignoré: {record.name}")
+                continue
+            self._by_key[key] = record
+            if record.gift_id is not None:
+                self._by_id[record.gift_id] = record
+        self.gift_count = len(self._by_key)
+
+        self.alias_count = 0
+        for alias, name in (aliases or {}).items():
+            record = self._by_key.get(normalize_gift_name(name))
+            if record is None:
+                print(f"⚠️ Alias vers un cadeau inconnu ignoré: {alias} -> {name}")
+                continue
+            self._by_key.setdefault(normalize_gift_name(alias), record)
+            self.alias_count += 1
+
+        # Noms exacts déjà rencontrés (canoniques et alias d'avance, variantes au fil du live)
+        self._by_name = {record.name: record for record in self._by_key.values()}
+        for alias in aliases or {}:
+            record = self._by_key.get(normalize_gift_name(alias))
+            if record is not None:
+                self._by_name.setdefault(alias, record)
+        self._max_names = len(self._by_name) + max_seen
+        self.normalized_count = 0  # Recherches passées par la normalisation
+
+    def _make_record(self, entry: dict) -> GiftRecord:
+        """Précalcule un cadeau du catalogue à partir de son entrée"""
+        value = entry.get("value", 0)
+        tier = self.tier_of(value)
+        spec = self._tier_specs[tier]
+        return GiftRecord(
+            entry.get("id"), entry["name"], value, tier, spec["priority"],
+            entry.get("hp", spec["hp"]), entry.get("xp", spec["xp"]),
+            entry.get("damage", spec["damage"]), entry.get("action", self._default_action)
+        )
+
+    def __len__(self) -> int:
+        return self.gift_count
+
+    def tier_of(self, value: int) -> str:
+        """
+        Classe de valeur d'un cadeau
+
+        Args:
+            value: Valeur en pièces TikTok
+
+        Returns:
+            Nom de la classe (la plus haute dont la valeur min est atteinte)
+        """
+        for min_value, name, _ in self._tiers:
+            if value >= min_value:
+                return name
+        return self._tiers[-1][1]
+
+    def lookup(self, gift_name: Optional[str], gift_id: int = None, value: int = None) -> GiftRecord:
+        """
+        Trouve un cadeau (identifiant, puis nom exact, puis nom normalisé et alias)
+
+        Args:
+            gift_name: Nom du cadeau reçu
+            gift_id: Identifiant TikTok du cadeau (si connu)
+            value: Valeur en pièces TikTok (classe d'un cadeau absent du catalogue)
+
+        Returns:
+            Cadeau du catalogue, ou effets par défaut (de sa classe si la valeur est connue)
+        """
+        if gift_id is not None:
+            record = self._by_id.get(gift_id)
+            if record is not None:
+                return record
+        record = self._by_name.get(gift_name)
+        if record is None:
+            record = self._resolve(gift_name)
+        if record is self.default and value is not None:
+            return self._unknown_by_tier[self.tier_of(value)]
+        return record
+
+    def _resolve(self, gift_name: Optional[str]) -> GiftRecord:
+        """Recherche par nom normalisé, mémorisée pour les prochaines fois"""
+        if not gift_name:
+            return self.default
+        self.normalized_count += 1
+        record = self._by_key.get(normalize_gift_name(gift_name), self.default)
+        if len(self._by_name) < self._max_names:
+            self._by_name[gift_name] = record
+        return record
+
+    def get_stats(self) -> dict:
+        """
+        Retourne la taille des index
+
+        Returns:
+            Dictionnaire des compteurs
+        """
+        return {
+            "gifts": self.gift_count,
+            "ids": len(self._by_id),
+            "aliases": self.alias_count,
+            "names": len(self._by_name),
+            "normalized": self.normalized_count,
+        }
+
+
+def load_gift_catalog(path: str, tiers: dict = GameConfig.GIFT_VALUE_TIERS) -> GiftCatalog:
+    """
+    Charge le catalogue depuis son fichier JSON ({"gifts", "aliases", "default"})
+
+    Un fichier absent ou illisible donne un catalogue vide (tous les cadeaux ont les effets par défaut).
+
+    Args:
+        path: Fichier du catalogue
+        tiers: Classes de valeur
+
+    Returns:
+        Catalogue indexé
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"⚠️ Catalogue des cadeaux illisible ({path}): {e}")
+        data = {}
+    return GiftCatalog(data.get("gifts", []), data.get("aliases"), data.get("default"), tiers)
+
+
+# Catalogues déjà chargés (un par fichier, partagés par tous les moteurs du processus)
+_catalogs = {}
+
+
+def get_gift_catalog(config=GameConfig) -> GiftCatalog:
+    """
+    Retourne le catalogue de la configuration (chargé au premier appel)
+
+    Args:
+        config: Configuration (GIFT_CATALOG_FILE, GIFT_VALUE_TIERS)
+
+    Returns:
+        Catalogue indexé
+    """
+    catalog = _catalogs.get(config.GIFT_CATALOG_FILE)
+    if catalog is None:
+        catalog = load_gift_catalog(config.GIFT_CATALOG_FILE, config.GIFT_VALUE_TIERS)
+        _catalogs[config.GIFT_CATALOG_FILE] = catalog
+    return catalog
+
+
+def get_gift_info(gift_name: str, gift_id: int = None, value: int = None) -> GiftRecord:
+    """
+    Récupère les informations d'un cadeau
+
+    Args:
+        gift_name: Nom du cadeau TikTok
+        gift_id: Identifiant TikTok du cadeau (si connu)
+        value: Valeur en pièces TikTok (si connue)
+
+    Returns:
+        Cadeau du catalogue (hp, xp, damage, action, priority...)
+    """
+    return get_gift_catalog().lookup(gift_name, gift_id, value)
+
+
+def get_gift_priority(gift_name: str) -> int:
+    """
+    Priorité de narration d'un cadeau d'après sa classe de valeur
+
+    Args:
+        gift_name: Nom du cadeau TikTok
+
+    Returns:
+        Classe de priorité (voir GameConfig.NARRATION_PRIORITY_NAMES)
+    """
+    return get_gift_info(gift_name).priority
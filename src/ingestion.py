@@ -0,0 +1,185 @@
+"""
+File d'ingestion des événements TikTok pour L'IA Survivante
+Les handlers TikTokLive déposent les événements et rendent la main immédiatement,
+une tâche dédiée les applique au moteur dans l'ordre
+"""
+
+import asyncio
+import time
+from collections import deque
+from typing import Optional
+
+# Politiques de débordement quand la file est pleine
+OVERFLOW_COALESCE = "coalesce"  # Fusionner avec un événement identique en attente
+OVERFLOW_KEEP = "keep"  # Accepter quand même (la file dépasse sa taille)
+OVERFLOW_DROP = "drop"  # Ignorer l'événement
+
+# Nombre de latences conservées pour les percentiles
+LATENCY_SAMPLES = 1024
+
+
+class IngestEvent:
+    """Événement TikTok normalisé (cadeau, likes ou commentaire)"""
+
+    def __init__(self, kind: str, username: str, gift_name: str = None,
+                 count: int = 1, comment: str = None, gift_id: int = None, gift_value: int = None):
+        """
+        Initialise l'événement
+
+        Args:
+            kind: Type d'événement ("gift", "like" ou "comment")
+            username: Utilisateur à l'origine de l'événement
+            gift_name: Nom du cadeau (cadeaux uniquement)
+            count: Nombre de cadeaux du combo ou de likes
+            comment: Texte du commentaire (commentaires uniquement)
+            gift_id: Identifiant TikTok du cadeau (cadeaux uniquement, si connu)
+            gift_value: Valeur du cadeau en pièces TikTok (cadeaux uniquement, si connue)
+        """
+        self.kind = kind
+        self.username = username
+        self.gift_name = gift_name
+        self.count = count
+        self.comment = comment
+        self.gift_id = gift_id
+        self.gift_value = gift_value
+        self.received_at = time.monotonic()
+        self.trace = None  # Trace de latence (si le traçage est activé)
+        self.merged_traces = []  # Traces des événements fusionnés dans celui-ci
+
+    @property
+    def traces(self) -> list:
+        """Traces de l'événement et des événements fusionnés dans celui-ci"""
+        return ([self.trace] if self.trace else []) + self.merged_traces
+
+    def can_coalesce(self, other) -> bool:
+        """True si l'autre événement peut être fusionné dans celui-ci"""
+        if other.kind != self.kind:
+            return False
+        if self.kind == "like":
+            return True
+        if self.kind == "gift":
+            return other.username == self.username and other.gift_name == self.gift_name
+        return False
+
+
+class IngestionQueue:
+    """File bornée d'événements, avec politique de débordement par type d'événement"""
+
+    def __init__(self, max_size: int = 1000, overflow_policy: dict = None):
+        """
+        Initialise la file
+
+        Args:
+            max_size: Nombre d'événements en attente au-delà duquel la politique s'applique
+            overflow_policy: Politique par type d'événement ({type: OVERFLOW_*}),
+                             OVERFLOW_DROP pour les types absents
+        """
+        self.max_size = max_size
+        self.overflow_policy = overflow_policy or {}
+        self._events = deque()
+        self._not_empty = asyncio.Event()
+        self._closed = False
+        self._latencies = deque(maxlen=LATENCY_SAMPLES)
+        self.enqueued_count = 0
+        self.applied_count = 0
+        self.coalesced_count = 0
+        self.dropped_count = 0
+        self.overflow_count = 0  # Acceptés au-delà de la taille max (jamais ignorés)
+        self.max_depth = 0
+
+    def qsize(self) -> int:
+        """Nombre d'événements en attente"""
+        return len(self._events)
+
+    def empty(self) -> bool:
+        """True si aucun événement n'attend"""
+        return not self._events
+
+    def offer(self, event: IngestEvent) -> bool:
+        """
+        Dépose un événement sans jamais attendre
+
+        Args:
+            event: Événement à appliquer
+
+        Returns:
+            False si l'événement a été ignoré (file pleine, politique OVERFLOW_DROP)
+        """
+        if len(self._events) >= self.max_size:
+            policy = self.overflow_policy.get(event.kind, OVERFLOW_DROP)
+            if policy == OVERFLOW_COALESCE and self._coalesce(event):
+                return True
+            if policy == OVERFLOW_DROP:
+                self.dropped_count += 1
+                return False
+            # Rien à fusionner: accepté quand même, jamais perdu
+            self.overflow_count += 1
+
+        self._events.append(event)
+        self.enqueued_count += 1
+        self.max_depth = max(self.max_depth, len(self._events))
+        self._not_empty.set()
+        return True
+
+    def _coalesce(self, event: IngestEvent) -> bool:
+        """Fusionne l'événement dans le plus récent événement compatible en attente"""
+        for pending in reversed(self._events):
+            if pending.can_coalesce(event):
+                pending.count += event.count
+                # Trace terminée avec l'événement en attente (latence visible en surcharge)
+                pending.merged_traces.extend(event.traces)
+                self.coalesced_count += 1
+                return True
+        return False
+
+    def close(self):
+        """Ferme la file: get() rend None une fois les événements en attente épuisés"""
+        self._closed = True
+        self._not_empty.set()
+
+    async def get(self) -> Optional[IngestEvent]:
+        """
+        Retire le plus ancien événement (attend s'il n'y en a aucun)
+
+        Returns:
+            Événement à appliquer, None si la file est fermée et vide
+        """
+        while not self._events:
+            if self._closed:
+                return None
+            self._not_empty.clear()
+            await self._not_empty.wait()
+        return self.get_nowait()
+
+    def get_nowait(self) -> Optional[IngestEvent]:
+        """Retire le plus ancien événement (None si la file est vide)"""
+        if not self._events:
+            return None
+        return self._events.popleft()
+
+    def record_applied(self, event: IngestEvent):
+        """Enregistre la latence réception -> application d'un événement"""
+        self.applied_count += 1
+        self._latencies.append(time.monotonic() - event.received_at)
+
+    def get_stats(self) -> dict:
+        """
+        Retourne profondeur, compteurs et latence d'application
+
+        Returns:
+            Dictionnaire des métriques (latences en secondes)
+        """
+        latencies = sorted(self._latencies)
+        count = len(latencies)
+        return {
+            "depth": len(self._events),
+            "max_depth": self.max_depth,
+            "enqueued": self.enqueued_count,
+            "applied": self.applied_count,
+            "coalesced": self.coalesced_count,
+            "dropped": self.dropped_count,
+            "overflow": self.overflow_count,
+            "latency_avg": sum(latencies) / count if count else 0.0,
+            "latency_p95": latencies[min(count - 1, int(count * 0.95))] if count else 0.0,
+            "latency_max": latencies[-1] if count else 0.0,
+        }
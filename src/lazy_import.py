@@ -0,0 +1,48 @@
+"""
+Imports différés pour L'IA Survivante
+Les dépendances lourdes (TikTokLive, httpx) ne sont pas importées au démarrage:
+elles sont chargées dans un thread pendant que le moteur démarre, sans bloquer la boucle asyncio
+"""
+
+import asyncio
+import importlib
+import sys
+import time
+
+# Modules lourds qui ne doivent pas être importés au démarrage (vérifié par test/benchmark.py)
+HEAVY_MODULES = ["TikTokLive", "httpx"]
+
+
+def import_modules(*names: str) -> float:
+    """
+    Importe des modules (déjà importés: sans effet)
+
+    Args:
+        *names: Noms des modules
+
+    Returns:
+        Durée de l'import en secondes
+    """
+    started = time.perf_counter()
+    for name in names:
+        if name not in sys.modules:
+            importlib.import_module(name)
+    return time.perf_counter() - started
+
+
+async def import_in_background(*names: str) -> float:
+    """
+    Importe des modules dans un thread (la boucle continue de traiter les événements)
+
+    L'import est protégé par le verrou d'import de Python: un import du même module
+    depuis la boucle pendant ce temps attend simplement la fin du chargement.
+
+    Args:
+        *names: Noms des modules
+
+    Returns:
+        Durée de l'import en secondes (0 si tous étaient déjà chargés)
+    """
+    if all(name in sys.modules for name in names):
+        return 0.0
+    return await asyncio.to_thread(import_modules, *names)
@@ -0,0 +1,119 @@
+"""
+Client HTTP asynchrone pour l'API Ollama
+Un seul pool de connexions keep-alive partagé par tous les appels LLM du moteur
+(httpx est importé au premier usage, voir warm_up)
+"""
+
+import json
+from typing import AsyncIterator, Optional
+
+from src.lazy_import import import_in_background
+
+
+class OllamaError(Exception):
+    """Réponse HTTP non-200 de l'API Ollama"""
+
+    def __init__(self, status_code: int, text: str):
+        super().__init__(f"HTTP {status_code}: {text}")
+        self.status_code = status_code
+        self.text = text
+
+
+class OllamaClient:
+    """Client /api/generate avec pool de connexions et timeouts par requête"""
+
+    def __init__(self, api_url: str, max_connections: int = 4,
+                 timeout: float = 60.0, connect_timeout: float = 5.0):
+        """
+        Initialise le client (le pool est créé par start ou au premier appel)
+
+        Args:
+            api_url: URL de l'endpoint /api/generate
+            max_connections: Nombre max de requêtes simultanées vers Ollama
+            timeout: Timeout par défaut d'une génération (secondes)
+            connect_timeout: Timeout d'établissement de connexion (secondes)
+        """
+        self.api_url = api_url
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.connect_timeout = connect_timeout
+        self._client = None
+
+    async def warm_up(self):
+        """Importe httpx dans un thread puis crée le pool (la boucle reste libre pendant l'import)"""
+        await import_in_background("httpx")
+        self.start()
+
+    def start(self):
+        """Crée le pool de connexions"""
+        if self._client is not None:
+            return
+        import httpx
+        self._client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_connections
+            ),
+            # Pas de timeout d'attente du pool: la limite de connexions sert de file d'attente
+            timeout=httpx.Timeout(self.timeout, connect=self.connect_timeout, pool=None)
+        )
+
+    async def close(self):
+        """Ferme le pool de connexions"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def _timeout(self, timeout: Optional[float]):
+        """Timeout d'une requête (httpx.Timeout, celui par défaut si None)"""
+        import httpx
+        return httpx.Timeout(timeout or self.timeout, connect=self.connect_timeout, pool=None)
+
+    async def generate(self, payload: dict, timeout: Optional[float] = None) -> dict:
+        """
+        Génère une réponse complète (sans streaming)
+
+        Args:
+            payload: Requête Ollama
+            timeout: Timeout de cette requête en secondes (optionnel)
+
+        Returns:
+            Réponse JSON d'Ollama
+
+        Raises:
+            OllamaError: Si Ollama répond avec un code d'erreur
+            httpx.HTTPError: Si la connexion échoue ou expire
+        """
+        self.start()
+        response = await self._client.post(
+            self.api_url, json={**payload, "stream": False}, timeout=self._timeout(timeout)
+        )
+        if response.status_code != 200:
+            raise OllamaError(response.status_code, response.text)
+        return response.json()
+
+    async def stream(self, payload: dict, timeout: Optional[float] = None) -> AsyncIterator[dict]:
+        """
+        Génère une réponse en streaming (un chunk NDJSON par token)
+
+        Args:
+            payload: Requête Ollama
+            timeout: Timeout entre 2 chunks en secondes (optionnel)
+
+        Yields:
+            Chunks JSON d'Ollama, le dernier ayant "done": True
+
+        Raises:
+            OllamaError: Si Ollama répond avec un code d'erreur
+            httpx.HTTPError: Si la connexion échoue ou expire
+        """
+        self.start()
+        async with self._client.stream(
+            "POST", self.api_url, json={**payload, "stream": True}, timeout=self._timeout(timeout)
+        ) as response:
+            if response.status_code != 200:
+                body = await response.aread()
+                raise OllamaError(response.status_code, body.decode("utf-8", errors="replace"))
+            async for line in response.aiter_lines():
+                if line:
+                    yield json.loads(line)
@@ -0,0 +1,238 @@
+"""
+Métriques du moteur en cours d'exécution pour L'IA Survivante
+Agrège les compteurs déjà tenus par chaque composant (files, cache, writer, traces)
+et les expose en JSON (/stats) ou au format texte Prometheus (/metrics)
+"""
+
+import asyncio
+import time
+from collections import deque
+from typing import Callable
+
+from src.tracing import LatencyHistogram
+
+# Fenêtre (secondes) du calcul des événements par seconde
+EVENT_RATE_WINDOW = 10
+
+# Préfixe des métriques Prometheus
+METRIC_PREFIX = "survivor"
+
+
+class EventRateMeter:
+    """Compteurs d'événements par type, avec débit sur une fenêtre glissante"""
+
+    def __init__(self, window: int = EVENT_RATE_WINDOW):
+        """
+        Initialise le compteur
+
+        Args:
+            window: Fenêtre du débit en secondes (une case par seconde)
+        """
+        self.window = window
+        self.totals = {}
+        self._buckets = deque()  # (seconde, {type: nombre}), la plus récente à droite
+
+    def record(self, kind: str, count: int = 1):
+        """Compte un événement reçu"""
+        self.totals[kind] = self.totals.get(kind, 0) + count
+        second = int(time.monotonic())
+        if not self._buckets or self._buckets[-1][0] != second:
+            self._buckets.append((second, {}))
+            self._trim(second)
+        counts = self._buckets[-1][1]
+        counts[kind] = counts.get(kind, 0) + count
+
+    def _trim(self, now_second: int):
+        """Oublie les cases sorties de la fenêtre"""
+        while self._buckets and self._buckets[0][0] <= now_second - self.window:
+            self._buckets.popleft()
+
+    def rates(self) -> dict:
+        """Événements par seconde et par type sur la fenêtre"""
+        self._trim(int(time.monotonic()))
+        totals = {kind: 0 for kind in self.totals}
+        for _, counts in self._buckets:
+            for kind, count in counts.items():
+                totals[kind] += count
+        return {kind: count / self.window for kind, count in totals.items()}
+
+
+class LoopLagMonitor:
+    """Mesure le retard de la boucle asyncio (réveil d'un sleep plus tard que prévu)"""
+
+    def __init__(self, interval: float = 0.5):
+        """
+        Initialise la mesure
+
+        Args:
+            interval: Secondes entre deux mesures
+        """
+        self.interval = interval
+        self.histogram = LatencyHistogram()
+        self.last_lag = 0.0
+
+    async def run(self, is_running: Callable[[], bool]):
+        """Boucle de mesure, tant que le moteur tourne"""
+        loop = asyncio.get_running_loop()
+        while is_running():
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            self.last_lag = max(0.0, loop.time() - expected)
+            self.histogram.add(self.last_lag)
+
+    def get_stats(self) -> dict:
+        """Dernier retard et distribution (ms)"""
+        return {"last_ms": self.last_lag * 1000, **self.histogram.get_stats()}
+
+
+class EngineMetrics:
+    """Vue des métriques d'un GameEngine (et de la file d'ingestion du listener)"""
+
+    def __init__(self, engine):
+        """
+        Initialise les métriques
+
+        Args:
+            engine: GameEngine observé
+        """
+        self.engine = engine
+        self.ingestion = None  # IngestionQueue, renseignée par le listener
+        self.events = EventRateMeter()
+        self.loop_lag = LoopLagMonitor()
+        self.started_at = time.monotonic()
+
+    def get_stats(self) -> dict:
+        """
+        Retourne l'état du moteur (lecture des compteurs existants, sans calcul coûteux)
+
+        Returns:
+            Dictionnaire JSON-sérialisable (latences en ms)
+        """
+        engine = self.engine
+        return {
+            "uptime_seconds": time.monotonic() - self.started_at,
+            "events": {"total": dict(self.events.totals), "per_second": self.events.rates()},
+            "ingestion": self.ingestion.get_stats() if self.ingestion else None,
+            "character": {
+                "hp": engine.character.hp,
+                "max_hp": engine.character.max_hp,
+                "level": engine.character.level,
+            },
+            "narrations": {
+                "queue": engine.api_queue.get_stats(),
+                "pending": engine.pending_narration_count(),
+                "coalesced": engine.narrations_coalesced,
+                "last_generation": engine.last_generation,
+            },
+            "narration_cache": engine.narration_cache.get_stats() if engine.narration_cache else None,
+            "monster_names": engine.monster_names.get_stats(),
+            "gift_catalog": engine.gift_catalog.get_stats(),
+            "obs_files": engine.obs_writer.get_stats(),
+            "state_store": engine.state_store.get_stats() if engine.state_store else None,
+            "overlay_clients": engine.overlay_server.client_count if engine.overlay_server else 0,
+            "latency": engine.tracer.get_stats() if engine.tracer else None,
+            "event_loop_lag": self.loop_lag.get_stats(),
+        }
+
+    def render_prometheus(self) -> str:
+        """
+        Retourne les métriques au format texte Prometheus (version 0.0.4)
+
+        Returns:
+            Texte à servir sur /metrics
+        """
+        engine = self.engine
+        lines = []
+
+        def metric(name: str, kind: str, help_text: str, samples: list):
+            lines.append(f"# HELP {METRIC_PREFIX}_{name} {help_text}")
+            lines.append(f"# TYPE {METRIC_PREFIX}_{name} {kind}")
+            for labels, value in samples:
+                lines.append(f"{METRIC_PREFIX}_{name}{_labels(labels)} {_number(value)}")
+
+        metric("uptime_seconds", "gauge", "Secondes depuis le démarrage du moteur",
+               [({}, time.monotonic() - self.started_at)])
+        metric("events_total", "counter", "Événements TikTok reçus par type",
+               [({"kind": kind}, count) for kind, count in self.events.totals.items()])
+        metric("events_per_second", "gauge", f"Événements par seconde sur {self.events.window} s",
+               [({"kind": kind}, rate) for kind, rate in self.events.rates().items()])
+
+        if self.ingestion:
+            ingestion = self.ingestion.get_stats()
+            metric("ingest_queue_depth", "gauge", "Événements en attente d'application",
+                   [({}, ingestion["depth"])])
+            metric("ingest_events_total", "counter", "Événements de la file d'ingestion par issue",
+                   [({"outcome": outcome}, ingestion[outcome])
+                    for outcome in ("applied", "coalesced", "dropped", "overflow")])
+
+        queue = engine.api_queue.get_stats()
+        metric("narration_queue_depth", "gauge", "Narrations en attente d'un worker par priorité",
+               [({"priority": name}, stats["depth"]) for name, stats in queue.items()])
+        metric("narrations_dequeued_total", "counter", "Narrations prises par un worker par priorité",
+               [({"priority": name}, stats["dequeued"]) for name, stats in queue.items()])
+        metric("narrations_expired_total", "counter", "Narrations expirées avant génération par priorité",
+               [({"priority": name}, stats["expired"]) for name, stats in queue.items()])
+        metric("narration_wait_seconds_max", "gauge", "Attente max dans la file par priorité",
+               [({"priority": name}, stats["wait_max"]) for name, stats in queue.items()])
+        metric("narrations_pending", "gauge", "Narrations en attente de génération ou d'affichage",
+               [({}, engine.pending_narration_count())])
+        metric("narrations_coalesced_total", "counter", "Demandes fusionnées dans une narration en attente",
+               [({}, engine.narrations_coalesced)])
+        if engine.last_generation:
+            metric("llm_tokens_per_second", "gauge", "Débit de la dernière génération",
+                   [({}, engine.last_generation["tokens_per_sec"])])
+
+        if engine.narration_cache:
+            cache = engine.narration_cache.get_stats()
+            metric("narration_cache_requests_total", "counter", "Recherches dans le cache des narrations",
+                   [({"result": "hit"}, cache["hits"]), ({"result": "miss"}, cache["misses"])])
+
+        writer = engine.obs_writer.get_stats()
+        metric("obs_snapshots_total", "counter", "Snapshots des fichiers OBS par issue",
+               [({"outcome": outcome}, writer[outcome]) for outcome in ("submitted", "superseded")])
+        metric("obs_file_writes_total", "counter", "Écritures de fichiers OBS (skipped: contenu inchangé)",
+               [({"outcome": "written"}, writer["written"]), ({"outcome": "skipped"}, writer["skipped"])])
+
+        if engine.tracer:
+            self._histogram(lines, "event_stage_latency_seconds", "Latence entre deux étapes d'un événement",
+                            "stage", engine.tracer.stage_histograms)
+            self._histogram(lines, "event_latency_seconds", "Latence réception -> dernière étape par type",
+                            "kind", engine.tracer.total_histograms)
+        self._histogram(lines, "event_loop_lag_seconds", "Retard de réveil de la boucle asyncio",
+                        None, {None: self.loop_lag.histogram})
+
+        return "\n".join(lines) + "\n"
+
+    def _histogram(self, lines: list, name: str, help_text: str, label: str, histograms: dict):
+        """Ajoute des histogrammes (secondes) au format Prometheus"""
+        full_name = f"{METRIC_PREFIX}_{name}"
+        lines.append(f"# HELP {full_name} {help_text}")
+        lines.append(f"# TYPE {full_name} histogram")
+        for value, histogram in histograms.items():
+            labels = {label: value} if label else {}
+            cumulative = 0
+            for bound_ms, count in zip(histogram.bounds_ms, histogram.counts):
+                cumulative += count
+                lines.append(f"{full_name}_bucket{_labels({**labels, 'le': _number(bound_ms / 1000)})} {cumulative}")
+            lines.append(f"{full_name}_bucket{_labels({**labels, 'le': '+Inf'})} {histogram.count}")
+            lines.append(f"{full_name}_sum{_labels(labels)} {_number(histogram.total_ms / 1000)}")
+            lines.append(f"{full_name}_count{_labels(labels)} {histogram.count}")
+
+
+def _labels(labels: dict) -> str:
+    """Formate les labels Prometheus ({} si aucun)"""
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+
+def _escape(value) -> str:
+    """Échappe une valeur de label (antislash, guillemet, retour à la ligne)"""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _number(value) -> str:
+    """Formate une valeur numérique Prometheus"""
+    if isinstance(value, float):
+        return repr(round(value, 6))
+    return str(value)
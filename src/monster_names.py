@@ -0,0 +1,181 @@
+"""
+Réserve de noms de monstres pour L'IA Survivante
+Noms générés à l'avance par le LLM pendant les temps morts et conservés entre deux lives,
+pour que l'apparition d'un monstre n'attende jamais Ollama
+"""
+
+import asyncio
+import json
+import os
+import random
+from collections import deque
+from typing import Awaitable, Callable, Optional
+
+# Noms de secours quand la réserve est vide (Ollama absent ou trop lent)
+FALLBACK_MONSTER_NAMES = [
+    "Ombre Menaçante",
+    "La Bête",
+    "Le Dévoreur d'Âmes",
+    "Gobelin Enragé",
+    "Spectre des Marais",
+    "Golem de Ronces",
+    "La Goule Affamée",
+    "Wyverne Cendrée",
+    "Le Roi Squelette",
+    "Araignée des Abysses",
+]
+
+
+class MonsterNamePool:
+    """Réserve de noms de monstres, remplie en arrière-plan et persistée sur le disque"""
+
+    def __init__(self, path: Optional[str], target_size: int = 10):
+        """
+        Initialise la réserve
+
+        Args:
+            path: Fichier JSON de persistance (None: réserve en mémoire uniquement)
+            target_size: Nombre de noms à garder d'avance
+        """
+        self.path = path
+        self.target_size = target_size
+        self._names = deque()
+        self._last_name = None
+        self.generated_count = 0  # Noms générés par le LLM
+        self.served_count = 0  # Noms servis depuis la réserve
+        self.fallback_count = 0  # Noms de secours servis (réserve vide)
+        self._unsaved = False  # Noms servis depuis la dernière sauvegarde
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    @property
+    def needs_refill(self) -> bool:
+        """True si la réserve est sous sa taille cible"""
+        return len(self._names) < self.target_size
+
+    def load(self) -> int:
+        """
+        Recharge les noms conservés lors du live précédent
+
+        Returns:
+            Nombre de noms chargés
+        """
+        if not self.path or not os.path.exists(self.path):
+            return 0
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                names = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Réserve de noms illisible ({self.path}): {e}")
+            return 0
+
+        loaded = 0
+        for name in names:
+            if isinstance(name, str) and self.add(name):
+                loaded += 1
+        return loaded
+
+    def save(self, names: list = None):
+        """
+        Écrit la réserve sur le disque (fichier temporaire + os.replace)
+
+        Args:
+            names: Noms à écrire (copie prise sur la boucle asyncio; None: la réserve actuelle)
+        """
+        if not self.path:
+            return
+        if names is None:
+            names = list(self._names)
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(names, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def add(self, name: str) -> bool:
+        """
+        Ajoute un nom à la réserve (ignoré s'il est vide ou déjà présent)
+
+        Args:
+            name: Nom de monstre
+
+        Returns:
+            True si le nom a été ajouté
+        """
+        name = name.strip()
+        if not name or name in self._names:
+            return False
+        self._names.append(name)
+        return True
+
+    def take(self) -> str:
+        """
+        Retire un nom de la réserve, sans jamais attendre
+
+        Returns:
+            Le plus ancien nom de la réserve, ou un nom de secours si elle est vide
+        """
+        if self._names:
+            name = self._names.popleft()
+            self.served_count += 1
+            self._unsaved = True  # Ne plus le resservir après un redémarrage
+        else:
+            choices = [n for n in FALLBACK_MONSTER_NAMES if n != self._last_name]
+            name = random.choice(choices)
+            self.fallback_count += 1
+        self._last_name = name
+        return name
+
+    async def refill(self, generate: Callable[[], Awaitable[Optional[str]]],
+                     is_idle: Callable[[], bool], is_running: Callable[[], bool],
+                     interval: float = 2.0):
+        """
+        Boucle de remplissage: génère un nom à la fois, uniquement quand le moteur est inactif
+
+        Args:
+            generate: Coroutine qui renvoie un nouveau nom (None en cas d'échec)
+            is_idle: True si le LLM n'a pas de narration à générer
+            is_running: True tant que le moteur tourne
+            interval: Attente entre deux vérifications (et après un échec), en secondes
+        """
+        while is_running():
+            if self._unsaved:
+                await self._save_in_background()
+            if not (self.needs_refill and is_idle()):
+                await asyncio.sleep(interval)
+                continue
+
+            name = await generate()
+            if name and self.add(name):
+                self.generated_count += 1
+                await self._save_in_background()
+            else:
+                await asyncio.sleep(interval)  # Ollama indisponible: ne pas insister
+
+    async def _save_in_background(self):
+        """Sauvegarde la réserve depuis un thread (copie des noms prise sur la boucle)"""
+        names = list(self._names)
+        # Sur la boucle, avec la copie: un nom servi pendant l'écriture sera sauvegardé au prochain tour
+        self._unsaved = False
+        try:
+            await asyncio.to_thread(self.save, names)
+        except OSError as e:
+            self._unsaved = True
+            print(f"⚠️ Erreur sauvegarde réserve de noms: {e}")
+
+    def get_stats(self) -> dict:
+        """
+        Retourne les compteurs de la réserve
+
+        Returns:
+            Dictionnaire (size, generated, served, fallback)
+        """
+        return {
+            "size": len(self._names),
+            "generated": self.generated_count,
+            "served": self.served_count,
+            "fallback": self.fallback_count,
+        }
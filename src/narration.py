@@ -0,0 +1,328 @@
+"""
+Narrations de L'IA Survivante
+Jobs de narration générés en parallèle et affichés par priorité puis ordre d'arrivée,
+avec fusion des cadeaux en attente (combos, vagues de cadeaux) et date limite
+"""
+
+import asyncio
+import heapq
+import time
+from typing import Optional
+
+from src.narration_cache import MONSTER_PLACEHOLDER, VIEWER_PLACEHOLDER
+
+
+class NarrationRequest:
+    """Demande de narration à prompt fixe (non fusionnable)"""
+
+    def __init__(self, prompt: str, fallback: str = None):
+        """
+        Initialise la demande
+
+        Args:
+            prompt: Prompt à envoyer au LLM
+            fallback: Texte affiché si la narration expire (None: rien n'est affiché)
+        """
+        self.prompt = prompt
+        self.fallback = fallback
+
+    def build_prompt(self) -> str:
+        """Construit le prompt à envoyer au LLM"""
+        return self.prompt
+
+    def fallback_text(self) -> Optional[str]:
+        """Texte de secours (sans LLM) si la narration expire avant sa génération"""
+        return self.fallback
+
+    def cache_key(self) -> Optional[tuple]:
+        """Signature normalisée pour le cache des narrations (None: jamais mise en cache)"""
+        return None
+
+    def placeholders(self) -> dict:
+        """Valeurs propres à cette narration, remplacées par des marqueurs dans le cache"""
+        return {}
+
+    def merge(self, other) -> bool:
+        """
+        Fusionne une autre demande dans celle-ci
+
+        Returns:
+            True si la fusion a eu lieu
+        """
+        return False
+
+
+class GiftNarration(NarrationRequest):
+    """Narration d'un ou plusieurs cadeaux identiques, fusionnables tant qu'elle attend"""
+
+    # Largeur des tranches de HP gagnés pour la signature du cache
+    HP_BUCKET = 5
+
+    def __init__(self, username: str, gift_name: str, action: str,
+                 hp: int, xp: int, level: int, levels_gained: int, monster_info: str,
+                 monster_name: str = None, count: int = 1):
+        """
+        Initialise la narration d'un cadeau
+
+        Args:
+            username: Utilisateur qui a envoyé le cadeau
+            gift_name: Nom du cadeau
+            action: Action effectuée avec le cadeau (GIFT_ACTIONS)
+            hp: HP effectivement gagnés
+            xp: XP gagnés
+            level: Niveau du personnage après le cadeau
+            levels_gained: Niveaux gagnés grâce au cadeau
+            monster_info: Description du monstre affronté ("" si aucun)
+            monster_name: Nom du monstre affronté (None si aucun)
+            count: Nombre de cadeaux (combo)
+        """
+        super().__init__(None)
+        self.senders = {username: count}  # Utilisateur -> nombre de cadeaux (ordre d'arrivée)
+        self.gift_name = gift_name
+        self.action = action
+        self.hp = hp
+        self.xp = xp
+        self.level = level
+        self.levels_gained = levels_gained
+        self.monster_info = monster_info
+        self.monster_name = monster_name if monster_info else None
+
+    @property
+    def count(self) -> int:
+        """Nombre total de cadeaux fusionnés"""
+        return sum(self.senders.values())
+
+    def merge(self, other) -> bool:
+        """
+        Fusionne un autre cadeau identique (totaux cumulés, dernier état du combat)
+
+        Args:
+            other: GiftNarration du même cadeau
+
+        Returns:
+            True si la fusion a eu lieu
+        """
+        if not isinstance(other, GiftNarration) or other.gift_name != self.gift_name:
+            return False
+
+        for username, count in other.senders.items():
+            self.senders[username] = self.senders.get(username, 0) + count
+        self.hp += other.hp
+        self.xp += other.xp
+        self.level = other.level
+        self.levels_gained += other.levels_gained
+        self.monster_info = other.monster_info
+        self.monster_name = other.monster_name
+        return True
+
+    def cache_key(self) -> Optional[tuple]:
+        """
+        Signature du cache: cadeau, level up, monstre présent, tranche de HP
+
+        Seuls les cadeaux uniques d'un seul viewer sont mis en cache
+        (les narrations fusionnées citent des nombres et plusieurs viewers).
+        """
+        if self.count != 1:
+            return None
+        return (
+            "gift", self.gift_name,
+            self.level if self.levels_gained else None,
+            self.monster_name is not None,
+            self.hp // self.HP_BUCKET
+        )
+
+    def placeholders(self) -> dict:
+        """Viewer et monstre, substitués au rendu d'une narration en cache"""
+        return {
+            VIEWER_PLACEHOLDER: f"@{next(iter(self.senders))}",
+            MONSTER_PLACEHOLDER: self.monster_name,
+        }
+
+    def _thanks(self) -> str:
+        """Liste des viewers à remercier ("@a, @b et @c")"""
+        users = [f"@{username}" for username in self.senders]
+        return users[0] if len(users) == 1 else ", ".join(users[:-1]) + f" et {users[-1]}"
+
+    def fallback_text(self) -> str:
+        """Remerciement sans LLM, pour que chaque viewer soit quand même cité"""
+        gifts = f"{self.gift_name} x{self.count}" if self.count > 1 else self.gift_name
+        return f"🎁 Merci {self._thanks()} pour {gifts} ! +{self.hp} HP, +{self.xp} XP"
+
+    def build_prompt(self) -> str:
+        """Construit le prompt (agrégé si plusieurs cadeaux ont été fusionnés)"""
+        users = [f"@{username}" for username in self.senders]
+        thanks = self._thanks()
+        level_info = f" 🎉 LEVEL UP ! Niveau {self.level} !" if self.levels_gained else ""
+
+        if self.count == 1:
+            return f"""L'utilisateur {thanks} t'envoie un cadeau: {self.gift_name}.{self.monster_info}
+Tu {self.action}.
+Tu gagnes {self.hp} HP et {self.xp} XP.{level_info}
+
+Réponds en 1-2 phrases maximum. Remercie {thanks} et décris brièvement ton action."""
+
+        if len(users) == 1:
+            senders = f"L'utilisateur {thanks} t'envoie"
+        else:
+            detail = ", ".join(
+                f"@{username} (x{count})" if count > 1 else f"@{username}"
+                for username, count in self.senders.items()
+            )
+            senders = f"Les viewers {detail} t'envoient"
+
+        return f"""{senders} {self.count} cadeaux: {self.gift_name}.{self.monster_info}
+Tu {self.action}.
+Tu gagnes {self.hp} HP et {self.xp} XP au total.{level_info}
+
+Réponds en 1-2 phrases maximum. Remercie {thanks} et décris brièvement ton action."""
+
+
+class NarrationJob:
+    """Une narration à générer puis afficher"""
+
+    def __init__(self, seq: int, request: NarrationRequest, keys: list = None,
+                 priority: int = 0, max_wait: Optional[float] = None):
+        """
+        Initialise le job
+
+        Args:
+            seq: Numéro d'arrivée (ordre d'affichage à priorité égale)
+            request: Demande de narration
+            keys: Clés de fusion sous lesquelles le job attend
+            priority: Classe de priorité (plus grand = plus urgent)
+            max_wait: Attente max avant génération en secondes (None: jamais expirée)
+        """
+        self.seq = seq
+        self.request = request
+        self.keys = keys or []
+        self.priority = priority
+        self.created_at = time.monotonic()
+        self.deadline = self.created_at + max_wait if max_wait is not None else None
+        self.started = False  # Pris par un worker (plus fusionnable)
+        self.partial = None  # Texte partiel pendant le streaming
+        self.text = None  # Texte final
+        self.done = asyncio.Event()
+        self.traces = []  # Traces de latence des événements narrés (fusions comprises)
+
+    @property
+    def prompt(self) -> str:
+        """Prompt construit au moment de la génération"""
+        return self.request.build_prompt()
+
+    @property
+    def sort_key(self) -> tuple:
+        """Ordre de traitement: priorité décroissante puis ordre d'arrivée"""
+        return (-self.priority, self.seq)
+
+    def is_expired(self, now: float = None) -> bool:
+        """True si la date limite de génération est dépassée"""
+        return self.deadline is not None and (now or time.monotonic()) > self.deadline
+
+    def finish(self, text: str):
+        """
+        Termine le job avec son texte final
+
+        Args:
+            text: Texte à afficher
+        """
+        self.text = text
+        self.done.set()
+
+
+class NarrationQueue:
+    """File de narrations à priorité, avec statistiques d'attente par classe"""
+
+    def __init__(self, priority_names: dict):
+        """
+        Initialise la file
+
+        Args:
+            priority_names: Nom de chaque classe de priorité ({priorité: nom})
+        """
+        self.priority_names = priority_names
+        self._heap = []
+        self._not_empty = asyncio.Event()
+        self._stats = {}
+        for priority in priority_names:
+            self._class_stats(priority)
+
+    def qsize(self) -> int:
+        """Nombre de jobs en attente"""
+        return len(self._heap)
+
+    def empty(self) -> bool:
+        """True si aucun job n'attend"""
+        return not self._heap
+
+    async def put(self, job: NarrationJob):
+        """Ajoute un job (interface compatible asyncio.Queue)"""
+        self.put_nowait(job)
+
+    def put_nowait(self, job: NarrationJob):
+        """Ajoute un job sans attendre"""
+        heapq.heappush(self._heap, (job.sort_key, job))
+        self._not_empty.set()
+
+    async def get(self) -> NarrationJob:
+        """
+        Retire le job le plus prioritaire (le plus ancien à priorité égale)
+
+        Returns:
+            Job à traiter
+        """
+        while not self._heap:
+            self._not_empty.clear()
+            await self._not_empty.wait()
+        return self.get_nowait()
+
+    def get_nowait(self) -> Optional[NarrationJob]:
+        """
+        Retire le job le plus prioritaire sans attendre
+
+        Returns:
+            Job à traiter (None si la file est vide)
+        """
+        if not self._heap:
+            return None
+        _, job = heapq.heappop(self._heap)
+        wait = time.monotonic() - job.created_at
+        stats = self._class_stats(job.priority)
+        stats["dequeued"] += 1
+        stats["wait_total"] += wait
+        stats["wait_max"] = max(stats["wait_max"], wait)
+        return job
+
+    def record_expired(self, job: NarrationJob):
+        """Compte un job expiré avant sa génération"""
+        self._class_stats(job.priority)["expired"] += 1
+
+    def _class_stats(self, priority: int) -> dict:
+        """Compteurs d'une classe de priorité (créés au besoin)"""
+        if priority not in self._stats:
+            self._stats[priority] = {"dequeued": 0, "expired": 0, "wait_total": 0.0, "wait_max": 0.0}
+        return self._stats[priority]
+
+    def get_stats(self) -> dict:
+        """
+        Retourne profondeur et temps d'attente par classe de priorité
+
+        Returns:
+            Dictionnaire {nom de classe: statistiques}
+        """
+        depth = {}
+        for _, job in self._heap:
+            if not job.started:
+                depth[job.priority] = depth.get(job.priority, 0) + 1
+
+        result = {}
+        for priority, stats in sorted(self._stats.items()):
+            name = self.priority_names.get(priority, str(priority))
+            dequeued = stats["dequeued"]
+            result[name] = {
+                "depth": depth.get(priority, 0),
+                "dequeued": dequeued,
+                "expired": stats["expired"],
+                "wait_avg": stats["wait_total"] / dequeued if dequeued else 0.0,
+                "wait_max": stats["wait_max"],
+            }
+        return result
@@ -0,0 +1,144 @@
+"""
+Cache des narrations de L'IA Survivante
+Réutilise les narrations de cadeaux similaires (LRU + TTL, plusieurs variantes par clé)
+"""
+
+import random
+import re
+import time
+from collections import OrderedDict
+from typing import Optional
+
+# Marqueurs remplacés au rendu par le viewer et le monstre du moment
+VIEWER_PLACEHOLDER = "{viewer}"
+MONSTER_PLACEHOLDER = "{monster}"
+
+
+class NarrationCache:
+    """Cache LRU/TTL de narrations, indexé par la signature normalisée du prompt"""
+
+    def __init__(self, max_keys: int = 256, variants: int = 3, ttl: float = 900.0):
+        """
+        Initialise le cache
+
+        Args:
+            max_keys: Nombre max de signatures conservées (LRU)
+            variants: Variantes à générer par signature avant de réutiliser le cache
+            ttl: Durée de vie d'une variante (secondes)
+        """
+        self.max_keys = max_keys
+        self.variants = variants
+        self.ttl = ttl
+        self._entries = OrderedDict()  # signature -> [(expire_at, template)]
+        self._last_served = {}  # signature -> dernier template servi
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Taux de réussite du cache (0 à 1)"""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def get(self, request) -> Optional[str]:
+        """
+        Cherche une narration en cache pour une demande
+
+        Tant qu'une signature n'a pas toutes ses variantes, le cache répond
+        "absent" pour que le LLM en génère une nouvelle (moins de répétitions).
+
+        Args:
+            request: Demande de narration (cache_key() et placeholders())
+
+        Returns:
+            Narration prête à afficher, ou None
+        """
+        key = request.cache_key()
+        if key is None:
+            return None
+
+        templates = [template for _, template in self._live_templates(key)]
+        if len(templates) < self.variants:
+            self.misses += 1
+            return None
+
+        # Éviter de resservir la même variante deux fois de suite
+        choices = [t for t in templates if t != self._last_served.get(key)] or templates
+        template = random.choice(choices)
+        self._last_served[key] = template
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return self._render(template, request.placeholders())
+
+    def put(self, request, text: str):
+        """
+        Ajoute une narration générée au cache
+
+        Args:
+            request: Demande de narration à l'origine du texte
+            text: Narration générée par le LLM
+        """
+        key = request.cache_key()
+        if key is None or not text:
+            return
+
+        template = text
+        for placeholder, value in request.placeholders().items():
+            if not value:
+                continue
+            template = template.replace(value, placeholder)
+            # Nom cité sans "@" ("Merci Bob !"): même marqueur
+            name = value.lstrip("@")
+            template = re.sub(rf"(?<!\w){re.escape(name)}(?!\w)", placeholder, template, flags=re.IGNORECASE)
+            # Nom encore présent sous une autre forme ("Bobtastique"): jamais montré à un autre viewer
+            residue = template.replace(VIEWER_PLACEHOLDER, "").replace(MONSTER_PLACEHOLDER, "")
+            if name.casefold() in residue.casefold():
+                return
+
+        templates = self._live_templates(key)
+        if template in (t for _, t in templates):
+            return
+        templates.append((time.monotonic() + self.ttl, template))
+        del templates[:-self.variants]
+        self._entries[key] = templates
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_keys:
+            evicted, _ = self._entries.popitem(last=False)
+            self._last_served.pop(evicted, None)
+
+    def get_stats(self) -> dict:
+        """
+        Retourne les statistiques du cache
+
+        Returns:
+            Dictionnaire (hits, misses, hit_rate, keys)
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hit_rate,
+            "keys": len(self._entries),
+        }
+
+    def _live_templates(self, key) -> list:
+        """Variantes non expirées d'une signature [(expiration, template)]"""
+        entries = self._entries.get(key)
+        if entries is None:
+            return []
+
+        now = time.monotonic()
+        live = [entry for entry in entries if entry[0] > now]
+        if len(live) != len(entries):
+            if live:
+                self._entries[key] = live
+            else:
+                del self._entries[key]
+                self._last_served.pop(key, None)
+        return live
+
+    def _render(self, template: str, placeholders: dict) -> str:
+        """Remplace les marqueurs par les valeurs du moment"""
+        for placeholder, value in placeholders.items():
+            template = template.replace(placeholder, value or "")
+        return template
@@ -0,0 +1,176 @@
+"""
+Écriture des fichiers OBS pour L'IA Survivante
+Écritures atomiques (fichier temporaire + os.replace) qui ignorent le contenu inchangé,
+effectuées par un thread dédié pour ne jamais bloquer la boucle asyncio
+"""
+
+import os
+import queue
+import threading
+from typing import Callable
+
+# Secondes entre deux tentatives d'écriture d'un fichier verrouillé (OBS sous Windows)
+RETRY_INTERVAL = 0.5
+
+
+class ObsWriter:
+    """Écrit les fichiers OBS/overlay sans jamais exposer un fichier à moitié écrit"""
+
+    def __init__(self, queue_size: int = 4):
+        """
+        Initialise le writer
+
+        Args:
+            queue_size: Nombre max de snapshots en attente d'écriture
+        """
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._thread = None
+        self._last_content = {}  # Dernier contenu écrit par chemin
+        self._retry = {}  # Fichiers dont l'écriture a échoué: chemin -> contenu à réécrire
+        self.submitted_count = 0  # Snapshots reçus
+        self.superseded_count = 0  # Snapshots remplacés par un plus récent avant écriture
+        self.write_count = 0  # Fichiers réellement écrits sur le disque
+        self.skipped_count = 0  # Écritures évitées (contenu identique)
+
+    @property
+    def is_threaded(self) -> bool:
+        """True si le thread d'écriture est actif"""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """Démarre le thread d'écriture"""
+        if self.is_threaded:
+            return
+        self._thread = threading.Thread(target=self._run, name="obs-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        """
+        Écrit les snapshots en attente puis arrête le thread d'écriture
+
+        Args:
+            timeout: Temps max d'attente du thread (secondes)
+        """
+        if not self.is_threaded:
+            return
+        try:
+            self._queue.put(None, timeout=timeout)  # Après les snapshots en attente
+        except queue.Full:
+            pass
+        self._thread.join(timeout)
+        self._thread = None
+
+    def submit(self, files: dict, on_written: Callable[[], None] = None):
+        """
+        Soumet un snapshot complet des fichiers à écrire
+
+        Sans thread actif (moteur non démarré), le snapshot est écrit immédiatement.
+        Si la file est pleine, le plus ancien snapshot en attente est remplacé:
+        chaque snapshot contient l'état complet, seul le plus récent compte.
+
+        Args:
+            files: Dictionnaire {chemin: contenu}
+            on_written: Appelé une fois le snapshot (ou celui qui le remplace) écrit,
+                        depuis le thread d'écriture
+        """
+        self.submitted_count += 1
+        callbacks = [on_written] if on_written else []
+        if self.is_threaded:
+            self._put((files, callbacks))
+        else:
+            self._write_snapshot(files, callbacks)
+
+    def get_stats(self) -> dict:
+        """
+        Retourne les compteurs d'écriture
+
+        Returns:
+            Dictionnaire des compteurs
+        """
+        return {
+            "submitted": self.submitted_count,
+            "superseded": self.superseded_count,
+            "written": self.write_count,
+            "skipped": self.skipped_count,
+            "pending": self._queue.qsize(),
+            "retrying": len(self._retry),
+        }
+
+    def _put(self, snapshot: tuple):
+        """Ajoute un snapshot à la file sans bloquer (remplace le plus ancien si pleine)"""
+        files, callbacks = snapshot
+        while True:
+            try:
+                self._queue.put_nowait((files, callbacks))
+                return
+            except queue.Full:
+                try:
+                    _, superseded_callbacks = self._queue.get_nowait()
+                    # Prévenus quand le snapshot plus récent sera écrit
+                    callbacks = superseded_callbacks + callbacks
+                    self.superseded_count += 1
+                except queue.Empty:
+                    pass
+
+    def _run(self):
+        """Boucle du thread d'écriture (réessaie les fichiers en échec toutes les RETRY_INTERVAL secondes)"""
+        while True:
+            try:
+                snapshot = self._queue.get(timeout=RETRY_INTERVAL if self._retry else None)
+            except queue.Empty:
+                snapshot = ({}, [])  # Nouvelle tentative des fichiers en échec
+            if snapshot is None:
+                return
+            self._write_snapshot(*snapshot)
+
+    def _write_snapshot(self, files: dict, callbacks: list):
+        """
+        Écrit tous les fichiers d'un snapshot (et ceux en échec) puis prévient les callbacks
+
+        Un fichier qui ne peut pas être écrit est gardé pour une nouvelle tentative
+        (sauf si un snapshot plus récent le remplace); les callbacks sont toujours appelés.
+        """
+        retrying = self._retry
+        self._retry = {}
+        try:
+            for path, content in {**retrying, **files}.items():
+                try:
+                    self.write(path, content)
+                except OSError as e:
+                    if path not in retrying:
+                        # Windows: OBS peut verrouiller le fichier, réessayé par le thread d'écriture
+                        print(f"⚠️ Erreur écriture fichier OBS ({path}), nouvel essai: {e}")
+                    self._retry[path] = content
+        finally:
+            for callback in callbacks:
+                callback()
+
+    def write(self, path: str, content: str) -> bool:
+        """
+        Écrit un fichier de manière atomique si son contenu a changé
+
+        Le contenu est d'abord écrit dans un fichier temporaire puis renommé
+        avec os.replace, pour que l'overlay ne lise jamais un JSON tronqué.
+
+        Args:
+            path: Chemin du fichier à écrire
+            content: Contenu complet du fichier
+
+        Returns:
+            True si le fichier a été écrit, False si son contenu n'a pas changé
+
+        Raises:
+            OSError: Si le fichier ne peut pas être écrit (verrouillé par OBS...)
+        """
+        if self._last_content.get(path) == content:
+            self.skipped_count += 1
+            return False
+
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(content)
+
+        os.replace(tmp_path, path)
+        self._last_content[path] = content
+        self.write_count += 1
+        return True
@@ -0,0 +1,186 @@
+"""
+Serveur de push pour l'overlay de L'IA Survivante
+Diffuse l'état du jeu aux overlays connectés via Server-Sent Events (SSE)
+et expose les métriques du moteur (/stats en JSON, /metrics pour Prometheus)
+"""
+
+import asyncio
+import json
+from urllib.parse import parse_qs
+
+from src.state_channel import StateChannel
+
+# Message interne: envoyer un snapshot complet au client
+_SNAPSHOT = object()
+
+
+class OverlayPushServer:
+    """Mini serveur HTTP asyncio qui pousse l'état du jeu aux overlays"""
+
+    # Nombre max de deltas en attente par client (au-delà: snapshot complet)
+    CLIENT_QUEUE_SIZE = 16
+
+    # Commentaire SSE envoyé régulièrement pour garder la connexion ouverte
+    KEEPALIVE_SECONDS = 15
+
+    def __init__(self, host: str, port: int, channel: StateChannel, metrics=None):
+        """
+        Initialise le serveur de push
+
+        Args:
+            host: Adresse d'écoute
+            port: Port d'écoute
+            channel: Canal d'état versionné à diffuser
+            metrics: EngineMetrics servies sur /stats et /metrics (optionnel)
+        """
+        self.host = host
+        self.port = port
+        self.channel = channel
+        self.metrics = metrics
+        self.server = None
+        self.clients = set()  # Files d'attente des clients SSE connectés
+        self.messages_sent = 0
+        self.snapshots_sent = 0
+
+    @property
+    def client_count(self) -> int:
+        """Nombre d'overlays connectés"""
+        return len(self.clients)
+
+    async def start(self):
+        """Démarre l'écoute (l'overlay repasse en polling si le port est occupé)"""
+        try:
+            self.server = await asyncio.start_server(self._handle_client, self.host, self.port)
+            self.port = self.server.sockets[0].getsockname()[1]  # Port réel si port=0
+            print(f"📡 Push overlay: http://localhost:{self.port}/events")
+        except OSError as e:
+            print(f"⚠️ Serveur de push overlay indisponible (port {self.port}): {e}")
+            self.server = None
+
+    def close(self):
+        """Ferme le serveur et déconnecte les overlays"""
+        if self.server:
+            self.server.close()
+            self.server = None
+        for queue in list(self.clients):
+            self._offer(queue, None)  # Signal de fin pour le client
+
+    def publish(self, state: dict):
+        """
+        Publie un nouvel état et diffuse uniquement les champs modifiés
+
+        Args:
+            state: État complet du jeu
+        """
+        delta = self.channel.update(state)
+        if delta is None or not self.clients:
+            return
+
+        # Sérialisé une seule fois pour tous les clients
+        message = self._format_event("delta", delta)
+        for queue in self.clients:
+            self._offer(queue, message)
+
+    def _offer(self, queue: asyncio.Queue, message):
+        """Ajoute un message à la file d'un client (snapshot complet si elle déborde)"""
+        if queue.full():
+            while not queue.empty():
+                queue.get_nowait()
+            message = _SNAPSHOT if message is not None else None
+        queue.put_nowait(message)
+
+    def _format_event(self, event: str, data: dict) -> bytes:
+        """Formate un événement SSE"""
+        payload = json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+        return f"event: {event}\ndata: {payload}\n\n".encode("utf-8")
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Gère une connexion HTTP entrante"""
+        try:
+            request = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), timeout=5)
+            method, target = request.decode("latin-1").split(" ", 2)[:2]
+            path, _, query = target.partition("?")
+
+            if method == "OPTIONS":
+                await self._send_response(writer, "204 No Content", "", "text/plain")
+            elif method != "GET":
+                await self._send_response(writer, "405 Method Not Allowed", "", "text/plain")
+            elif path == "/events":
+                await self._stream_events(writer)
+            elif path == "/state":
+                await self._send_state(writer, parse_qs(query))
+            elif path == "/stats" and self.metrics:
+                body = json.dumps(self.metrics.get_stats(), ensure_ascii=False, separators=(",", ":"))
+                await self._send_response(writer, "200 OK", body, "application/json")
+            elif path == "/metrics" and self.metrics:
+                await self._send_response(writer, "200 OK", self.metrics.render_prometheus(),
+                                          "text/plain; version=0.0.4")
+            else:
+                await self._send_response(writer, "404 Not Found", "", "text/plain")
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, asyncio.TimeoutError, ValueError):
+            pass
+        except (ConnectionError, OSError):
+            pass
+        finally:
+            writer.close()
+
+    async def _send_response(self, writer: asyncio.StreamWriter, status: str, body: str, content_type: str):
+        """Envoie une réponse HTTP simple"""
+        payload = body.encode("utf-8")
+        headers = (
+            f"HTTP/1.1 {status}\r\n"
+            f"Content-Type: {content_type}; charset=utf-8\r\n"
+            f"Content-Length: {len(payload)}\r\n"
+            "Access-Control-Allow-Origin: *\r\n"
+            "Cache-Control: no-cache\r\n"
+            "Connection: close\r\n\r\n"
+        )
+        writer.write(headers.encode("latin-1") + payload)
+        await writer.drain()
+
+    async def _send_state(self, writer: asyncio.StreamWriter, params: dict):
+        """Répond à /state (snapshot) ou /state?since=N (changements depuis la version N)"""
+        try:
+            since = int(params["since"][0]) if "since" in params else None
+        except ValueError:
+            since = None
+
+        data = self.channel.snapshot() if since is None else self.channel.changes_since(since)
+        body = json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+        await self._send_response(writer, "200 OK", body, "application/json")
+
+    async def _stream_events(self, writer: asyncio.StreamWriter):
+        """Envoie un snapshot complet puis chaque delta au format SSE"""
+        writer.write((
+            "HTTP/1.1 200 OK\r\n"
+            "Content-Type: text/event-stream; charset=utf-8\r\n"
+            "Access-Control-Allow-Origin: *\r\n"
+            "Cache-Control: no-cache\r\n"
+            "Connection: keep-alive\r\n\r\n"
+            "retry: 2000\n\n"
+        ).encode("latin-1"))
+
+        queue = asyncio.Queue(maxsize=self.CLIENT_QUEUE_SIZE)
+        queue.put_nowait(_SNAPSHOT)
+        self.clients.add(queue)
+
+        try:
+            while True:
+                try:
+                    message = await asyncio.wait_for(queue.get(), timeout=self.KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    writer.write(b": keepalive\n\n")
+                    await writer.drain()
+                    continue
+
+                if message is None:
+                    break
+                if message is _SNAPSHOT:
+                    message = self._format_event("snapshot", self.channel.snapshot())
+                    self.snapshots_sent += 1
+
+                writer.write(message)
+                await writer.drain()
+                self.messages_sent += 1
+        finally:
+            self.clients.discard(queue)
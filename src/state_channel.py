@@ -0,0 +1,77 @@
+"""
+Canal d'état versionné pour L'IA Survivante
+Chaque changement incrémente une version ; les clients reçoivent uniquement les champs modifiés
+"""
+
+from collections import deque
+from typing import Optional
+
+
+class StateChannel:
+    """Conserve l'état publié, sa version et l'historique récent des deltas"""
+
+    # Nombre de deltas conservés pour rattraper un client en retard
+    HISTORY_SIZE = 64
+
+    def __init__(self):
+        """Initialise le canal (version 0, aucun état)"""
+        self.version = 0
+        self.state = {}
+        self.history = deque(maxlen=self.HISTORY_SIZE)  # (version, changements)
+
+    def update(self, state: dict) -> Optional[dict]:
+        """
+        Publie un nouvel état complet et calcule le delta avec le précédent
+
+        Args:
+            state: État complet du jeu
+
+        Returns:
+            Delta {"v", "since", "changes"} ou None si rien n'a changé
+        """
+        changes = {
+            key: value for key, value in state.items()
+            if key not in self.state or self.state[key] != value
+        }
+        if not changes:
+            return None
+
+        self.state = state
+        self.version += 1
+        self.history.append((self.version, changes))
+        return {"v": self.version, "since": self.version - 1, "changes": changes}
+
+    def snapshot(self) -> dict:
+        """
+        Retourne l'état complet courant
+
+        Returns:
+            Snapshot {"v", "state"}
+        """
+        return {"v": self.version, "state": self.state}
+
+    def changes_since(self, version: int) -> dict:
+        """
+        Retourne les changements depuis une version donnée
+
+        Un snapshot complet est renvoyé si la version est inconnue
+        (client trop en retard, redémarrage du moteur...).
+
+        Args:
+            version: Dernière version connue du client
+
+        Returns:
+            Delta {"v", "since", "changes"} ou snapshot {"v", "state"}
+        """
+        if version == self.version:
+            return {"v": self.version, "since": version, "changes": {}}
+
+        oldest = self.history[0][0] if self.history else None
+        if oldest is None or version < oldest - 1 or version > self.version:
+            return self.snapshot()
+
+        changes = {}
+        for delta_version, delta_changes in self.history:
+            if delta_version > version:
+                changes.update(delta_changes)
+        return {"v": self.version, "since": version, "changes": changes}
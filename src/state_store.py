@@ -0,0 +1,244 @@
+"""
+Sauvegarde de l'état du jeu pour L'IA Survivante
+Journal en ajout seul (write-ahead log) des changements d'état et des événements appliqués,
+plus des snapshots compacts périodiques: après un crash, l'état exact est restauré en
+chargeant le dernier snapshot puis en rejouant la fin du journal.
+Journal et snapshots sont écrits par un thread dédié, jamais par la boucle asyncio.
+"""
+
+import glob
+import json
+import os
+import queue
+import threading
+import time
+from typing import Optional
+
+# Fichiers du dossier d'état
+SNAPSHOT_FILE = "snapshot.json"
+WAL_PREFIX = "wal-"  # Segments du journal: wal-<premier numéro>.jsonl
+
+
+class StateStore:
+    """Journal des changements d'état et snapshots, écrits en arrière-plan"""
+
+    def __init__(self, directory: str, snapshot_interval: float = 30.0, snapshot_every: int = 500,
+                 fsync: bool = False):
+        """
+        Initialise le stockage
+
+        Args:
+            directory: Dossier du snapshot et des segments du journal
+            snapshot_interval: Secondes max entre deux snapshots (si l'état a changé)
+            snapshot_every: Entrées du journal max entre deux snapshots
+            fsync: Forcer l'écriture sur le disque à chaque entrée (survit aussi à une coupure de courant)
+        """
+        self.directory = directory
+        self.snapshot_interval = snapshot_interval
+        self.snapshot_every = snapshot_every
+        self.fsync = fsync
+        self._queue = queue.SimpleQueue()  # Jamais plein: aucune entrée du journal n'est perdue
+        self._thread = None
+
+        # Côté boucle asyncio: dernier état journalisé (pour ne journaliser que les différences)
+        self._last_state = {}
+        self._seq = 0
+
+        # Côté writer: état courant reconstitué à partir du journal (snapshots sans la boucle)
+        self._state = {}
+        self._written_seq = 0
+        self._snapshot_seq = 0
+        self._snapshot_at = time.monotonic()
+        self._wal = None
+
+        self.recorded_count = 0  # Entrées journalisées
+        self.snapshot_count = 0  # Snapshots écrits
+        self.replayed_count = 0  # Entrées rejouées à la restauration
+        self.restore_duration = None  # Secondes de la dernière restauration
+
+    @property
+    def is_threaded(self) -> bool:
+        """True si le thread d'écriture est actif"""
+        return self._thread is not None and self._thread.is_alive()
+
+    def load(self) -> Optional[dict]:
+        """
+        Restaure le dernier état: snapshot puis entrées du journal plus récentes
+
+        Returns:
+            État restauré (None si aucun état sauvegardé)
+        """
+        started = time.perf_counter()
+        state = {}
+        seq = 0
+
+        snapshot_path = os.path.join(self.directory, SNAPSHOT_FILE)
+        if os.path.exists(snapshot_path):
+            try:
+                with open(snapshot_path, "r", encoding="utf-8") as f:
+                    snapshot = json.load(f)
+                state, seq = snapshot["state"], snapshot["s"]
+            except (OSError, ValueError, KeyError) as e:
+                print(f"⚠️ Snapshot illisible ({snapshot_path}), journal seul: {e}")
+
+        self._snapshot_seq = seq
+        replayed = 0
+        for path in self._wal_segments():
+            for record in self._read_segment(path):
+                if record["s"] <= seq:
+                    continue
+                state.update(record["d"])
+                seq = record["s"]
+                replayed += 1
+
+        self._state = dict(state)
+        self._last_state = dict(state)
+        self._seq = self._written_seq = seq
+        self.replayed_count = replayed
+        self.restore_duration = time.perf_counter() - started
+        return state or None
+
+    def _wal_segments(self) -> list:
+        """Segments du journal, du plus ancien au plus récent"""
+        paths = glob.glob(os.path.join(self.directory, f"{WAL_PREFIX}*.jsonl"))
+        return sorted(paths, key=lambda path: int(os.path.basename(path)[len(WAL_PREFIX):-len(".jsonl")]))
+
+    def _read_segment(self, path: str):
+        """Entrées d'un segment (la dernière ligne, tronquée par un crash, est ignorée)"""
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                    yield {"s": record["s"], "d": record["d"]}
+                except (ValueError, KeyError):
+                    print(f"⚠️ Entrée incomplète ignorée ({path})")
+
+    def start(self):
+        """Démarre le thread d'écriture"""
+        if self.is_threaded:
+            return
+        self._thread = threading.Thread(target=self._run, name="state-store", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        """Écrit les entrées en attente et un dernier snapshot, puis arrête le thread"""
+        if self.is_threaded:
+            self._queue.put(None)
+            self._thread.join(timeout)
+            self._thread = None
+        else:
+            self._close()
+
+    def record(self, state: dict, events: list = ()):
+        """
+        Journalise les champs de l'état qui ont changé (appelé par la boucle asyncio, sans I/O)
+
+        Sans thread actif (moteur non démarré), l'entrée est écrite immédiatement.
+
+        Args:
+            state: État complet du jeu (valeurs JSON)
+            events: Événements appliqués depuis la dernière entrée (entrées compactes)
+        """
+        delta = {key: value for key, value in state.items() if self._last_state.get(key) != value}
+        if not delta and not events:
+            return
+        self._last_state = dict(state)
+        self._seq += 1
+        self.recorded_count += 1
+        record = {"s": self._seq, "t": round(time.time(), 3), "d": delta}
+        if events:
+            record["e"] = list(events)
+        if self.is_threaded:
+            self._queue.put(record)
+        else:
+            self._write_record(record)
+
+    def _run(self):
+        """Boucle du thread d'écriture"""
+        while True:
+            timeout = max(0.0, self._snapshot_at + self.snapshot_interval - time.monotonic())
+            try:
+                record = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                record = False
+            try:
+                if record is None:
+                    self._close()
+                    return
+                if record:
+                    self._write_record(record)
+                elif self._written_seq > self._snapshot_seq:
+                    self._write_snapshot()
+                else:
+                    self._snapshot_at = time.monotonic()
+            except OSError as e:
+                print(f"⚠️ Erreur écriture de l'état: {e}")
+
+    def _write_record(self, record: dict):
+        """Ajoute une entrée au segment courant (snapshot si le journal a assez grandi)"""
+        if self._wal is None:
+            os.makedirs(self.directory, exist_ok=True)
+            path = os.path.join(self.directory, f"{WAL_PREFIX}{record['s']}.jsonl")
+            self._wal = open(path, "a", encoding="utf-8")
+        self._wal.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n")
+        # Dans le cache du système dès maintenant: survit au crash du processus
+        self._wal.flush()
+        if self.fsync:
+            os.fsync(self._wal.fileno())
+
+        self._state.update(record["d"])
+        self._written_seq = record["s"]
+        if self._written_seq - self._snapshot_seq >= self.snapshot_every:
+            self._write_snapshot()
+
+    def _write_snapshot(self):
+        """
+        Écrit un snapshot atomique de l'état, puis supprime les segments qu'il couvre
+
+        Un nouveau segment commence après le snapshot: un crash entre les deux étapes
+        laisse des entrées déjà couvertes, ignorées à la restauration.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, SNAPSHOT_FILE)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"s": self._written_seq, "t": round(time.time(), 3), "state": self._state},
+                      f, ensure_ascii=False, separators=(",", ":"))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+        self._snapshot_seq = self._written_seq
+        self._snapshot_at = time.monotonic()
+        self.snapshot_count += 1
+
+        if self._wal is not None:
+            self._wal.close()
+            self._wal = None
+        for segment in self._wal_segments():
+            os.remove(segment)
+
+    def _close(self):
+        """Dernier snapshot (restauration sans journal à rejouer) et fermeture du segment"""
+        if self._written_seq > self._snapshot_seq:
+            self._write_snapshot()
+        if self._wal is not None:
+            self._wal.close()
+            self._wal = None
+
+    def get_stats(self) -> dict:
+        """
+        Retourne les compteurs du journal et des snapshots
+
+        Returns:
+            Dictionnaire des compteurs
+        """
+        return {
+            "recorded": self.recorded_count,
+            "snapshots": self.snapshot_count,
+            "pending": self._queue.qsize(),
+            "replayed": self.replayed_count,
+            "restore_ms": self.restore_duration * 1000 if self.restore_duration is not None else None,
+        }
@@ -0,0 +1,385 @@
+"""
+Hébergement de plusieurs lives dans un seul processus pour L'IA Survivante
+Chaque live a son moteur de jeu, son listener TikTok, ses fichiers OBS et son overlay;
+les narrations de tous les lives sont générées par un pool de workers partagé
+(un seul client HTTP vers Ollama), à tour de rôle entre les lives
+"""
+
+import asyncio
+import os
+from collections import deque
+from typing import Optional
+from urllib.parse import urlencode
+
+from src.config import OLLAMA_API_URL, GameConfig
+from src.game_engine import GameEngine
+from src.llm_client import OllamaClient
+from src.tiktok_listener import TikTokListener
+
+# Dossier des fichiers d'un live hébergé (un sous-dossier par live)
+STREAMS_DIR = "streams"
+# Overlay servi par start_server.py depuis la racine du projet
+OVERLAY_URL = "http://localhost:8000/overlay.html"
+
+
+def overlay_url(state_file: str, push_port: int) -> str:
+    """
+    URL de l'overlay d'un live (port de push et fichier d'état en paramètres)
+
+    Args:
+        state_file: Fichier JSON d'état du live (relatif à la racine du projet)
+        push_port: Port du serveur de push du live
+
+    Returns:
+        URL à mettre dans la source navigateur d'OBS
+    """
+    query = urlencode({"push": push_port, "state": state_file.replace(os.sep, "/")}, safe="/")
+    return f"{OVERLAY_URL}?{query}"
+
+
+class NarrationPool:
+    """
+    Workers de narration partagés entre plusieurs moteurs, à tour de rôle entre les lives
+
+    Les générations de fond des moteurs (noms de monstres) passent aussi par les workers,
+    en dernière priorité: elles n'occupent jamais plus de workers que le pool n'en a.
+    """
+
+    def __init__(self, workers: int = GameConfig.NARRATION_WORKERS, max_per_stream: Optional[int] = None):
+        """
+        Initialise le pool
+
+        Args:
+            workers: Générations en parallèle, tous lives confondus
+            max_per_stream: Générations simultanées max pour un même live (None: pas de limite)
+        """
+        self.workers = workers
+        self.max_per_stream = max_per_stream
+        self.engines = []
+        self.is_running = False
+        self._cursor = 0  # Prochain live servi
+        self._in_flight = {}  # id(moteur) -> générations en cours
+        self._completed = {}  # id(moteur) -> jobs traités
+        self._background = deque()  # Générations de fond en attente: (moteur, generate, future)
+        self.background_count = 0  # Générations de fond exécutées
+        self._wakeup = asyncio.Event()
+
+    def add(self, engine: GameEngine):
+        """Rattache un moteur au pool (ses narrations ne sont plus générées par ses propres workers)"""
+        engine.narration_pool = self
+        self.engines.append(engine)
+        self._in_flight[id(engine)] = 0
+        self._completed[id(engine)] = 0
+
+    def notify(self):
+        """Signale qu'une narration a été ajoutée à la file d'un moteur"""
+        self._wakeup.set()
+
+    async def run_background(self, engine: GameEngine, generate):
+        """
+        Fait exécuter une génération de fond par un worker du pool (priorité la plus basse)
+
+        Elle n'est prise que lorsqu'aucun live n'a de narration disponible, et compte
+        dans la limite max_per_stream de son live.
+
+        Args:
+            engine: Moteur à l'origine de la génération
+            generate: Coroutine sans argument à exécuter (ex: engine._request_monster_name)
+
+        Returns:
+            Résultat de generate() (None si le pool ne tourne pas ou s'arrête avant de l'avoir exécutée)
+        """
+        if not self.is_running:
+            return None
+        future = asyncio.get_running_loop().create_future()
+        self._background.append((engine, generate, future))
+        self._wakeup.set()
+        return await future
+
+    def _next_job(self):
+        """
+        Prend le job le plus prioritaire du prochain live servable (tour de rôle),
+        ou à défaut la plus ancienne génération de fond servable
+
+        Returns:
+            (moteur, job ou (generate, future)), ou None si rien n'est disponible
+        """
+        count = len(self.engines)
+        for step in range(count):
+            index = (self._cursor + step) % count
+            engine = self.engines[index]
+            if not engine.is_running:
+                continue
+            if self.max_per_stream and self._in_flight[id(engine)] >= self.max_per_stream:
+                continue
+            job = engine.api_queue.get_nowait()
+            if job is None:
+                continue
+            self._cursor = index + 1
+            self._in_flight[id(engine)] += 1
+            return engine, job
+
+        for _ in range(len(self._background)):
+            engine, generate, future = self._background.popleft()
+            if future.done():
+                continue  # Abandonnée par le moteur
+            if self.max_per_stream and self._in_flight[id(engine)] >= self.max_per_stream:
+                self._background.append((engine, generate, future))
+                continue
+            self._in_flight[id(engine)] += 1
+            return engine, (generate, future)
+        return None
+
+    async def _run_background(self, generate, future: asyncio.Future):
+        """Exécute une génération de fond et transmet son résultat au moteur"""
+        try:
+            result = await generate()
+        except Exception as e:
+            if not future.done():
+                future.set_exception(e)
+        else:
+            if not future.done():
+                future.set_result(result)
+        self.background_count += 1
+
+    async def _worker(self):
+        """Génère les narrations des lives, l'une après l'autre"""
+        while self.is_running:
+            # Effacé avant la recherche: un ajout pendant la recherche réveille quand même
+            self._wakeup.clear()
+            picked = self._next_job()
+            if picked is None:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=1.0)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            engine, job = picked
+            background = isinstance(job, tuple)
+            try:
+                if background:
+                    await self._run_background(*job)
+                else:
+                    await engine.run_narration_job(job)
+            except Exception as e:
+                print(f"❌ Erreur du pool de narration: {e}")
+            finally:
+                self._in_flight[id(engine)] -= 1
+                if not background:
+                    self._completed[id(engine)] += 1
+                # Une place s'est libérée pour ce live
+                self._wakeup.set()
+
+    async def run(self):
+        """Lance les workers jusqu'à stop()"""
+        self.is_running = True
+        await asyncio.gather(*(self._worker() for _ in range(self.workers)))
+
+    def stop(self):
+        """Arrête les workers (les générations en cours se terminent, celles de fond en attente sont abandonnées)"""
+        self.is_running = False
+        while self._background:
+            _, _, future = self._background.popleft()
+            if not future.done():
+                future.set_result(None)
+        self._wakeup.set()
+
+    def get_stats(self) -> list:
+        """Générations en cours et jobs traités par moteur (dans l'ordre d'ajout)"""
+        return [
+            {"in_flight": self._in_flight[id(engine)], "completed": self._completed[id(engine)]}
+            for engine in self.engines
+        ]
+
+
+class HostedStream:
+    """Un live hébergé: son moteur, son listener et sa configuration"""
+
+    def __init__(self, name: str, username: str, output_dir: str, engine: GameEngine, listener: TikTokListener):
+        """
+        Initialise le live
+
+        Args:
+            name: Nom du live (unique dans l'hôte)
+            username: Compte TikTok écouté
+            output_dir: Dossier des fichiers OBS et données du live
+            engine: Moteur de jeu du live
+            listener: Listener TikTok du live
+        """
+        self.name = name
+        self.username = username
+        self.output_dir = output_dir
+        self.engine = engine
+        self.listener = listener
+        self.error = None  # Raison de l'arrêt si le live a échoué
+        self.stopped = False
+
+
+class StreamHost:
+    """Héberge N lives indépendants sur une même boucle asyncio"""
+
+    def __init__(self, workers: int = GameConfig.NARRATION_WORKERS, max_per_stream: Optional[int] = None,
+                 base_config=GameConfig, streams_dir: str = STREAMS_DIR):
+        """
+        Initialise l'hôte
+
+        Args:
+            workers: Générations en parallèle, tous lives confondus (aligner sur OLLAMA_NUM_PARALLEL)
+            max_per_stream: Générations simultanées max pour un même live (None: pas de limite)
+            base_config: Configuration de départ de chaque live
+            streams_dir: Dossier par défaut des lives (un sous-dossier par nom)
+        """
+        self.base_config = base_config
+        self.streams_dir = streams_dir
+        self.streams = {}
+        self.pool = NarrationPool(workers, max_per_stream)
+        # Un seul pool de connexions vers Ollama pour tous les lives
+        self.llm_client = OllamaClient(
+            OLLAMA_API_URL,
+            max_connections=max(workers, base_config.OLLAMA_MAX_CONNECTIONS),
+            timeout=base_config.OLLAMA_TIMEOUT,
+            connect_timeout=base_config.OLLAMA_CONNECT_TIMEOUT
+        )
+        self.is_running = False
+        self._tasks = []
+
+    def stream_config(self, output_dir: str, overlay_port: Optional[int] = None, overrides: dict = None):
+        """
+        Configuration d'un live: fichiers dans son dossier, port d'overlay dédié, surcharges
+
+        Args:
+            output_dir: Dossier des fichiers du live
+            overlay_port: Port du serveur de push (None: port de base + rang du live)
+            overrides: Paramètres GameConfig propres au live (appliqués en dernier)
+
+        Returns:
+            Configuration dérivée de base_config
+        """
+        base = self.base_config
+        values = {
+            "OBS_LAST_ACTION_FILE": os.path.join(output_dir, os.path.basename(base.OBS_LAST_ACTION_FILE)),
+            "OBS_STATS_FILE": os.path.join(output_dir, os.path.basename(base.OBS_STATS_FILE)),
+            "OBS_JSON_STATE_FILE": os.path.join(output_dir, os.path.basename(base.OBS_JSON_STATE_FILE)),
+            "OVERLAY_PUSH_PORT": overlay_port if overlay_port is not None
+                                 else base.OVERLAY_PUSH_PORT + len(self.streams),
+        }
+        # Fichiers optionnels: dans le dossier du live s'ils sont activés
+        for key in ("MONSTER_NAME_POOL_FILE", "TRACE_LOG_FILE", "EVENT_RECORD_FILE", "STATE_DIR"):
+            path = getattr(base, key)
+            if path:
+                values[key] = os.path.join(output_dir, os.path.basename(path))
+        values.update(overrides or {})
+        return base.with_overrides(**values)
+
+    def add_stream(self, name: str, username: str, output_dir: str = None,
+                   overrides: dict = None, overlay_port: Optional[int] = None) -> HostedStream:
+        """
+        Ajoute un live à l'hôte (démarré tout de suite si l'hôte tourne déjà)
+
+        Args:
+            name: Nom du live (unique dans l'hôte)
+            username: Compte TikTok écouté
+            output_dir: Dossier des fichiers du live (par défaut streams_dir/name)
+            overrides: Paramètres GameConfig propres au live
+            overlay_port: Port du serveur de push (None: port de base + rang du live)
+
+        Returns:
+            Live créé
+
+        Raises:
+            ValueError: Si le nom est déjà pris ou si une surcharge n'existe pas
+        """
+        if name in self.streams:
+            raise ValueError(f"Live déjà hébergé: {name}")
+        output_dir = output_dir or os.path.join(self.streams_dir, name)
+        config = self.stream_config(output_dir, overlay_port, overrides)
+
+        engine = GameEngine(config, llm_client=self.llm_client)
+        self.pool.add(engine)
+        listener = TikTokListener(engine, unique_id=username)
+        stream = HostedStream(name, username, output_dir, engine, listener)
+        self.streams[name] = stream
+        if self.is_running:
+            self._tasks.append(asyncio.create_task(self._run_stream(stream)))
+        return stream
+
+    def add_stream_spec(self, spec: dict) -> HostedStream:
+        """
+        Ajoute un live décrit par une entrée de streams.json
+
+        Args:
+            spec: {"name", "username", "output_dir"?, "overlay_port"?, "config"?}
+
+        Returns:
+            Live créé
+        """
+        return self.add_stream(
+            spec["name"],
+            spec["username"],
+            output_dir=spec.get("output_dir"),
+            overrides=spec.get("config"),
+            overlay_port=spec.get("overlay_port"),
+        )
+
+    async def _run_stream(self, stream: HostedStream):
+        """Fait tourner un live; une erreur n'arrête que ce live"""
+        try:
+            await asyncio.gather(stream.engine.start(), stream.listener.start())
+        except Exception as e:
+            stream.error = str(e)
+            print(f"❌ [{stream.name}] Live arrêté: {e}")
+            await self._stop_stream(stream)
+
+    async def _stop_stream(self, stream: HostedStream):
+        """Arrête un live (une seule fois)"""
+        if stream.stopped:
+            return
+        stream.stopped = True
+        try:
+            # Événements en file appliqués avant le dernier état écrit par le moteur
+            await stream.listener.stop()
+        except Exception as e:
+            print(f"⚠️ [{stream.name}] Erreur à l'arrêt: {e}")
+        stream.engine.stop()
+
+    async def run(self):
+        """Démarre le pool de narration et tous les lives, jusqu'à stop()"""
+        # Pool de connexions créé par le premier moteur démarré (import de httpx différé)
+        self.is_running = True
+        self._tasks = [asyncio.create_task(self._run_stream(stream)) for stream in self.streams.values()]
+        print(f"🏠 {len(self.streams)} lives hébergés, {self.pool.workers} workers de narration partagés")
+        try:
+            # Le pool tourne jusqu'à stop(), puis les lives finissent de s'arrêter
+            await self.pool.run()
+            await asyncio.gather(*self._tasks)
+        finally:
+            self.is_running = False
+            await self.llm_client.close()
+
+    async def stop(self):
+        """Arrête tous les lives puis le pool de narration"""
+        for stream in self.streams.values():
+            await self._stop_stream(stream)
+        self.pool.stop()
+
+    def get_stats(self) -> dict:
+        """
+        Retourne l'état de chaque live
+
+        Returns:
+            {nom: {"username", "output_dir", "running", "error", "events", "events_per_second", "narrations"}}
+        """
+        pool = self.pool.get_stats()
+        return {
+            stream.name: {
+                "username": stream.username,
+                "output_dir": stream.output_dir,
+                "running": stream.engine.is_running,
+                "error": stream.error,
+                "events": dict(stream.engine.metrics.events.totals),
+                "events_per_second": sum(stream.engine.metrics.events.rates().values()),
+                "narrations": {**pool[i], "pending": stream.engine.pending_narration_count()},
+            }
+            for i, stream in enumerate(self.streams.values())
+        }
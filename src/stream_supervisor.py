@@ -0,0 +1,302 @@
+"""
+Répartition des lives sur plusieurs processus pour L'IA Survivante
+Un superviseur répartit les lives entre N processus (un par cœur), chacun faisant
+tourner un StreamHost sur sa propre boucle asyncio; il relance les processus tombés
+avec leurs lives et agrège leurs métriques
+"""
+
+import asyncio
+import multiprocessing
+import os
+import signal
+import time
+from typing import Optional
+
+from src.config import GameConfig
+
+# Secondes entre deux vérifications des processus par le superviseur
+SUPERVISE_INTERVAL = 0.2
+# Secondes entre deux demandes de métriques aux processus
+STATS_INTERVAL = 2.0
+# Délai avant relance d'un processus tombé (doublé à chaque chute rapprochée)
+RESTART_DELAY = 1.0
+RESTART_DELAY_MAX = 30.0
+# Un processus qui tient plus longtemps (secondes) repart avec le délai initial
+RESTART_RESET_AFTER = 60.0
+# Secondes laissées aux processus pour s'arrêter proprement
+STOP_TIMEOUT = 10.0
+# Sauvegarde d'état des lives sans STATE_DIR (un processus relancé reprend ses lives): dossier/<nom>
+SHARD_STATE_DIR = os.path.join("data", "state")
+
+
+def run_shard(conn, specs: list, workers: int, max_per_stream: Optional[int]):
+    """
+    Point d'entrée d'un processus: héberge ses lives jusqu'à l'ordre d'arrêt
+
+    Args:
+        conn: Extrémité du Pipe vers le superviseur
+        specs: Lives à héberger (entrées de streams.json)
+        workers: Workers de narration du processus
+        max_per_stream: Générations simultanées max pour un même live
+    """
+    # Ctrl+C est géré par le superviseur, qui arrête les processus un par un
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    asyncio.run(_serve_shard(conn, specs, workers, max_per_stream))
+
+
+async def _serve_shard(conn, specs: list, workers: int, max_per_stream: Optional[int]):
+    """Fait tourner un StreamHost et répond aux commandes du superviseur"""
+    # Import dans le processus: le superviseur n'a pas besoin du moteur de jeu
+    from src.stream_host import StreamHost
+
+    host = StreamHost(workers=workers, max_per_stream=max_per_stream)
+    for spec in specs:
+        host.add_stream_spec(spec)
+    host_task = asyncio.create_task(host.run())
+
+    while not host_task.done():
+        if not conn.poll():
+            await asyncio.sleep(SUPERVISE_INTERVAL)
+            continue
+        try:
+            command, payload = conn.recv()
+        except EOFError:
+            # Superviseur disparu: arrêt propre
+            command, payload = "stop", None
+
+        if command == "add":
+            try:
+                host.add_stream_spec(payload)
+            except ValueError as e:
+                print(f"⚠️ Live refusé: {e}")
+        elif command == "stats":
+            conn.send(("stats", host.get_stats()))
+        elif command == "stop":
+            await host.stop()
+            break
+
+    await host_task
+
+
+class ShardProcess:
+    """Un processus du superviseur et les lives qui lui sont attribués"""
+
+    def __init__(self, index: int):
+        """
+        Initialise l'emplacement (le processus est lancé par StreamSupervisor)
+
+        Args:
+            index: Rang du processus
+        """
+        self.index = index
+        self.specs = []  # Lives attribués, rejoués à chaque relance
+        self.process = None
+        self.conn = None
+        self.started_at = 0.0
+        self.restarts = 0
+        self.crashes = 0  # Chutes rapprochées (délai de relance croissant)
+        self.restart_at = None  # Relance prévue (time.monotonic) si le processus est tombé
+        self.stats = {}  # Dernières métriques reçues ({nom du live: stats})
+
+    @property
+    def alive(self) -> bool:
+        """True si le processus tourne"""
+        return self.process is not None and self.process.is_alive()
+
+    def load(self) -> tuple:
+        """Charge du processus: (lives attribués, événements par seconde)"""
+        rate = sum(stats.get("events_per_second", 0.0) for stats in self.stats.values())
+        return len(self.specs), rate
+
+    def send(self, message: tuple) -> bool:
+        """Envoie une commande au processus (False s'il ne peut pas la recevoir)"""
+        if not self.alive:
+            return False
+        try:
+            self.conn.send(message)
+            return True
+        except (BrokenPipeError, EOFError, OSError):
+            return False
+
+
+class StreamSupervisor:
+    """Répartit les lives entre plusieurs processus StreamHost et les surveille"""
+
+    def __init__(self, processes: int = None, workers_per_process: int = GameConfig.NARRATION_WORKERS,
+                 max_per_stream: Optional[int] = None, base_config=GameConfig):
+        """
+        Initialise le superviseur
+
+        Args:
+            processes: Nombre de processus (None: un par cœur)
+            workers_per_process: Workers de narration de chaque processus
+            max_per_stream: Générations simultanées max pour un même live
+            base_config: Configuration de départ (port de base des overlays, STATE_DIR)
+        """
+        self.processes = processes or os.cpu_count() or 1
+        self.workers_per_process = workers_per_process
+        self.max_per_stream = max_per_stream
+        self.shards = [ShardProcess(i) for i in range(self.processes)]
+        self.is_running = False
+        self._stopped = None  # Signalé à la fin de stop()
+        self.restart_delay = RESTART_DELAY
+        # Point d'entrée des processus (remplaçable pour les tests)
+        self.shard_main = run_shard
+        self._context = multiprocessing.get_context("spawn")
+        self._names = set()
+        # Ports d'overlay attribués globalement (un StreamHost ne connaît que ses lives)
+        self._used_ports = set()
+        self._next_port = base_config.OVERLAY_PUSH_PORT
+        self.base_config = base_config
+
+    def add_stream(self, spec: dict) -> int:
+        """
+        Attribue un live au processus le moins chargé (démarré tout de suite si le superviseur tourne)
+
+        Args:
+            spec: Entrée de streams.json ({"name", "username", ...})
+
+        Returns:
+            Rang du processus choisi
+
+        Raises:
+            ValueError: Si le nom est déjà pris
+        """
+        if spec["name"] in self._names:
+            raise ValueError(f"Live déjà hébergé: {spec['name']}")
+        spec = dict(spec)
+        if spec.get("overlay_port") is None:
+            spec["overlay_port"] = self._allocate_port()
+        self._used_ports.add(spec["overlay_port"])
+        self._names.add(spec["name"])
+        # État sauvegardé par défaut ("STATE_DIR": null pour s'en passer): relancé, le processus
+        # restaure ses lives (snapshot + journal)
+        overrides = spec.get("config") or {}
+        if not self.base_config.STATE_DIR and "STATE_DIR" not in overrides:
+            spec["config"] = {**overrides, "STATE_DIR": os.path.join(SHARD_STATE_DIR, spec["name"])}
+
+        shard = min(self.shards, key=lambda candidate: (*candidate.load(), candidate.index))
+        shard.specs.append(spec)
+        shard.send(("add", spec))
+        return shard.index
+
+    def _allocate_port(self) -> int:
+        """Prochain port d'overlay libre"""
+        while self._next_port in self._used_ports:
+            self._next_port += 1
+        return self._next_port
+
+    def _spawn(self, shard: ShardProcess):
+        """Lance le processus d'un emplacement avec ses lives"""
+        parent_conn, child_conn = self._context.Pipe()
+        shard.process = self._context.Process(
+            target=self.shard_main,
+            args=(child_conn, list(shard.specs), self.workers_per_process, self.max_per_stream),
+            name=f"stream-shard-{shard.index}",
+            daemon=True
+        )
+        shard.process.start()
+        child_conn.close()
+        shard.conn = parent_conn
+        shard.started_at = time.monotonic()
+        shard.restart_at = None
+
+    def _check_shard(self, shard: ShardProcess, now: float):
+        """Lit les métriques reçues, programme ou effectue la relance d'un processus tombé"""
+        while shard.conn is not None and shard.alive and shard.conn.poll():
+            try:
+                kind, payload = shard.conn.recv()
+            except (EOFError, OSError):
+                break
+            if kind == "stats":
+                shard.stats = payload
+
+        if shard.alive or not self.is_running:
+            return
+
+        if shard.restart_at is None:
+            if now - shard.started_at > RESTART_RESET_AFTER:
+                shard.crashes = 0
+            delay = min(RESTART_DELAY_MAX, self.restart_delay * 2 ** shard.crashes)
+            shard.crashes += 1
+            shard.restart_at = now + delay
+            shard.stats = {}
+            print(f"💥 Processus {shard.index} tombé (code {shard.process.exitcode}), "
+                  f"relance dans {delay:.1f}s avec {len(shard.specs)} lives")
+        elif now >= shard.restart_at:
+            shard.restarts += 1
+            self._spawn(shard)
+            print(f"🔁 Processus {shard.index} relancé (pid {shard.process.pid})")
+
+    async def run(self):
+        """Lance les processus et les surveille jusqu'à stop()"""
+        self.is_running = True
+        self._stopped = asyncio.Event()
+        for shard in self.shards:
+            self._spawn(shard)
+        print(f"🧩 {len(self._names)} lives répartis sur {self.processes} processus")
+
+        next_stats = 0.0
+        while self.is_running:
+            now = time.monotonic()
+            for shard in self.shards:
+                self._check_shard(shard, now)
+            if now >= next_stats:
+                for shard in self.shards:
+                    shard.send(("stats", None))
+                next_stats = now + STATS_INTERVAL
+            await asyncio.sleep(SUPERVISE_INTERVAL)
+
+        # Attendre la fin de l'arrêt des processus
+        await self._stopped.wait()
+
+    async def stop(self):
+        """Arrête proprement chaque processus (arrêt forcé après STOP_TIMEOUT)"""
+        self.is_running = False
+        for shard in self.shards:
+            shard.send(("stop", None))
+
+        deadline = time.monotonic() + STOP_TIMEOUT
+        while any(shard.alive for shard in self.shards) and time.monotonic() < deadline:
+            await asyncio.sleep(0.1)
+        for shard in self.shards:
+            if shard.alive:
+                print(f"⚠️ Processus {shard.index} arrêté de force")
+                shard.process.terminate()
+            if shard.process is not None:
+                shard.process.join(1.0)
+            if shard.conn is not None:
+                shard.conn.close()
+                shard.conn = None
+        if self._stopped:
+            self._stopped.set()
+
+    def get_stats(self) -> dict:
+        """
+        Retourne les métriques agrégées (dernières reçues de chaque processus)
+
+        Returns:
+            {"processes": [...], "streams": {nom: stats}, "totals": {...}}
+        """
+        processes = []
+        streams = {}
+        totals = {"streams": len(self._names), "running": 0, "events": {}, "events_per_second": 0.0,
+                  "narrations_pending": 0, "restarts": 0}
+        for shard in self.shards:
+            processes.append({
+                "index": shard.index,
+                "pid": shard.process.pid if shard.process else None,
+                "alive": shard.alive,
+                "restarts": shard.restarts,
+                "streams": [spec["name"] for spec in shard.specs],
+                "events_per_second": shard.load()[1],
+            })
+            totals["restarts"] += shard.restarts
+            for name, stats in shard.stats.items():
+                streams[name] = {**stats, "process": shard.index}
+                totals["running"] += 1 if stats.get("running") else 0
+                totals["events_per_second"] += stats.get("events_per_second", 0.0)
+                totals["narrations_pending"] += stats.get("narrations", {}).get("pending", 0)
+                for kind, count in stats.get("events", {}).items():
+                    totals["events"][kind] = totals["events"].get(kind, 0) + count
+        return {"processes": processes, "streams": streams, "totals": totals}
@@ -3,31 +3,61 @@ Listener TikTok Live
 Gère la connexion au live TikTok et les événements (cadeaux, likes, etc.)
 """
 
-from TikTokLive import TikTokLiveClient
-from TikTokLive.events import ConnectEvent, GiftEvent, LikeEvent, CommentEvent
-from src.config import TIKTOK_USERNAME, GameConfig
+import asyncio
+
+from src.config import TIKTOK_USERNAME
+from src.event_recorder import EventRecorder
+from src.ingestion import IngestEvent, IngestionQueue
+from src.lazy_import import import_in_background
+from src.tracing import STAGE_APPLIED
+
+
+# Valeur par défaut de record_path: le journal de la config du moteur
+_FROM_CONFIG = object()
 
 
 class TikTokListener:
     """Gère la connexion et les événements TikTok Live"""
     
-    def __init__(self, game_engine):
+    def __init__(self, game_engine, record_path: str = _FROM_CONFIG, unique_id: str = TIKTOK_USERNAME):
         """
         Initialise le listener TikTok
         
         Args:
             game_engine: Instance de GameEngine pour gérer les événements
+            record_path: Journal où enregistrer les événements reçus
+                         (None: pas d'enregistrement, par défaut EVENT_RECORD_FILE de la config du moteur)
+            unique_id: Compte TikTok dont on écoute le live
         """
         self.game_engine = game_engine
-        self.client = TikTokLiveClient(unique_id=TIKTOK_USERNAME)
-        self.total_likes = 0
-        self.likes_since_last_milestone = 0
+        self.config = game_engine.config
+        self.unique_id = unique_id
+        self.client = None  # Créé à la connexion (TikTokLive importé en arrière-plan, voir start)
+        self.total_likes = game_engine.total_likes  # Repris de l'état restauré
         
-        # Enregistrer les handlers d'événements
-        self._register_handlers()
+        # Likes regroupés par fenêtre (un seul traitement par fenêtre)
+        self._pending_likes = 0
+        self._pending_likers = set()
+        self._pending_like_traces = []  # Terminées à l'écriture de l'état après la fenêtre
+        self._like_flush_task = None
+        
+        # File d'ingestion: les handlers rendent la main immédiatement,
+        # une tâche dédiée applique les événements au moteur dans l'ordre
+        self.ingestion = IngestionQueue(self.config.INGEST_QUEUE_SIZE, self.config.INGEST_OVERFLOW_POLICY)
+        self._consumer_task = None
+        game_engine.metrics.ingestion = self.ingestion
+        
+        # Enregistrement optionnel des événements (rejouables avec replay.py)
+        if record_path is _FROM_CONFIG:
+            record_path = self.config.EVENT_RECORD_FILE
+        self.recorder = EventRecorder(record_path) if record_path else None
     
-    def _register_handlers(self):
-        """Enregistre tous les handlers d'événements TikTok"""
+    def _create_client(self):
+        """Crée le client TikTok Live et enregistre les handlers d'événements"""
+        from TikTokLive import TikTokLiveClient
+        from TikTokLive.events import ConnectEvent, GiftEvent, LikeEvent, CommentEvent
+        
+        self.client = TikTokLiveClient(unique_id=self.unique_id)
         
         @self.client.on(ConnectEvent)
         async def on_connect(event: ConnectEvent):
@@ -43,47 +73,24 @@ class TikTokListener:
             
             Déclenche un appel API pour générer une réaction de l'IA
             """
-            # Récupérer les infos du cadeau
-            username = event.user.unique_id
-            gift_name = event.gift.name
-            
             # Pour les cadeaux "streak" (combo), attendre la fin du combo
-            if event.gift.streakable and not event.streaking:
-                print(f"🎁 @{username} a envoyé {gift_name} x{event.repeat_count}")
-                
-                # Gérer chaque cadeau du combo
-                for _ in range(event.repeat_count):
-                    await self.game_engine.handle_gift(username, gift_name)
-            
-            elif not event.gift.streakable:
-                # Cadeau simple (non-combo)
-                print(f"🎁 @{username} a envoyé {gift_name}")
-                await self. game_engine.handle_gift(username, gift_name)
+            if event.gift.streakable and event.streaking:
+                return
+            count = event.repeat_count if event.gift.streakable else 1
+            self.ingest(IngestEvent(
+                "gift", event.user.unique_id, gift_name=event.gift.name, count=count,
+                gift_id=event.gift.id, gift_value=event.gift.diamond_count
+            ))
         
         @self.client.on(LikeEvent)
         async def on_like(event: LikeEvent):
             """
             Appelé quand des likes sont reçus
             
-            Traitement local (pas d'appel API) sauf pour les paliers spéciaux
+            Les likes sont regroupés par fenêtre de LIKE_AGGREGATION_WINDOW secondes
+            (traitement local, pas d'appel API sauf pour les paliers spéciaux)
             """
-            like_count = event.count
-            username = event.user.unique_id
-            
-            # Incrémenter les compteurs
-            self.total_likes += like_count
-            self.likes_since_last_milestone += like_count
-            
-            # Appliquer le soin passif et dégâts pour le lot de likes
-            await self.game_engine.handle_like(like_count)
-            
-            print(f"👍 @{username} a envoyé {like_count} like(s) (Total: {self.total_likes})")
-            
-            # Vérifier si on a atteint un palier
-            if self.likes_since_last_milestone >= GameConfig.LIKE_THRESHOLD_FOR_REACTION:
-                print(f"✨ Palier de likes atteint ! ({self.total_likes} likes au total)")
-                await self.game_engine.handle_like_milestone(self.total_likes)
-                self.likes_since_last_milestone = 0
+            self.ingest(IngestEvent("like", event.user.unique_id, count=event.count))
         
         @self.client.on(CommentEvent)
         async def on_comment(event: CommentEvent):
@@ -92,14 +99,143 @@ class TikTokListener:
             
             Pour l'instant, juste un log. Peut être étendu plus tard.
             """
-            username = event.user.unique_id
-            comment = event.comment
-            print(f"💬 @{username}: {comment}")
+            self.ingest(IngestEvent("comment", event.user.unique_id, comment=event.comment))
+    
+    def ingest(self, event: IngestEvent) -> bool:
+        """
+        Enregistre l'événement (si activé) et le dépose dans la file d'ingestion
+        
+        Args:
+            event: Événement normalisé
+            
+        Returns:
+            False si l'événement a été ignoré (file pleine)
+        """
+        if self.recorder:
+            self.recorder.record(event)
+        self.game_engine.metrics.events.record(event.kind)
+        if self.game_engine.tracer:
+            event.trace = self.game_engine.tracer.start(event.kind, event.username, event.received_at)
+        return self.ingestion.offer(event)
+    
+    def start_consumer(self):
+        """Démarre la tâche qui applique les événements de la file d'ingestion"""
+        if self._consumer_task is None:
+            self._consumer_task = asyncio.create_task(self._consume_events())
+    
+    async def _consume_events(self):
+        """Applique les événements de la file d'ingestion, dans l'ordre d'arrivée"""
+        while True:
+            event = await self.ingestion.get()
+            if event is None:
+                return
+            try:
+                await self._apply_event(event)
+            except Exception as e:
+                print(f"⚠️ Erreur traitement événement {event.kind}: {e}")
+                self._finish_traces(event.traces)
+            self.game_engine.log_applied_event(event)
+            self.ingestion.record_applied(event)
+    
+    async def _apply_event(self, event: IngestEvent):
+        """
+        Applique un événement au moteur de jeu
+        
+        Args:
+            event: Événement normalisé
+        """
+        for trace in event.traces:
+            trace.mark(STAGE_APPLIED)
+        if event.kind == "gift":
+            if event.count > 1:
+                print(f"🎁 @{event.username} a envoyé {event.gift_name} x{event.count}")
+            else:
+                print(f"🎁 @{event.username} a envoyé {event.gift_name}")
+            # Appliquer le combo entier en une fois (trace terminée à l'écriture de la narration)
+            await self.game_engine.handle_gift_batch(
+                event.username, event.gift_name, event.count, trace=event.trace,
+                gift_id=event.gift_id, gift_value=event.gift_value
+            )
+            # Cadeaux fusionnés dans le combo par la file d'ingestion: terminés à l'application
+            self._finish_traces(event.merged_traces)
+            return
+        
+        if event.kind == "like":
+            # Traces terminées quand les likes de la fenêtre sont appliqués et écrits
+            await self.add_likes(event.username, event.count, event.traces)
+            return
+        if event.kind == "comment":
+            print(f"💬 @{event.username}: {event.comment}")
+        self._finish_traces(event.traces)
+    
+    def _finish_traces(self, traces: list):
+        """Termine les traces d'un événement sans narration"""
+        if self.game_engine.tracer:
+            for trace in traces:
+                self.game_engine.tracer.finish(trace)
+    
+    async def add_likes(self, username: str, count: int, traces: list = ()):
+        """
+        Ajoute des likes à la fenêtre en cours (traitée à la fin de la fenêtre)
+        
+        Args:
+            username: Utilisateur qui a liké
+            count: Nombre de likes
+            traces: Traces de latence des événements (terminées avec la fenêtre)
+        """
+        self._pending_likes += count
+        self._pending_likers.add(username)
+        self._pending_like_traces.extend(traces)
+        
+        if self.config.LIKE_AGGREGATION_WINDOW <= 0:
+            await self.flush_likes()
+        elif self._like_flush_task is None:
+            self._like_flush_task = asyncio.create_task(self._flush_likes_later())
+    
+    async def _flush_likes_later(self):
+        """Traite les likes à la fin de la fenêtre d'agrégation"""
+        await asyncio.sleep(self.config.LIKE_AGGREGATION_WINDOW)
+        self._like_flush_task = None
+        await self.flush_likes()
+    
+    async def flush_likes(self):
+        """Applique en une fois les likes de la fenêtre (soin, dégâts, paliers)"""
+        like_count = self._pending_likes
+        if like_count <= 0:
+            return
+        likers = len(self._pending_likers)
+        traces = self._pending_like_traces
+        self._pending_likes = 0
+        self._pending_likers.clear()
+        self._pending_like_traces = []
+        
+        # Incrémenter le compteur
+        old_total = self.total_likes
+        self.total_likes += like_count
+        
+        # Appliquer le soin passif et dégâts pour le lot de likes
+        await self.game_engine.handle_like(like_count)
+        
+        print(f"👍 {like_count} like(s) de {likers} viewer(s) (Total: {self.total_likes})")
+        
+        # Paliers franchis (exact même si la fenêtre en couvre plusieurs)
+        threshold = self.config.LIKE_THRESHOLD_FOR_REACTION
+        milestones = self.total_likes // threshold - old_total // threshold
+        if milestones > 0:
+            print(f"✨ Palier de likes atteint ! ({self.total_likes} likes au total)")
+            await self.game_engine.handle_like_milestone(self.total_likes, milestones)
+        
+        self.game_engine.finish_traces_on_write(traces)
     
     async def start(self):
         """Démarre la connexion au live TikTok"""
         try:
-            print(f"🔌 Connexion au live de @{TIKTOK_USERNAME}...")
+            print(f"🔌 Connexion au live de @{self.unique_id}...")
+            # Les événements sont acceptés dès maintenant, pendant l'import de TikTokLive
+            self.start_consumer()
+            if self.client is None:
+                await import_in_background("TikTokLive")
+                self._create_client()
             await self.client.connect()
         except Exception as e:
             print(f"❌ Erreur lors de la connexion TikTok: {e}")
@@ -107,6 +243,29 @@ class TikTokListener:
     
     async def stop(self):
         """Arrête la connexion au live TikTok"""
+        # Appliquer les événements encore en attente
+        self.ingestion.close()
+        if self._consumer_task is None:
+            self.start_consumer()
+        await self._consumer_task
+        self._consumer_task = None
+        stats = self.ingestion.get_stats()
+        print(f"📥 Ingestion: {stats['applied']} événements, {stats['coalesced']} fusionnés, "
+              f"{stats['dropped']} ignorés, latence max {stats['latency_max'] * 1000:.0f} ms")
+        
+        # Traiter les likes de la fenêtre en cours
+        if self._like_flush_task is not None:
+            self._like_flush_task.cancel()
+            self._like_flush_task = None
+        await self.flush_likes()
+        
+        if self.recorder:
+            path = self.recorder.close()
+            if path:
+                print(f"📼 {self.recorder.recorded_count} événements enregistrés dans {path}")
+        
+        if self.client is None:
+            return
         try:
             await self.client.disconnect()
             print("⏹️  Déconnecté du live TikTok")
@@ -0,0 +1,218 @@
+"""
+Traçage de latence de bout en bout pour L'IA Survivante
+Chaque événement ingéré porte un identifiant et l'horodatage de chaque étape
+(réception -> application -> narration en file -> LLM -> affichage -> écriture),
+agrégés en histogrammes par étape et optionnellement journalisés par événement
+(journal écrit par un thread dédié, jamais par la boucle asyncio)
+"""
+
+import bisect
+import itertools
+import json
+import os
+import queue
+import threading
+import time
+from typing import Optional
+
+# Étapes d'un événement, dans l'ordre
+STAGE_RECEIVED = "received"  # Reçu par le listener
+STAGE_APPLIED = "applied"  # Sorti de la file d'ingestion, appliqué au moteur
+STAGE_ENQUEUED = "enqueued"  # Narration ajoutée (ou fusionnée) à la file
+STAGE_LLM_START = "llm_start"  # Pris par un worker
+STAGE_LLM_DONE = "llm_done"  # Texte généré (ou trouvé dans le cache)
+STAGE_DISPLAYED = "displayed"  # Texte affiché, après le temps d'affichage de la narration précédente
+STAGE_WRITTEN = "written"  # Fichiers OBS écrits sur le disque
+STAGES = [STAGE_RECEIVED, STAGE_APPLIED, STAGE_ENQUEUED, STAGE_LLM_START,
+          STAGE_LLM_DONE, STAGE_DISPLAYED, STAGE_WRITTEN]
+
+# Bornes supérieures des classes des histogrammes (millisecondes)
+HISTOGRAM_BOUNDS_MS = [1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000]
+
+
+class LatencyHistogram:
+    """Histogramme de latences à classes fixes (mémoire constante)"""
+
+    def __init__(self, bounds_ms: list = HISTOGRAM_BOUNDS_MS):
+        """
+        Initialise l'histogramme
+
+        Args:
+            bounds_ms: Bornes supérieures des classes, croissantes (une classe de plus au-delà)
+        """
+        self.bounds_ms = bounds_ms
+        self.counts = [0] * (len(bounds_ms) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def add(self, seconds: float):
+        """Ajoute une latence (secondes)"""
+        ms = seconds * 1000
+        self.counts[bisect.bisect_left(self.bounds_ms, ms)] += 1
+        self.count += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+
+    def percentile(self, fraction: float) -> float:
+        """Borne supérieure de la classe contenant le percentile (ms, max réel pour la dernière)"""
+        if not self.count:
+            return 0.0
+        rank = fraction * self.count
+        seen = 0
+        for i, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank and count:
+                return min(self.bounds_ms[i], self.max_ms) if i < len(self.bounds_ms) else self.max_ms
+        return self.max_ms
+
+    def get_stats(self) -> dict:
+        """Nombre, moyenne, p50/p95/p99 et max (ms)"""
+        return {
+            "count": self.count,
+            "avg_ms": self.total_ms / self.count if self.count else 0.0,
+            "p50_ms": self.percentile(0.50),
+            "p95_ms": self.percentile(0.95),
+            "p99_ms": self.percentile(0.99),
+            "max_ms": self.max_ms,
+        }
+
+
+class EventTrace:
+    """Horodatage des étapes d'un événement"""
+
+    def __init__(self, trace_id: int, kind: str, username: str, received_at: float = None):
+        """
+        Initialise la trace
+
+        Args:
+            trace_id: Identifiant unique de l'événement
+            kind: Type d'événement ("gift", "like" ou "comment")
+            username: Utilisateur à l'origine de l'événement
+            received_at: Réception (time.monotonic, maintenant si None)
+        """
+        self.trace_id = trace_id
+        self.kind = kind
+        self.username = username
+        self.stages = {STAGE_RECEIVED: received_at if received_at is not None else time.monotonic()}
+        self.finished = False
+
+    def mark(self, stage: str, at: float = None):
+        """Horodate une étape (la première occurrence compte)"""
+        self.stages.setdefault(stage, at if at is not None else time.monotonic())
+
+    def to_record(self) -> dict:
+        """Entrée du journal: millisecondes écoulées depuis la réception, par étape"""
+        received = self.stages[STAGE_RECEIVED]
+        return {
+            "id": self.trace_id,
+            "k": self.kind,
+            "u": self.username,
+            "ms": {stage: round((at - received) * 1000, 1) for stage, at in self.stages.items()},
+        }
+
+
+class LatencyTracer:
+    """Crée les traces et agrège la latence de chaque étape à leur fin"""
+
+    def __init__(self, log_path: Optional[str] = None):
+        """
+        Initialise le traceur
+
+        Args:
+            log_path: Journal JSON Lines des traces terminées (None: histogrammes seulement)
+        """
+        self.log_path = log_path
+        self._ids = itertools.count(1)
+        self._queue = queue.SimpleQueue()  # Entrées du journal en attente d'écriture
+        self._thread = None
+        # Latence entre deux étapes consécutives présentes ("applied" -> "enqueued"...)
+        self.stage_histograms = {}
+        self.total_histograms = {}  # Réception -> dernière étape, par type d'événement
+        self.finished_count = 0
+
+    def start(self, kind: str, username: str, received_at: float = None) -> EventTrace:
+        """Crée la trace d'un événement reçu"""
+        return EventTrace(next(self._ids), kind, username, received_at)
+
+    def finish(self, trace: Optional[EventTrace]):
+        """
+        Termine une trace: latences ajoutées aux histogrammes et au journal
+
+        Args:
+            trace: Trace à terminer (ignorée si None ou déjà terminée)
+        """
+        if trace is None or trace.finished:
+            return
+        trace.finished = True
+        self.finished_count += 1
+
+        previous = None
+        for stage in STAGES:
+            at = trace.stages.get(stage)
+            if at is None:
+                continue
+            if previous is not None:
+                name = f"{previous[0]}->{stage}"
+                self._histogram(self.stage_histograms, name).add(at - previous[1])
+            previous = (stage, at)
+        self._histogram(self.total_histograms, trace.kind).add(previous[1] - trace.stages[STAGE_RECEIVED])
+
+        if self.log_path:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="trace-log", daemon=True)
+                self._thread.start()
+            self._queue.put(trace.to_record())
+
+    def _histogram(self, histograms: dict, name: str) -> LatencyHistogram:
+        """Histogramme d'une étape (créé au besoin)"""
+        if name not in histograms:
+            histograms[name] = LatencyHistogram()
+        return histograms[name]
+
+    def _run(self):
+        """Boucle du thread: ajoute les traces terminées au journal (écriture bufferisée)"""
+        try:
+            directory = os.path.dirname(self.log_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            log = open(self.log_path, "a", encoding="utf-8")
+        except OSError as e:
+            print(f"⚠️ Journal des traces impossible à ouvrir ({self.log_path}): {e}")
+            while self._queue.get() is not None:
+                pass
+            return
+
+        with log:
+            while True:
+                record = self._queue.get()
+                if record is None:
+                    return
+                log.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n")
+
+    def close(self, timeout: float = 5.0):
+        """
+        Écrit les traces en attente puis ferme le journal
+
+        Args:
+            timeout: Secondes max d'attente du thread d'écriture
+        """
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join(timeout)
+            self._thread = None
+
+    def get_stats(self) -> dict:
+        """
+        Retourne les histogrammes agrégés
+
+        Returns:
+            {"traces": n, "stages": {étape: stats}, "total": {type: stats}} (latences en ms)
+        """
+        order = {stage: i for i, stage in enumerate(STAGES)}
+        stages = sorted(self.stage_histograms, key=lambda name: [order[s] for s in name.split("->")])
+        return {
+            "traces": self.finished_count,
+            "stages": {name: self.stage_histograms[name].get_stats() for name in stages},
+            "total": {kind: hist.get_stats() for kind, hist in self.total_histograms.items()},
+        }
@@ -29,6 +29,10 @@ def main():
         print("   2. Colle-la dans ton navigateur")
         print("   3. Lance 'python test_simulation.py' dans un autre terminal")
         print("   4. L'overlay se mettra à jour automatiquement !")
+        print("      (push temps réel sur le port 8001 quand le jeu tourne,")
+        print("       sinon lecture de obs_files/game_state.json toutes les 500 ms)")
+        print("   5. Métriques du jeu : http://localhost:8001/stats (JSON)")
+        print("      et http://localhost:8001/metrics (Prometheus)")
         print()
         print("💡 Pour TikTok Live Studio :")
         print(f"   Source Navigateur → http://localhost:{PORT}/overlay.html")
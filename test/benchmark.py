@@ -0,0 +1,429 @@
+"""
+Benchmarks des chemins critiques du moteur de jeu
+Mesures répétées après échauffement (p50/p95/p99, ops/s), entièrement hors ligne:
+le LLM est remplacé par une réponse immédiate, les fichiers OBS vont dans un dossier temporaire
+
+Usage:
+    python test/benchmark.py                       # tous les benchmarks
+    python test/benchmark.py --no-io               # sans écriture de fichiers
+    python test/benchmark.py --only handle_gift --runs 10 --iterations 5000
+    python test/benchmark.py --json bench.json     # résultats JSON
+    python test/benchmark.py --import-time         # temps d'import au démarrage (-X importtime)
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+ROOT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT_DIR)
+
+from src.config import GameConfig
+from src.game_engine import Character, GameEngine
+from src.ingestion import IngestEvent, IngestionQueue
+from src.lazy_import import HEAVY_MODULES
+
+GIFTS = ["Rose", "Heart", "Perfume", "Swan", "Lion"]
+
+# Budget du temps d'import des points d'entrée (millisecondes)
+IMPORT_TIME_BUDGET_MS = 250
+# Points d'entrée mesurés par --import-time
+IMPORT_TIME_MODULES = ["main", "host"]
+
+
+def percentile(samples: list, fraction: float) -> float:
+    """Percentile d'une liste triée (plus proche rang)"""
+    return samples[min(len(samples) - 1, int(len(samples) * fraction))]
+
+
+def summarize(name: str, run_samples: list) -> dict:
+    """
+    Résume les mesures d'un benchmark
+
+    Args:
+        name: Nom du benchmark
+        run_samples: Durées (ns) de chaque opération, une liste par run
+
+    Returns:
+        Percentiles en microsecondes, ops/s médian et extrêmes sur les runs
+    """
+    samples = sorted(ns for run in run_samples for ns in run)
+    ops_per_sec = sorted(len(run) / (sum(run) / 1e9) for run in run_samples if sum(run))
+    return {
+        "name": name,
+        "runs": len(run_samples),
+        "ops": len(samples),
+        "mean_us": sum(samples) / len(samples) / 1e3,
+        "p50_us": percentile(samples, 0.50) / 1e3,
+        "p95_us": percentile(samples, 0.95) / 1e3,
+        "p99_us": percentile(samples, 0.99) / 1e3,
+        "max_us": samples[-1] / 1e3,
+        "ops_per_sec": percentile(ops_per_sec, 0.50) if ops_per_sec else 0.0,
+        "ops_per_sec_min": ops_per_sec[0] if ops_per_sec else 0.0,
+        "ops_per_sec_max": ops_per_sec[-1] if ops_per_sec else 0.0,
+    }
+
+
+class EngineBenchmark:
+    """Exécute les benchmarks du moteur, avec ou sans écriture des fichiers OBS"""
+
+    def __init__(self, runs: int = 5, warmup: int = 200, iterations: int = 2000,
+                 no_io: bool = False, verbose: bool = False, config=GameConfig):
+        """
+        Initialise la suite
+
+        Args:
+            runs: Nombre de runs mesurés par benchmark
+            warmup: Opérations non mesurées avant chaque benchmark
+            iterations: Opérations mesurées par run
+            no_io: Ne pas écrire les fichiers OBS (snapshots ignorés)
+            verbose: Garder les logs du moteur pendant les mesures
+            config: Configuration des moteurs mesurés (voir offline_config)
+        """
+        self.runs = runs
+        self.warmup = warmup
+        self.iterations = iterations
+        self.no_io = no_io
+        self.verbose = verbose
+        self.config = config
+        self.results = []
+
+    def benchmarks(self) -> dict:
+        """Benchmarks disponibles ({nom: méthode de préparation})"""
+        return {
+            "engine_init": self._bench_engine_init,
+            "character_add_hp": self._bench_add_hp,
+            "character_add_xp": self._bench_add_xp,
+            "get_stats_text": self._bench_stats_text,
+            "write_json_state": self._bench_write_json_state,
+            "handle_gift": self._bench_handle_gift,
+            "handle_like": self._bench_handle_like,
+            "pipeline_gift_to_display": self._bench_pipeline,
+        }
+
+    def make_engine(self, **overrides) -> GameEngine:
+        """Moteur hors ligne: LLM immédiat, pas de push overlay, pas de réserve de noms sur disque"""
+        config = self.config.with_overrides(**overrides) if overrides else self.config
+        with self._quiet():
+            game = GameEngine(config)
+
+        async def instant_llm(prompt, on_partial=None):
+            return "Narration de benchmark"
+
+        game._call_ollama_api = instant_llm
+        if self.no_io:
+            game.obs_writer.submit = lambda files, on_written=None: on_written and on_written()
+        return game
+
+    @contextlib.contextmanager
+    def _quiet(self):
+        """Coupe les logs du moteur (sauf en mode verbeux)"""
+        if self.verbose:
+            yield
+            return
+        with open(os.devnull, "w", encoding="utf-8") as devnull, contextlib.redirect_stdout(devnull):
+            yield
+
+    async def _measure(self, name: str, op):
+        """
+        Échauffe puis mesure une opération (fonction ou coroutine, appelée avec son index)
+
+        Args:
+            name: Nom du benchmark
+            op: Opération à mesurer
+        """
+        is_async = asyncio.iscoroutinefunction(op)
+        clock = time.perf_counter_ns
+        with self._quiet():
+            for i in range(self.warmup):
+                if is_async:
+                    await op(i)
+                else:
+                    op(i)
+
+            run_samples = []
+            index = self.warmup
+            for _ in range(self.runs):
+                samples = []
+                for _ in range(self.iterations):
+                    start = clock()
+                    if is_async:
+                        await op(index)
+                    else:
+                        op(index)
+                    samples.append(clock() - start)
+                    index += 1
+                run_samples.append(samples)
+
+        result = summarize(name, run_samples)
+        self.results.append(result)
+        print(f"  {name:<26} p50 {result['p50_us']:9.2f} µs | p95 {result['p95_us']:9.2f} µs | "
+              f"p99 {result['p99_us']:9.2f} µs | {result['ops_per_sec']:12,.0f} ops/s")
+
+    async def _bench_engine_init(self, name: str):
+        """Création d'un moteur (démarrage à froid, hors imports)"""
+        await self._measure(name, lambda i: GameEngine(self.config))
+
+    async def _bench_add_hp(self, name: str):
+        character = Character()
+
+        def op(i):
+            character.hp = 50
+            character.add_hp(5)
+
+        await self._measure(name, op)
+
+    async def _bench_add_xp(self, name: str):
+        character = Character()
+        await self._measure(name, lambda i: character.add_xp(37))
+
+    async def _bench_stats_text(self, name: str):
+        character = Character()
+        character.recent_items = ["Rose", "Lion", "Swan"]
+        await self._measure(name, lambda i: character.get_stats_text())
+
+    async def _bench_write_json_state(self, name: str):
+        game = self.make_engine()
+        game.last_action = "Narration de benchmark"
+        game.current_monster_name = "La Bête"
+        game.current_monster_hp = 80
+
+        def op(i):
+            # Contenu différent à chaque fois: le writer ne peut pas ignorer l'écriture
+            game.character.xp = i % self.config.XP_PER_LEVEL
+            game._write_json_state()
+
+        await self._measure(name, op)
+
+    async def _bench_handle_gift(self, name: str):
+        game = self.make_engine()
+
+        async def op(i):
+            await game.handle_gift(f"viewer{i % 50}", GIFTS[i % len(GIFTS)])
+
+        await self._measure(name, op)
+
+    async def _bench_handle_like(self, name: str):
+        game = self.make_engine()
+        await game.spawn_monster()
+
+        async def op(i):
+            if game.current_monster_hp <= 0:
+                await game.spawn_monster()
+            await game.handle_like(3)
+
+        await self._measure(name, op)
+
+    async def _bench_pipeline(self, name: str):
+        """File d'ingestion -> moteur -> workers de narration -> affichage, un cadeau à la fois"""
+        game = self.make_engine(MIN_ACTION_DISPLAY_SECONDS=0.0)
+        game.narration_cache = None  # Chaque cadeau passe par un worker
+        ingestion = IngestionQueue(game.config.INGEST_QUEUE_SIZE, game.config.INGEST_OVERFLOW_POLICY)
+
+        displayed = asyncio.Event()
+        write_action = game._write_action
+
+        def on_action(action):
+            write_action(action)
+            displayed.set()
+
+        game._write_action = on_action
+
+        async def consume():
+            while True:
+                event = await ingestion.get()
+                if event is None:
+                    return
+                await game.handle_gift_batch(event.username, event.gift_name, event.count)
+                ingestion.record_applied(event)
+
+        game.is_running = True
+        tasks = [asyncio.create_task(game._process_api_queue()), asyncio.create_task(consume())]
+
+        async def op(i):
+            # Viewer et cadeau uniques: aucune fusion, une narration par cadeau
+            displayed.clear()
+            ingestion.offer(IngestEvent("gift", f"viewer{i}", gift_name=GIFTS[i % len(GIFTS)]))
+            await displayed.wait()
+
+        try:
+            await self._measure(name, op)
+        finally:
+            ingestion.close()
+            game.is_running = False
+            await asyncio.gather(*tasks)
+
+    async def run(self, only: list = None) -> list:
+        """
+        Exécute les benchmarks demandés
+
+        Args:
+            only: Noms des benchmarks à exécuter (None: tous)
+
+        Returns:
+            Résultats de chaque benchmark
+        """
+        print("=" * 60)
+        print(f"⏱️ BENCHMARKS - {self.runs} runs x {self.iterations} ops "
+              f"(échauffement {self.warmup}){' - sans I/O' if self.no_io else ''}")
+        print("=" * 60)
+
+        for name, bench in self.benchmarks().items():
+            if only and name not in only:
+                continue
+            await bench(name)
+        return self.results
+
+    def report(self) -> dict:
+        """Rapport JSON (paramètres, machine et résultats)"""
+        return {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "runs": self.runs,
+            "warmup": self.warmup,
+            "iterations": self.iterations,
+            "no_io": self.no_io,
+            "results": self.results,
+        }
+
+
+def parse_importtime(output: str) -> list:
+    """
+    Lit la sortie de python -X importtime
+
+    Args:
+        output: Sortie d'erreur du processus
+
+    Returns:
+        [{"module", "self_us", "cumulative_us", "depth"}] dans l'ordre de la sortie
+    """
+    entries = []
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        try:
+            self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+            entries.append({
+                "module": name.strip(),
+                "self_us": int(self_us),
+                "cumulative_us": int(cumulative_us),
+                # Indentation de 2 espaces par niveau d'import imbriqué
+                "depth": (len(name) - len(name.lstrip()) - 1) // 2,
+            })
+        except ValueError:
+            continue
+    return entries
+
+
+def import_time_report(module: str, budget_ms: float = IMPORT_TIME_BUDGET_MS, top: int = 10) -> dict:
+    """
+    Mesure l'import d'un point d'entrée dans un processus neuf (python -X importtime)
+
+    Args:
+        module: Module à importer (ex: "main")
+        budget_ms: Budget du temps d'import total
+        top: Nombre de modules les plus lents à garder
+
+    Returns:
+        Temps total, respect du budget, modules lourds importés et modules les plus lents
+    """
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT_DIR, capture_output=True, text=True
+    )
+    entries = parse_importtime(process.stderr)
+    if process.returncode != 0:
+        error = process.stderr.strip().splitlines()[-1] if process.stderr.strip() else "échec"
+        return {"module": module, "error": error}
+
+    # Le module mesuré est listé après ses imports (niveau 1), hors imports du démarrage de Python
+    index = next((i for i, entry in enumerate(entries) if entry["module"] == module and entry["depth"] == 0), None)
+    if index is None:
+        return {"module": module, "error": "module absent de la sortie -X importtime"}
+    children = []
+    for entry in reversed(entries[:index]):
+        if entry["depth"] == 0:
+            break
+        children.append(entry)
+    total_ms = entries[index]["cumulative_us"] / 1000
+    heavy = sorted({entry["module"].split(".")[0] for entry in children} & set(HEAVY_MODULES))
+    slowest = sorted((entry for entry in children if entry["depth"] == 1),
+                     key=lambda entry: entry["cumulative_us"], reverse=True)[:top]
+    return {
+        "module": module,
+        "total_ms": total_ms,
+        "budget_ms": budget_ms,
+        "within_budget": total_ms <= budget_ms,
+        "heavy_modules": heavy,
+        "slowest": [{"module": e["module"], "cumulative_ms": e["cumulative_us"] / 1000} for e in slowest],
+    }
+
+
+def print_import_report(report: dict):
+    """Affiche le temps d'import d'un point d'entrée"""
+    if "error" in report:
+        print(f"  ❌ import {report['module']}: {report['error']}")
+        return
+    status = "✅" if report["within_budget"] and not report["heavy_modules"] else "⚠️"
+    print(f"  {status} import {report['module']}: {report['total_ms']:.1f} ms (budget {report['budget_ms']:.0f} ms)")
+    if report["heavy_modules"]:
+        print(f"     modules lourds importés au démarrage: {', '.join(report['heavy_modules'])}")
+    for entry in report["slowest"][:5]:
+        print(f"     {entry['module']:<32} {entry['cumulative_ms']:8.1f} ms")
+
+
+def offline_config(obs_dir: str):
+    """Fichiers OBS dans un dossier temporaire, pas de push overlay ni de réserve de noms persistée"""
+    return GameConfig.with_overrides(
+        OBS_LAST_ACTION_FILE=os.path.join(obs_dir, "last_action.txt"),
+        OBS_STATS_FILE=os.path.join(obs_dir, "stats.txt"),
+        OBS_JSON_STATE_FILE=os.path.join(obs_dir, "game_state.json"),
+        OVERLAY_PUSH_ENABLED=False,
+        MONSTER_NAME_POOL_FILE=None,
+    )
+
+
+def run_benchmarks(runs: int = 5, warmup: int = 200, iterations: int = 2000,
+                   no_io: bool = False, only: list = None, verbose: bool = False) -> dict:
+    """Exécute la suite hors ligne et renvoie le rapport JSON"""
+    with tempfile.TemporaryDirectory() as obs_dir:
+        bench = EngineBenchmark(runs, warmup, iterations, no_io=no_io, verbose=verbose,
+                                config=offline_config(obs_dir))
+        asyncio.run(bench.run(only))
+    return bench.report()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks des chemins critiques du moteur")
+    parser.add_argument("--runs", type=int, default=5, help="Runs mesurés par benchmark")
+    parser.add_argument("--warmup", type=int, default=200, help="Opérations d'échauffement")
+    parser.add_argument("--iterations", type=int, default=2000, help="Opérations mesurées par run")
+    parser.add_argument("--no-io", action="store_true", help="Sans écriture des fichiers OBS")
+    parser.add_argument("--only", nargs="+", help="Benchmarks à exécuter")
+    parser.add_argument("--json", metavar="FILE", help="Écrire les résultats en JSON")
+    parser.add_argument("--verbose", action="store_true", help="Garder les logs du moteur")
+    parser.add_argument("--import-time", action="store_true",
+                        help="Mesurer aussi le temps d'import des points d'entrée (-X importtime)")
+    args = parser.parse_args()
+
+    report = run_benchmarks(args.runs, args.warmup, args.iterations,
+                            no_io=args.no_io, only=args.only, verbose=args.verbose)
+    if args.import_time:
+        print("\n📦 TEMPS D'IMPORT (processus neuf)")
+        report["import_time"] = [import_time_report(module) for module in IMPORT_TIME_MODULES]
+        for module_report in report["import_time"]:
+            print_import_report(module_report)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n💾 Résultats écrits dans {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -94,6 +94,7 @@ async def full_system_test():
     
     # Test 4.1: Spawn monstre
     print("4.1 - Spawn nouveau monstre")
+    game.current_monster_hp = 0  # Les cadeaux précédents ont déjà entamé le monstre
     await game.spawn_monster()
     assert game.current_monster_hp > 0, "❌ Monstre pas spawn"
     assert game.current_monster_name is not None, "❌ Monstre sans nom"
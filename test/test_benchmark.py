@@ -0,0 +1,53 @@
+"""
+Test rapide de la suite de benchmarks (quelques opérations, sans I/O)
+"""
+
+import json
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from benchmark import parse_importtime, run_benchmarks, summarize
+
+
+def test_benchmark():
+    print("=" * 60)
+    print("🧪 TEST: Suite de benchmarks")
+    print("=" * 60)
+
+    print("\n📍 Test 1: Percentiles et ops/s")
+    result = summarize("op", [[1000] * 98 + [5000, 9000], [2000] * 100])
+    assert result["ops"] == 200 and result["runs"] == 2, f"❌ Comptes: {result}"
+    assert result["p50_us"] == 2.0 and result["p99_us"] == 5.0, f"❌ Percentiles: {result}"
+    assert result["max_us"] == 9.0, f"❌ Max: {result}"
+    assert result["ops_per_sec_max"] > result["ops_per_sec_min"], f"❌ ops/s: {result}"
+    print("   ✅ PASS\n")
+
+    print("📍 Test 2: Tous les benchmarks tournent hors ligne, rapport JSON")
+    report = run_benchmarks(runs=2, warmup=5, iterations=20, no_io=True)
+    names = [result["name"] for result in report["results"]]
+    assert names == ["engine_init", "character_add_hp", "character_add_xp", "get_stats_text", "write_json_state",
+                     "handle_gift", "handle_like", "pipeline_gift_to_display"], f"❌ Benchmarks: {names}"
+    for result in report["results"]:
+        assert result["ops"] == 40, f"❌ Opérations: {result}"
+        assert result["p50_us"] <= result["p95_us"] <= result["p99_us"] <= result["max_us"], f"❌ {result}"
+    json.dumps(report)
+    print("   ✅ PASS\n")
+
+    print("📍 Test 3: Lecture de la sortie de -X importtime")
+    entries = parse_importtime(
+        "import time: self [us] | cumulative | imported package\n"
+        "import time:       120 |        120 |   _json\n"
+        "import time:       300 |        420 | json\n"
+        "import time:      1500 |       9000 | src.game_engine\n"
+    )
+    assert [(e["module"], e["depth"]) for e in entries] == [("_json", 1), ("json", 0), ("src.game_engine", 0)], \
+        f"❌ {entries}"
+    assert entries[2]["cumulative_us"] == 9000 and entries[2]["self_us"] == 1500, f"❌ {entries}"
+    print("   ✅ PASS\n")
+
+    print("🎉 TOUS LES TESTS RÉUSSIS !")
+
+
+if __name__ == "__main__":
+    test_benchmark()
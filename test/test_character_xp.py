@@ -0,0 +1,66 @@
+"""
+Test du gain d'XP multi-niveaux en temps constant (Character.add_xp)
+"""
+
+import sys
+import os
+import time
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.config import GameConfig
+from src.game_engine import Character
+
+
+def test_character_xp():
+    print("=" * 60)
+    print("🧪 TEST: Gain d'XP multi-niveaux")
+    print("=" * 60)
+
+    print("\n📍 Test 1: Un seul niveau (Drama Queen, 120 XP)")
+    c = Character()
+    assert c.add_xp(120) == 1, "❌ 1 niveau attendu"
+    assert (c.level, c.xp) == (2, 20), f"❌ Niveau {c.level}, XP {c.xp}"
+    assert c.max_hp == GameConfig.MAX_HP + GameConfig.MAX_HP_PER_LEVEL, "❌ HP max incorrect"
+    assert c.hp == c.max_hp, "❌ HP non restaurés"
+    print("   ✅ PASS\n")
+
+    print("📍 Test 2: Plusieurs niveaux d'un coup")
+    c = Character()
+    c.hp = 10
+    assert c.add_xp(350) == 3, "❌ 3 niveaux attendus"
+    assert (c.level, c.xp) == (4, 50), f"❌ Niveau {c.level}, XP {c.xp}"
+    assert c.max_hp == GameConfig.MAX_HP + 3 * GameConfig.MAX_HP_PER_LEVEL, "❌ HP max incorrect"
+    assert c.hp == c.max_hp, "❌ HP non restaurés"
+    print("   ✅ PASS\n")
+
+    print("📍 Test 3: Aucun niveau")
+    c = Character()
+    c.hp = 10
+    assert c.add_xp(99) == 0, "❌ Aucun niveau attendu"
+    assert (c.level, c.xp, c.hp) == (1, 99, 10), "❌ État modifié"
+    print("   ✅ PASS\n")
+
+    print("📍 Test 4: Identique à des gains unitaires")
+    bulk, step = Character(), Character()
+    bulk.add_xp(12345)
+    for _ in range(12345):
+        step.add_xp(1)
+    assert (bulk.level, bulk.xp, bulk.max_hp, bulk.hp) == (step.level, step.xp, step.max_hp, step.hp), \
+        "❌ Résultat différent des gains unitaires"
+    print("   ✅ PASS\n")
+
+    print("📍 Test 5: Coût constant pour un gain énorme")
+    c = Character()
+    start = time.perf_counter()
+    levels = c.add_xp(10 ** 9)
+    elapsed = time.perf_counter() - start
+    assert levels == 10 ** 9 // GameConfig.XP_PER_LEVEL, "❌ Nombre de niveaux incorrect"
+    assert elapsed < 0.01, f"❌ Trop lent ({elapsed:.4f}s)"
+    print(f"   {levels} niveaux en {elapsed * 1e6:.1f} µs")
+    print("   ✅ PASS\n")
+
+    print("🎉 TOUS LES TESTS RÉUSSIS !")
+
+
+if __name__ == "__main__":
+    test_character_xp()
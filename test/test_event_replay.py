@@ -0,0 +1,86 @@
+"""
+Test de l'enregistrement des événements et de leur relecture
+"""
+
+import json
+import sys
+import os
+import tempfile
+import time
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from replay import replay_config
+from src.config import GameConfig
+from src.event_recorder import EventRecorder, load_recording
+from src.ingestion import IngestEvent
+
+
+def test_event_replay():
+    print("=" * 60)
+    print("🧪 TEST: Enregistrement et relecture des événements")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "recordings", "live.jsonl")
+
+        print("\n📍 Test 1: Aller-retour cadeau / likes / commentaire")
+        recorder = EventRecorder(path)
+        recorder.record(IngestEvent("gift", "Alice", gift_name="Rose", count=5))
+        time.sleep(0.05)
+        recorder.record(IngestEvent("like", "Bob", count=12))
+        recorder.record(IngestEvent("comment", "Carol", comment="Allez l'aventurier ! ⚔️"))
+        assert recorder.close() == path, "❌ Journal non créé"
+        events = list(load_recording(path))
+        assert [e.kind for _, e in events] == ["gift", "like", "comment"], "❌ Ordre ou types perdus"
+        gift, like, comment = (e for _, e in events)
+        assert (gift.username, gift.gift_name, gift.count) == ("Alice", "Rose", 5), "❌ Cadeau altéré"
+        assert like.count == 12 and like.gift_name is None, "❌ Likes altérés"
+        assert comment.comment == "Allez l'aventurier ! ⚔️", "❌ Commentaire altéré"
+        print("   ✅ PASS\n")
+
+        print("📍 Test 2: Horodatage relatif au début de l'enregistrement")
+        offsets = [offset for offset, _ in events]
+        assert offsets[0] == 0.0, f"❌ Premier décalage: {offsets[0]}"
+        assert 0.04 <= offsets[1] < 0.5, f"❌ Décalage: {offsets[1]}"
+        assert offsets == sorted(offsets), "❌ Horodatage non croissant"
+        print("   ✅ PASS\n")
+
+        print("📍 Test 3: Format compact, lignes invalides ignorées")
+        with open(path, "r", encoding="utf-8") as f:
+            header = json.loads(f.readline())
+            first = json.loads(f.readline())
+        assert set(header) == {"session"}, f"❌ En-tête de session: {header}"
+        assert first == {"t": 0.0, "k": "gift", "u": "Alice", "g": "Rose", "n": 5}, f"❌ Entrée: {first}"
+        with open(path, "a", encoding="utf-8") as f:
+            f.write("pas du json\n\n")
+        assert len(list(load_recording(path))) == 3, "❌ Ligne invalide non ignorée"
+        print("   ✅ PASS\n")
+
+        print("📍 Test 4: Une nouvelle session reprend après la précédente")
+        recorder = EventRecorder(path)
+        recorder.record(IngestEvent("like", "Dave", count=3))
+        time.sleep(0.05)
+        recorder.record(IngestEvent("gift", "Eve", gift_name="Lion"))
+        assert recorder.close() == path, "❌ Journal non rouvert"
+        events = list(load_recording(path))
+        assert [e.username for _, e in events] == ["Alice", "Bob", "Carol", "Dave", "Eve"], "❌ Sessions"
+        offsets = [offset for offset, _ in events]
+        assert offsets == sorted(offsets), f"❌ Horodatage non croissant entre sessions: {offsets}"
+        assert offsets[3] == offsets[2] and offsets[4] - offsets[3] >= 0.04, f"❌ Décalages: {offsets}"
+        print("   ✅ PASS\n")
+
+        print("📍 Test 5: Le rejeu n'écrit rien dans les fichiers du live")
+        config = replay_config(os.path.join(tmp, "replay"))
+        for key in ("OBS_LAST_ACTION_FILE", "OBS_STATS_FILE", "OBS_JSON_STATE_FILE"):
+            assert getattr(config, key).startswith(os.path.join(tmp, "replay")), f"❌ {key}"
+        assert not config.OVERLAY_PUSH_ENABLED, "❌ Overlay poussé pendant le rejeu"
+        assert config.STATE_DIR is None and config.MONSTER_NAME_POOL_FILE is None, "❌ État du live modifié"
+        assert config.TRACE_LOG_FILE is None and config.EVENT_RECORD_FILE is None, "❌ Journaux du live modifiés"
+        assert GameConfig.OBS_STATS_FILE == "obs_files/stats.txt", "❌ Configuration du live modifiée"
+        print("   ✅ PASS\n")
+
+    print("🎉 TOUS LES TESTS RÉUSSIS !")
+
+
+if __name__ == "__main__":
+    test_event_replay()
@@ -0,0 +1,100 @@
+"""
+Test du faux serveur Ollama (latence, débit, parallélisme, erreurs)
+"""
+
+import asyncio
+import sys
+import os
+import time
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import src.game_engine as game_engine_module
+from src.fake_ollama import FakeOllamaServer
+from src.game_engine import AI_ERROR_TEXT, GameEngine
+from src.llm_client import OllamaClient, OllamaError
+
+
+async def run_fake_ollama_test():
+    print("=" * 60)
+    print("🧪 TEST: Faux serveur Ollama")
+    print("=" * 60)
+
+    print("\n📍 Test 1: Streaming avec time-to-first-token et débit configurés")
+    server = FakeOllamaServer(port=0, ttft=0.2, tokens_per_sec=50, response_tokens=10)
+    await server.start()
+    client = OllamaClient(server.api_url)
+    started = time.perf_counter()
+    chunks = [chunk async for chunk in client.stream({"model": "test", "prompt": "x"})]
+    duration = time.perf_counter() - started
+    assert chunks[-1]["done"] and chunks[-1]["eval_count"] == 10, f"❌ Dernier chunk: {chunks[-1]}"
+    assert len(chunks) == 11, f"❌ Chunks: {len(chunks)}"
+    assert 0.35 <= duration < 1.0, f"❌ Durée: {duration:.2f}s"
+    tokens_per_sec = chunks[-1]["eval_count"] / (chunks[-1]["eval_duration"] / 1e9)
+    assert 40 <= tokens_per_sec <= 60, f"❌ Débit: {tokens_per_sec:.1f} tok/s"
+    print("   ✅ PASS\n")
+
+    print("📍 Test 2: Réponse complète (stream: false)")
+    result = await client.generate({"model": "test", "prompt": "x"})
+    assert result["done"] and len(result["response"].split(" ")) == 10, f"❌ Réponse: {result}"
+    await client.close()
+    await server.close()
+    print("   ✅ PASS\n")
+
+    print("📍 Test 3: Limite de générations parallèles")
+    server = FakeOllamaServer(port=0, ttft=0.1, tokens_per_sec=0, parallel=2)
+    await server.start()
+    client = OllamaClient(server.api_url, max_connections=6)
+    started = time.perf_counter()
+    await asyncio.gather(*(client.generate({"prompt": str(i)}) for i in range(6)))
+    duration = time.perf_counter() - started
+    stats = server.get_stats()
+    assert stats["max_active"] == 2 and stats["completed"] == 6, f"❌ Stats: {stats}"
+    assert duration >= 0.3, f"❌ Pas de mise en attente: {duration:.2f}s"
+    await client.close()
+    await server.close()
+    print("   ✅ PASS\n")
+
+    print("📍 Test 4: Erreurs HTTP et requêtes bloquées")
+    server = FakeOllamaServer(port=0, ttft=0, tokens_per_sec=0, error_rate=1.0, hang_seconds=0.5)
+    await server.start()
+    client = OllamaClient(server.api_url)
+    try:
+        await client.generate({"prompt": "x"})
+        assert False, "❌ Erreur attendue"
+    except OllamaError as e:
+        assert e.status_code == 500, f"❌ Code: {e.status_code}"
+    server.error_rate, server.timeout_rate = 0.0, 1.0
+    try:
+        await client.generate({"prompt": "x"}, timeout=0.2)
+        assert False, "❌ Timeout attendu"
+    except Exception as e:
+        assert not isinstance(e, OllamaError), f"❌ Exception: {e!r}"
+    assert server.get_stats()["timeouts"] == 1, "❌ Requête bloquée non comptée"
+    await client.close()
+    await server.close()
+    print("   ✅ PASS\n")
+
+    print("📍 Test 5: Le moteur pointé sur le faux serveur")
+    server = FakeOllamaServer.from_profile("overloaded", port=0, ttft=0.05, tokens_per_sec=0,
+                                           error_rate=1.0, timeout_rate=0.0)
+    await server.start()
+    game_engine_module.OLLAMA_API_URL = server.api_url
+    game = GameEngine()
+    assert await game._call_ollama_api("x") == AI_ERROR_TEXT, "❌ Erreur non gérée"
+    server.error_rate = 0.0
+    text = await game._call_ollama_api("x")
+    assert text.startswith("Merci"), f"❌ Texte: {text}"
+    assert game.last_generation["tokens"] == server.response_tokens, f"❌ Stats: {game.last_generation}"
+    await game.llm_client.close()
+    await server.close()
+    print("   ✅ PASS\n")
+
+    print("🎉 TOUS LES TESTS RÉUSSIS !")
+
+
+def test_fake_ollama():
+    asyncio.run(run_fake_ollama_test())
+
+
+if __name__ == "__main__":
+    test_fake_ollama()
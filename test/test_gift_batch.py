@@ -0,0 +1,88 @@
+"""
+Test de l'application en bloc des combos de cadeaux (handle_gift_batch)
+"""
+
+import asyncio
+import sys
+import os
+import time
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.game_engine import GameEngine
+
+
+def character_state(game):
+    c = game.character
+    return (c.hp, c.max_hp, c.level, c.xp, c.recent_items)
+
+
+async def run_gift_batch_test():
+    print("=" * 60)
+    print("🧪 TEST: Combos de cadeaux appliqués en bloc")
+    print("=" * 60)
+
+    print("\n📍 Test 1: Même état final qu'un cadeau à la fois")
+    for gift_name, count in [("Rose", 1), ("Rose", 7), ("Perfume", 40), ("Drama Queen", 25)]:
+        batch = GameEngine()
+        batch.character.hp = 40
+        await batch.handle_gift_batch("Alice", gift_name, count)
+
+        loop = GameEngine()
+        loop.character.hp = 40
+        for _ in range(count):
+            await loop.handle_gift("Alice", gift_name)
+
+        assert character_state(batch) == character_state(loop), \
+            f"❌ {gift_name} x{count}: {character_state(batch)} != {character_state(loop)}"
+        print(f"   {gift_name} x{count}: niveau {batch.character.level}, XP {batch.character.xp}")
+    print("   ✅ PASS\n")
+
+    print("📍 Test 2: Une seule narration résumée pour le combo")
+    game = GameEngine()
+    await game.handle_gift_batch("Bob", "Rose", 300)
+    assert game.api_queue.qsize() == 1, "❌ Une narration attendue"
+    request = game._pending_narrations[0].request
+    assert request.count == 300, "❌ Nombre de cadeaux incorrect"
+    assert request.levels_gained == game.character.level - 1, "❌ Niveaux gagnés incorrects"
+    assert "300 cadeaux" in request.build_prompt(), "❌ Prompt non résumé"
+    print("   ✅ PASS\n")
+
+    print("📍 Test 3: Une seule écriture d'état par combo")
+    game = GameEngine()
+    game.is_running = True  # Écritures regroupées par la boucle de flush
+    await game.handle_gift_batch("Bob", "Rose", 500)
+    writes = game.obs_writer.write_count
+    game.flush_state()
+    assert game.obs_writer.write_count - writes <= 3, "❌ Trop d'écritures"
+    game.is_running = False
+    print("   ✅ PASS\n")
+
+    print("📍 Test 4: Le coût ne dépend pas de la taille du combo")
+    timings = {}
+    for count in (1, 500):
+        game = GameEngine()
+        game.is_running = True
+        start = time.perf_counter()
+        for _ in range(50):
+            await game.handle_gift_batch("Bob", "Rose", count)
+        timings[count] = (time.perf_counter() - start) / 50
+        game.is_running = False
+    print(f"   x1: {timings[1] * 1e6:.0f} µs, x500: {timings[500] * 1e6:.0f} µs")
+    assert timings[500] < timings[1] * 5 + 0.001, "❌ Le coût augmente avec le combo"
+    print("   ✅ PASS\n")
+
+    print("📍 Test 5: Combo vide ignoré")
+    game = GameEngine()
+    await game.handle_gift_batch("Bob", "Rose", 0)
+    assert game.api_queue.empty(), "❌ Narration pour un combo vide"
+    print("   ✅ PASS\n")
+
+    print("🎉 TOUS LES TESTS RÉUSSIS !")
+
+
+def test_gift_batch():
+    asyncio.run(run_gift_batch_test())
+
+
+if __name__ == "__main__":
+    test_gift_batch()
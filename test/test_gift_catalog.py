@@ -0,0 +1,94 @@
+"""
+Test du catalogue des cadeaux (index, noms normalisés, alias, classes de valeur)
+"""
+
+import asyncio
+import sys
+import os
+import time
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.config import GameConfig
+from src.game_engine import GameEngine
+from src.gift_catalog import GiftCatalog, get_gift_catalog, normalize_gift_name
+
+
+async def run_gift_catalog_test():
+    print("=" * 60)
+    print("🧪 TEST: Catalogue des cadeaux")
+    print("=" * 60)
+
+    catalog = get_gift_catalog()
+
+    print("\n📍 Test 1: Variantes de casse, d'espaces et noms localisés")
+    assert normalize_gift_name("  Finger-HEART ") == "fingerheart", "❌ Normalisation"
+    rose = catalog.lookup("Rose")
+    assert catalog.lookup("rose") is rose and catalog.lookup(" ROSE ") is rose, "❌ Variante de casse"
+    assert catalog.lookup("finger heart").name == "Finger Heart", "❌ Variante d'espaces"
+    assert catalog.lookup("Cygne").name == "Swan" and catalog.lookup("CŒUR").name == "Heart", "❌ Alias"
+    assert catalog.lookup("Cadeau inconnu") is catalog.default, "❌ Cadeau inconnu"
+    print("   ✅ PASS\n")
+
+    print("📍 Test 2: Identifiants TikTok du catalogue livré (sans normalisation du nom)")
+    normalized = catalog.get_stats()["normalized"]
+    assert catalog.get_stats()["ids"] > 0, "❌ Aucun identifiant dans assets/gifts.json"
+    assert catalog.lookup("Rosa", gift_id=5655).name == "Rose", "❌ Recherche par identifiant"
+    assert catalog.lookup("León", gift_id=6369).name == "Lion", "❌ Recherche par identifiant"
+    assert catalog.get_stats()["normalized"] == normalized, "❌ Nom normalisé malgré l'identifiant"
+    print("   ✅ PASS\n")
+
+    print("📍 Test 3: Classes de valeur (priorité et dégâts)")
+    assert [catalog.lookup(name).priority for name in ("Drama Queen", "Swan", "Perfume", "Rose")] == [3, 2, 1, 1]
+    assert catalog.lookup("Lion").damage > catalog.lookup("Swan").damage > catalog.lookup("Rose").damage
+    # Cadeau absent du catalogue mais de valeur connue: effets de sa classe
+    unknown = catalog.lookup("Nouveau cadeau", value=5000)
+    assert unknown.tier == "épique" and unknown.priority == 3 and unknown.name is None, f"❌ {unknown}"
+    print("   ✅ PASS\n")
+
+    print("📍 Test 4: Catalogue de milliers de cadeaux, recherches O(1)")
+    gifts = [{"id": 10000 + i, "name": f"Gift {i}", "value": i % 3000} for i in range(5000)]
+    started = time.perf_counter()
+    big = GiftCatalog(gifts, {"Cadeau 42": "Gift 42", "Alias cassé": "Absent"}, tiers=GameConfig.GIFT_VALUE_TIERS)
+    build_time = time.perf_counter() - started
+    assert len(big) == 5000 and big.get_stats()["aliases"] == 1, f"❌ {big.get_stats()}"
+    assert big.lookup("autre nom", gift_id=10042).name == "Gift 42", "❌ Index par identifiant"
+    assert big.lookup("cadeau 42").name == "Gift 42", "❌ Alias"
+    assert big.lookup("Gift 600").tier == "rare", "❌ Classe précalculée"
+
+    started = time.perf_counter()
+    for _ in range(100):
+        for i in range(0, 5000, 50):
+            big.lookup(f"Gift {i}")
+    exact = (time.perf_counter() - started) / 10000
+    normalized = big.get_stats()["normalized"]
+    for _ in range(3):
+        big.lookup("gift 7")
+    assert big.get_stats()["normalized"] == normalized + 1, "❌ Variante normalisée à chaque recherche"
+    print(f"   Construction: {build_time * 1000:.1f} ms, recherche: {exact * 1e9:.0f} ns")
+    print("   ✅ PASS\n")
+
+    print("📍 Test 5: Variantes mémorisées en nombre limité")
+    small = GiftCatalog([{"name": "Rose", "value": 1}], max_seen=10)
+    for i in range(100):
+        small.lookup(f"inconnu {i}")
+    assert small.get_stats()["names"] == 11, f"❌ {small.get_stats()}"
+    print("   ✅ PASS\n")
+
+    print("📍 Test 6: Le moteur applique le nom canonique et les dégâts")
+    game = GameEngine()
+    await game.handle_gift_batch("Alice", "cygne", 1)
+    assert game.character.recent_items == ["Swan"], f"❌ {game.character.recent_items}"
+    assert game.current_monster_hp == game.current_monster_max_hp - catalog.lookup("Swan").damage, "❌ Dégâts"
+    await game.handle_gift_batch("Bob", "Inédit", 1, gift_id=123456789, gift_value=2000)
+    assert game._pending_narrations[-1].priority == 3, "❌ Priorité d'un cadeau inconnu de valeur"
+    print("   ✅ PASS\n")
+
+    print("🎉 TOUS LES TESTS RÉUSSIS !")
+
+
+def test_gift_catalog():
+    asyncio.run(run_gift_catalog_test())
+
+
+if __name__ == "__main__":
+    test_gift_catalog()
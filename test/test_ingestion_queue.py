@@ -0,0 +1,107 @@
+"""
+Test de la file d'ingestion entre le listener TikTok et le moteur
+"""
+
+import asyncio
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.game_engine import GameEngine
+from src.ingestion import IngestEvent, IngestionQueue, OVERFLOW_COALESCE, OVERFLOW_KEEP
+from src.tiktok_listener import TikTokListener
+from src.tracing import LatencyTracer
+
+
+def make_listener(step_delay=0.0):
+    game = GameEngine()
+    listener = TikTokListener(game)
+    applied = []
+
+    async def handle_gift_batch(username, gift_name, count=1, trace=None, gift_id=None, gift_value=None):
+        await asyncio.sleep(step_delay)
+        applied.append((username, gift_name, count))
+
+    game.handle_gift_batch = handle_gift_batch
+    return listener, applied
+
+
+async def run_ingestion_queue_test():
+    print("=" * 60)
+    print("🧪 TEST: File d'ingestion bornée")
+    print("=" * 60)
+
+    print("\n📍 Test 1: Les handlers rendent la main malgré un moteur lent")
+    listener, applied = make_listener(step_delay=0.05)
+    listener.start_consumer()
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    for i in range(10):
+        listener.ingestion.offer(IngestEvent("gift", f"viewer{i}", gift_name="Rose"))
+    assert loop.time() - start < 0.01, "❌ Dépôt bloquant"
+    await listener.stop()
+    assert [u for u, _, _ in applied] == [f"viewer{i}" for i in range(10)], "❌ Ordre non respecté"
+    print("   ✅ PASS\n")
+
+    print("📍 Test 2: Débordement (likes fusionnés, cadeaux gardés, commentaires ignorés)")
+    queue = IngestionQueue(2, {"like": OVERFLOW_COALESCE, "gift": OVERFLOW_KEEP})
+    queue.offer(IngestEvent("like", "Alice", count=3))
+    queue.offer(IngestEvent("gift", "Bob", gift_name="Rose"))
+    assert queue.offer(IngestEvent("like", "Carol", count=4)), "❌ Like perdu"
+    assert queue.offer(IngestEvent("gift", "Dan", gift_name="Lion")), "❌ Cadeau perdu"
+    assert not queue.offer(IngestEvent("comment", "Eve", comment="salut")), "❌ Commentaire accepté"
+    stats = queue.get_stats()
+    assert stats["depth"] == 3 and stats["coalesced"] == 1, f"❌ Stats: {stats}"
+    assert stats["overflow"] == 1 and stats["dropped"] == 1, f"❌ Stats: {stats}"
+    assert queue.get_nowait().count == 7, "❌ Likes non fusionnés"
+    print("   ✅ PASS\n")
+
+    print("📍 Test 3: Profondeur et latence réception -> application")
+    listener, applied = make_listener(step_delay=0.02)
+    for i in range(5):
+        listener.ingestion.offer(IngestEvent("gift", "Alice", gift_name="Rose"))
+    listener.start_consumer()
+    await listener.stop()
+    stats = listener.ingestion.get_stats()
+    assert stats["max_depth"] == 5 and stats["depth"] == 0, f"❌ Profondeur: {stats}"
+    assert stats["applied"] == 5, f"❌ Appliqués: {stats['applied']}"
+    assert stats["latency_max"] >= 0.08, f"❌ Latence: {stats['latency_max']}"
+    print("   ✅ PASS\n")
+
+    print("📍 Test 4: Rien n'est perdu si l'arrêt survient pendant un traitement")
+    listener, applied = make_listener(step_delay=0.05)
+    listener.start_consumer()
+    for i in range(3):
+        listener.ingestion.offer(IngestEvent("gift", f"viewer{i}", gift_name="Rose"))
+    await asyncio.sleep(0.01)
+    await listener.stop()
+    assert len(applied) == 3, f"❌ Événements perdus: {applied}"
+    print("   ✅ PASS\n")
+
+    print("📍 Test 5: Les traces des événements fusionnés sont terminées")
+    listener, applied = make_listener()
+    tracer = listener.game_engine.tracer = LatencyTracer()
+
+    async def handle_gift_batch(username, gift_name, count=1, trace=None, gift_id=None, gift_value=None):
+        applied.append((username, gift_name, count))
+        tracer.finish(trace)
+
+    listener.game_engine.handle_gift_batch = handle_gift_batch
+    listener.ingestion = IngestionQueue(1, {"gift": OVERFLOW_COALESCE})
+    for _ in range(3):
+        listener.ingest(IngestEvent("gift", "Alice", gift_name="Rose"))
+    await listener.stop()
+    assert applied == [("Alice", "Rose", 3)], f"❌ Combo: {applied}"
+    assert tracer.finished_count == 3, f"❌ Traces terminées: {tracer.finished_count}"
+    assert tracer.get_stats()["stages"]["received->applied"]["count"] == 3, "❌ Fusionnés absents des histogrammes"
+    print("   ✅ PASS\n")
+
+    print("🎉 TOUS LES TESTS RÉUSSIS !")
+
+
+def test_ingestion_queue():
+    asyncio.run(run_ingestion_queue_test())
+
+
+if __name__ == "__main__":
+    test_ingestion_queue()
@@ -0,0 +1,135 @@
+"""
+Test du traçage de latence des événements (réception -> écriture des fichiers OBS)
+Le LLM est remplacé par une fonction à latence fixe (sans Ollama)
+"""
+
+import asyncio
+import json
+import sys
+import os
+import tempfile
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.config import GameConfig
+from src.game_engine import GameEngine
+from src.ingestion import IngestEvent
+from src.tiktok_listener import TikTokListener
+from src.tracing import LatencyHistogram, LatencyTracer, STAGES
+
+
+async def run_latency_tracing_test():
+    print("=" * 60)
+    print("🧪 TEST: Traçage de latence de bout en bout")
+    print("=" * 60)
+
+    print("\n📍 Test 1: Histogramme à classes fixes")
+    histogram = LatencyHistogram()
+    for ms in [3] * 90 + [40] * 9 + [700]:
+        histogram.add(ms / 1000)
+    stats = histogram.get_stats()
+    assert stats["count"] == 100 and stats["p50_ms"] == 5, f"❌ Stats: {stats}"
+    assert stats["p95_ms"] == 50 and stats["p99_ms"] == 50, f"❌ Percentiles: {stats}"
+    assert abs(stats["max_ms"] - 700) < 1e-6, f"❌ Max: {stats}"
+    print("   ✅ PASS\n")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        game = GameEngine(GameConfig.with_overrides(MIN_ACTION_DISPLAY_SECONDS=0.05))
+        game.narration_cache = None
+        game.tracer = LatencyTracer(os.path.join(tmp, "traces.jsonl"))
+        listener = TikTokListener(game, record_path=None)
+
+        async def fake_llm(prompt, on_partial=None):
+            await asyncio.sleep(0.1)
+            return "Merci pour le cadeau !"
+
+        game._call_ollama_api = fake_llm
+        game.is_running = True
+        game.obs_writer.start()
+        tasks = [asyncio.create_task(game._process_api_queue()), asyncio.create_task(game._state_flush_loop())]
+        listener.start_consumer()
+
+        listener.ingest(IngestEvent("gift", "Alice", gift_name="Lion"))
+        listener.ingest(IngestEvent("gift", "Bob", gift_name="Rose"))
+        listener.ingest(IngestEvent("comment", "Carol", comment="salut"))
+        for _ in range(100):
+            if game.tracer.finished_count == 3:
+                break
+            await asyncio.sleep(0.05)
+
+        print("📍 Test 2: Toutes les étapes horodatées pour un cadeau narré")
+        game.tracer.close()
+        with open(os.path.join(tmp, "traces.jsonl"), "r", encoding="utf-8") as f:
+            records = {record["u"]: record for record in map(json.loads, f)}
+        assert set(records) == {"Alice", "Bob", "Carol"}, f"❌ Traces: {list(records)}"
+        alice = records["Alice"]["ms"]
+        assert list(alice) == STAGES, f"❌ Étapes: {list(alice)}"
+        assert list(alice.values()) == sorted(alice.values()), f"❌ Ordre: {alice}"
+        assert alice["llm_done"] - alice["llm_start"] >= 100, f"❌ Durée LLM: {alice}"
+        print("   ✅ PASS\n")
+
+        print("📍 Test 3: L'attente d'affichage de la 2e narration est visible")
+        bob = records["Bob"]["ms"]
+        assert bob["displayed"] - bob["llm_done"] >= 40, f"❌ Temps d'affichage: {bob}"
+        assert list(records["Carol"]["ms"]) == ["received", "applied"], f"❌ Commentaire: {records['Carol']}"
+        print("   ✅ PASS\n")
+
+        print("📍 Test 4: Histogrammes par étape et de bout en bout")
+        tracing = game.tracer.get_stats()
+        assert tracing["traces"] == 3, f"❌ Traces: {tracing['traces']}"
+        assert tracing["stages"]["llm_start->llm_done"]["count"] == 2, f"❌ {tracing['stages']}"
+        assert tracing["stages"]["displayed->written"]["count"] == 2, f"❌ {tracing['stages']}"
+        assert tracing["total"]["gift"]["p50_ms"] >= 100, f"❌ Total: {tracing['total']}"
+        print("   ✅ PASS\n")
+
+        game.is_running = False
+        await listener.stop()
+        await asyncio.gather(*tasks)
+        game.obs_writer.stop()
+
+        print("📍 Test 5: Traces du dernier snapshot terminées avant la fermeture du traceur")
+        game = GameEngine()
+        game.tracer = LatencyTracer(os.path.join(tmp, "stop.jsonl"))
+        game.obs_writer.start()
+        trace = game.tracer.start("gift", "Dave")
+        trace.mark("displayed")
+        game._traces_awaiting_write.append(trace)
+        game._state_dirty = True
+        game.stop()
+        with open(os.path.join(tmp, "stop.jsonl"), "r", encoding="utf-8") as f:
+            records = [json.loads(line) for line in f]
+        assert [record["u"] for record in records] == ["Dave"], f"❌ Trace perdue à l'arrêt: {records}"
+        assert "written" in records[0]["ms"], f"❌ Écriture non horodatée: {records[0]}"
+        print("   ✅ PASS\n")
+
+        print("📍 Test 6: Trace d'un like terminée après l'écriture de sa fenêtre")
+        game = GameEngine(GameConfig.with_overrides(LIKE_AGGREGATION_WINDOW=0.1))
+        game.tracer = LatencyTracer()
+        game.character.hp -= 10
+        listener = TikTokListener(game, record_path=None)
+        game.is_running = True
+        game.obs_writer.start()
+        flush_task = asyncio.create_task(game._state_flush_loop())
+        listener.start_consumer()
+        listener.ingest(IngestEvent("like", "Eve", count=5))
+        for _ in range(40):
+            if game.tracer.finished_count:
+                break
+            await asyncio.sleep(0.05)
+        written = game.tracer.get_stats()["stages"].get("applied->written")
+        assert written and written["count"] == 1, f"❌ Like terminé avant l'écriture: {game.tracer.get_stats()}"
+        assert written["max_ms"] >= 90, f"❌ Fenêtre des likes absente de la latence: {written}"
+        game.is_running = False
+        await listener.stop()
+        await flush_task
+        game.obs_writer.stop()
+        print("   ✅ PASS\n")
+
+    print("🎉 TOUS LES TESTS RÉUSSIS !")
+
+
+def test_latency_tracing():
+    asyncio.run(run_latency_tracing_test())
+
+
+if __name__ == "__main__":
+    test_latency_tracing()
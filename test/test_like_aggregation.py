@@ -0,0 +1,93 @@
+"""
+Test du regroupement des likes par fenêtre dans le listener TikTok
+"""
+
+import asyncio
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.config import GameConfig
+from src.game_engine import GameEngine
+from src.tiktok_listener import TikTokListener
+
+
+def make_listener():
+    game = GameEngine()
+    listener = TikTokListener(game)
+    calls = {"like": [], "milestone": []}
+
+    async def handle_like(count=1):
+        calls["like"].append(count)
+
+    async def handle_like_milestone(total_likes, milestones=1):
+        calls["milestone"].append((total_likes, milestones))
+
+    game.handle_like = handle_like
+    game.handle_like_milestone = handle_like_milestone
+    return listener, calls
+
+
+async def run_like_aggregation_test():
+    print("=" * 60)
+    print("🧪 TEST: Likes regroupés par fenêtre")
+    print("=" * 60)
+
+    window = GameConfig.LIKE_AGGREGATION_WINDOW
+    threshold = GameConfig.LIKE_THRESHOLD_FOR_REACTION
+
+    print("\n📍 Test 1: Une rafale de likes = un seul traitement")
+    listener, calls = make_listener()
+    for i in range(40):
+        await listener.add_likes(f"viewer{i % 7}", 1)
+    assert calls["like"] == [], "❌ Likes traités avant la fin de la fenêtre"
+    await asyncio.sleep(window + 0.1)
+    assert calls["like"] == [40], f"❌ Traitements: {calls['like']}"
+    assert listener.total_likes == 40, "❌ Total incorrect"
+    print("   ✅ PASS\n")
+
+    print("📍 Test 2: Plusieurs paliers dans une même fenêtre")
+    listener, calls = make_listener()
+    await listener.add_likes("Alice", threshold * 2 + 10)
+    await listener.flush_likes()
+    assert calls["milestone"] == [(threshold * 2 + 10, 2)], f"❌ Paliers: {calls['milestone']}"
+    print("   ✅ PASS\n")
+
+    print("📍 Test 3: Palier à cheval sur deux fenêtres")
+    listener, calls = make_listener()
+    await listener.add_likes("Alice", threshold - 10)
+    await listener.flush_likes()
+    assert calls["milestone"] == [], "❌ Palier détecté trop tôt"
+    await listener.add_likes("Bob", 15)
+    await listener.flush_likes()
+    assert calls["milestone"] == [(threshold + 5, 1)], f"❌ Paliers: {calls['milestone']}"
+    await listener.add_likes("Bob", threshold - 6)
+    await listener.flush_likes()
+    assert len(calls["milestone"]) == 1, "❌ Palier compté deux fois"
+    print("   ✅ PASS\n")
+
+    print("📍 Test 4: Les likes en attente sont traités à l'arrêt")
+    listener, calls = make_listener()
+    await listener.add_likes("Alice", 3)
+    await listener.stop()
+    assert calls["like"] == [3], "❌ Likes perdus à l'arrêt"
+    print("   ✅ PASS\n")
+
+    print("📍 Test 5: Paliers appliqués au personnage")
+    game = GameEngine()
+    hp_before = game.character.hp = 50
+    await game.handle_like_milestone(threshold * 3, milestones=3)
+    assert game.character.hp == hp_before + 15, "❌ Bonus HP non multiplié"
+    assert game.character.xp == 30, "❌ Bonus XP non multiplié"
+    assert game.api_queue.qsize() == 1, "❌ Une seule réaction attendue"
+    print("   ✅ PASS\n")
+
+    print("🎉 TOUS LES TESTS RÉUSSIS !")
+
+
+def test_like_aggregation():
+    asyncio.run(run_like_aggregation_test())
+
+
+if __name__ == "__main__":
+    test_like_aggregation()
@@ -0,0 +1,114 @@
+"""
+Test des métriques du moteur (/stats en JSON, /metrics au format Prometheus)
+"""
+
+import asyncio
+import json
+import re
+import sys
+import os
+import time
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.game_engine import GameEngine
+from src.ingestion import IngestEvent, IngestionQueue
+from src.metrics import EventRateMeter
+from src.overlay_server import OverlayPushServer
+from src.state_channel import StateChannel
+
+# Ligne d'échantillon Prometheus: nom{labels} valeur
+SAMPLE_LINE = re.compile(r'^[a-z_]+(\{[a-z_]+="[^"]*"(,[a-z_]+="[^"]*")*\})? -?[0-9.e+-]+$|^[a-z_]+.* \+?Inf$')
+
+
+async def http_get(port, target):
+    """Requête GET simple, retourne (en-têtes, corps)"""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(f"GET {target} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode("latin-1"))
+    await writer.drain()
+    response = await asyncio.wait_for(reader.read(), timeout=2)
+    writer.close()
+    headers, body = response.split(b"\r\n\r\n", 1)
+    return headers.decode("latin-1"), body.decode("utf-8")
+
+
+async def run_metrics_test():
+    print("=" * 60)
+    print("🧪 TEST: Métriques du moteur")
+    print("=" * 60)
+
+    print("\n📍 Test 1: Événements par type et par seconde")
+    meter = EventRateMeter(window=10)
+    for _ in range(30):
+        meter.record("like")
+    meter.record("gift")
+    assert meter.totals == {"like": 30, "gift": 1}, f"❌ Totaux: {meter.totals}"
+    assert meter.rates() == {"like": 3.0, "gift": 0.1}, f"❌ Débits: {meter.rates()}"
+    print("   ✅ PASS\n")
+
+    game = GameEngine()
+    game.metrics.ingestion = IngestionQueue()
+    game.metrics.ingestion.offer(IngestEvent("gift", "Alice", gift_name="Rose"))
+    game.metrics.events.record("gift")
+    await game.handle_gift("Alice", "Rose")
+
+    print("📍 Test 2: Retard de la boucle asyncio")
+    game.metrics.loop_lag.interval = 0.02
+    game.is_running = True
+    monitor = asyncio.create_task(game.metrics.loop_lag.run(lambda: game.is_running))
+    await asyncio.sleep(0.05)
+    time.sleep(0.1)  # Bloque la boucle
+    await asyncio.sleep(0.05)
+    game.is_running = False
+    await monitor
+    lag = game.metrics.loop_lag.get_stats()
+    assert lag["max_ms"] >= 50, f"❌ Retard non mesuré: {lag}"
+    print("   ✅ PASS\n")
+
+    server = OverlayPushServer("127.0.0.1", 0, StateChannel(), game.metrics)
+    await server.start()
+
+    print("📍 Test 3: /stats en JSON")
+    headers, body = await http_get(server.port, "/stats")
+    stats = json.loads(body)
+    assert "application/json" in headers, f"❌ En-têtes: {headers}"
+    assert stats["events"]["total"] == {"gift": 1}, f"❌ Événements: {stats['events']}"
+    assert stats["ingestion"]["depth"] == 1, f"❌ Ingestion: {stats['ingestion']}"
+    assert stats["narrations"]["pending"] == 1, f"❌ Narrations: {stats['narrations']}"
+    assert stats["obs_files"]["submitted"] >= 1, f"❌ Fichiers OBS: {stats['obs_files']}"
+    print("   ✅ PASS\n")
+
+    print("📍 Test 4: /metrics au format Prometheus")
+    headers, body = await http_get(server.port, "/metrics")
+    assert "text/plain; version=0.0.4" in headers, f"❌ En-têtes: {headers}"
+    samples = [line for line in body.splitlines() if not line.startswith("#")]
+    bad = [line for line in samples if not SAMPLE_LINE.match(line)]
+    assert not bad, f"❌ Lignes invalides: {bad[:3]}"
+    assert 'survivor_events_total{kind="gift"} 1' in samples, "❌ Compteur d'événements"
+    assert "survivor_ingest_queue_depth 1" in samples, "❌ Profondeur d'ingestion"
+    assert 'survivor_narration_queue_depth{priority="commun"} 1' in samples, "❌ Profondeur des narrations"
+    assert 'survivor_event_loop_lag_seconds_bucket{le="+Inf"}' in body, "❌ Histogramme du retard"
+    buckets = [int(line.rsplit(" ", 1)[1]) for line in samples
+               if line.startswith("survivor_event_loop_lag_seconds_bucket")]
+    assert buckets == sorted(buckets), f"❌ Classes non cumulées: {buckets}"
+    print("   ✅ PASS\n")
+
+    print("📍 Test 5: Coût d'une collecte")
+    started = time.perf_counter()
+    for _ in range(100):
+        game.metrics.render_prometheus()
+        game.metrics.get_stats()
+    per_scrape = (time.perf_counter() - started) / 100
+    assert per_scrape < 0.005, f"❌ Collecte trop lente: {per_scrape * 1000:.2f} ms"
+    print(f"   {per_scrape * 1000:.3f} ms par collecte")
+    print("   ✅ PASS\n")
+
+    server.close()
+    print("🎉 TOUS LES TESTS RÉUSSIS !")
+
+
+def test_metrics():
+    asyncio.run(run_metrics_test())
+
+
+if __name__ == "__main__":
+    test_metrics()
@@ -0,0 +1,129 @@
+"""
+Test de la réserve de noms de monstres (apparition instantanée, remplissage en arrière-plan)
+"""
+
+import asyncio
+import sys
+import os
+import tempfile
+import time
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.game_engine import GameEngine
+from src.monster_names import FALLBACK_MONSTER_NAMES, MonsterNamePool
+
+
+async def run_monster_name_pool_test():
+    print("=" * 60)
+    print("🧪 TEST: Réserve de noms de monstres")
+    print("=" * 60)
+
+    tmp_dir = tempfile.mkdtemp()
+    pool_file = os.path.join(tmp_dir, "monster_names.json")
+
+    game = GameEngine()
+    game.monster_names = MonsterNamePool(pool_file, target_size=3)
+
+    print("\n📍 Test 1: Réserve vide -> nom de secours, sans appel LLM")
+    calls = []
+
+    async def slow_llm():
+        calls.append(1)
+        await asyncio.sleep(5)
+        return "Trop Tard"
+
+    game._request_monster_name = slow_llm
+    start = time.perf_counter()
+    await game.spawn_monster()
+    elapsed = time.perf_counter() - start
+    assert game.current_monster_name in FALLBACK_MONSTER_NAMES, "❌ Nom de secours attendu"
+    assert not calls, "❌ L'apparition a appelé le LLM"
+    assert elapsed < 0.1, f"❌ Apparition trop lente ({elapsed:.3f}s)"
+    print(f"   {game.current_monster_name} en {elapsed * 1000:.2f} ms")
+    print("   ✅ PASS\n")
+
+    print("📍 Test 2: Remplissage uniquement pendant les temps morts")
+    counter = iter(range(100))
+
+    async def fake_llm():
+        return f"Monstre {next(counter)}"
+
+    game._request_monster_name = fake_llm
+    game.is_running = True
+    busy = [True]
+    refill = asyncio.create_task(game.monster_names.refill(
+        game._prefetch_monster_name, is_idle=lambda: not busy[0],
+        is_running=lambda: game.is_running, interval=0.01
+    ))
+    await asyncio.sleep(0.05)
+    assert len(game.monster_names) == 0, "❌ Remplissage pendant une narration"
+    busy[0] = False
+    await asyncio.sleep(0.1)
+    assert len(game.monster_names) == 3, f"❌ Réserve non remplie ({len(game.monster_names)})"
+    print("   ✅ PASS\n")
+
+    print("📍 Test 3: Les noms générés sont servis dans l'ordre")
+    game.current_monster_hp = 0
+    await game.spawn_monster()
+    assert game.current_monster_name == "Monstre 0", "❌ Mauvais nom servi"
+    print("   ✅ PASS\n")
+
+    print("📍 Test 4: La réserve est conservée entre deux lives")
+    await asyncio.sleep(0.1)  # Réserve complétée et sauvegardée
+    game.is_running = False
+    await refill
+    restored = MonsterNamePool(pool_file, target_size=3)
+    assert restored.load() == 3, "❌ Réserve non rechargée"
+    assert restored.take() == "Monstre 1", "❌ Ordre de la réserve perdu"
+    # Un nom servi est retiré du fichier par la boucle de remplissage, sans attendre un nouveau nom
+    running = [True]
+
+    async def no_name():
+        return None
+
+    task = asyncio.create_task(restored.refill(
+        no_name, is_idle=lambda: False, is_running=lambda: running[0], interval=0.01
+    ))
+    await asyncio.sleep(0.05)
+    running[0] = False
+    await task
+    again = MonsterNamePool(pool_file, target_size=3)
+    assert again.load() == 2 and again.take() == "Monstre 2", "❌ Nom servi resservi après redémarrage"
+    # Un nom servi pendant une sauvegarde en cours reste à sauvegarder
+    save = again.save
+    again.save = lambda names=None: (time.sleep(0.05), save(names))
+    saving = asyncio.create_task(again._save_in_background())
+    await asyncio.sleep(0.01)
+    assert again.take() == "Monstre 3", "❌ Ordre de la réserve perdu"
+    await saving
+    assert again._unsaved, "❌ Nom servi pendant la sauvegarde marqué comme sauvegardé"
+    await again._save_in_background()
+    assert MonsterNamePool(pool_file).load() == 0, "❌ Nom servi pendant la sauvegarde resservi"
+    print("   ✅ PASS\n")
+
+    print("📍 Test 5: Ollama indisponible -> pas de nom ajouté")
+    offline = MonsterNamePool(None, target_size=2)
+    game._request_monster_name = GameEngine._request_monster_name.__get__(game)
+    game.llm_client.api_url = "http://127.0.0.1:1/api/generate"
+    running = [True]
+    task = asyncio.create_task(offline.refill(
+        game._prefetch_monster_name, is_idle=lambda: True,
+        is_running=lambda: running[0], interval=0.01
+    ))
+    await asyncio.sleep(0.2)
+    running[0] = False
+    await task
+    await game.llm_client.close()
+    assert len(offline) == 0, "❌ Nom ajouté malgré l'erreur"
+    assert offline.take() in FALLBACK_MONSTER_NAMES, "❌ Nom de secours attendu"
+    print("   ✅ PASS\n")
+
+    print("🎉 TOUS LES TESTS RÉUSSIS !")
+
+
+def test_monster_name_pool():
+    asyncio.run(run_monster_name_pool_test())
+
+
+if __name__ == "__main__":
+    test_monster_name_pool()
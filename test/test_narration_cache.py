@@ -0,0 +1,85 @@
+"""
+Test du cache des narrations (signature normalisée, variantes, LRU, TTL)
+"""
+
+import sys
+import os
+import time
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.narration import GiftNarration, NarrationRequest
+from src.narration_cache import NarrationCache
+
+
+def rose(username, hp=5, monster_name="Gobelin"):
+    """Narration d'une Rose"""
+    monster_info = f" Face à {monster_name} (HP: 100/120)," if monster_name else ""
+    return GiftNarration(username, "Rose", "attaque", hp=hp, xp=10, level=1, levels_gained=0,
+                         monster_info=monster_info, monster_name=monster_name)
+
+
+def run_narration_cache_test():
+    print("=" * 60)
+    print("🧪 TEST: Cache des narrations")
+    print("=" * 60)
+
+    cache = NarrationCache(max_keys=2, variants=2, ttl=60)
+
+    print("\n📍 Test 1: Pas de réutilisation avant d'avoir toutes les variantes")
+    assert cache.get(rose("bob")) is None
+    cache.put(rose("bob"), "Merci @bob ! Je frappe Gobelin avec la rose.")
+    assert cache.get(rose("carol")) is None, "❌ Variante réutilisée trop tôt"
+    cache.put(rose("carol"), "@carol, cette rose fait trembler Gobelin !")
+    print("   ✅ PASS\n")
+
+    print("📍 Test 2: Viewer et monstre substitués au rendu")
+    text = cache.get(rose("alice", monster_name="Dragon"))
+    assert text in ("Merci @alice ! Je frappe Dragon avec la rose.", "@alice, cette rose fait trembler Dragon !"), text
+    assert cache.get(rose("dave")) != cache.get(rose("dave")), "❌ Même variante deux fois de suite"
+    print("   ✅ PASS\n")
+
+    print("📍 Test 3: Signature normalisée (tranche de HP, monstre, fusion)")
+    assert cache.get(rose("erin", hp=6)) is not None, "❌ HP de la même tranche"
+    assert cache.get(rose("erin", hp=0)) is None, "❌ Autre tranche de HP"
+    assert cache.get(rose("erin", monster_name=None)) is None, "❌ Sans monstre"
+    combo = rose("bob")
+    combo.merge(rose("bob"))
+    assert combo.cache_key() is None, "❌ Narration fusionnée mise en cache"
+    assert NarrationRequest("likes").cache_key() is None
+    print("   ✅ PASS\n")
+
+    print("📍 Test 4: Éviction LRU")
+    cache.put(rose("bob", hp=0), "Une rose !")
+    cache.put(rose("bob", monster_name=None), "Une rose sans monstre !")
+    assert cache.get_stats()["keys"] == 2, "❌ Trop de signatures"
+    assert cache.get(rose("zoe")) is None, "❌ La signature la moins récente aurait dû être évincée"
+    print("   ✅ PASS\n")
+
+    print("📍 Test 5: Expiration (TTL)")
+    short = NarrationCache(variants=1, ttl=0.05)
+    short.put(rose("bob"), "Merci @bob !")
+    assert short.get(rose("amy")) == "Merci @amy !"
+    time.sleep(0.06)
+    assert short.get(rose("amy")) is None, "❌ Variante expirée servie"
+    print("   ✅ PASS\n")
+
+    print("📍 Test 6: Nom du viewer cité sans @")
+    bare = NarrationCache(variants=1, ttl=60)
+    bare.put(rose("Bob"), "Merci Bob ! Je frappe Gobelin avec la rose.")
+    assert bare.get(rose("amy")) == "Merci @amy ! Je frappe Gobelin avec la rose.", "❌ Nom seul non substitué"
+    # Nom collé à un autre mot: pas substituable, donc pas mis en cache
+    glued = NarrationCache(variants=1, ttl=60)
+    glued.put(rose("bob"), "Merci @bob ! Bobtastique, cette rose !")
+    assert glued.get(rose("amy")) is None, "❌ Narration citant encore le viewer mise en cache"
+    print("   ✅ PASS\n")
+
+    print(f"📊 Taux de réussite: {cache.hit_rate:.0%}")
+    print("🎉 TOUS LES TESTS RÉUSSIS !")
+
+
+def test_narration_cache():
+    run_narration_cache_test()
+
+
+if __name__ == "__main__":
+    test_narration_cache()
@@ -0,0 +1,68 @@
+"""
+Test de la fusion des narrations de cadeaux en attente (combos)
+"""
+
+import asyncio
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.game_engine import GameEngine
+
+
+async def run_coalescing_test():
+    print("=" * 60)
+    print("🧪 TEST: Fusion des narrations de cadeaux")
+    print("=" * 60)
+
+    game = GameEngine()
+    game.current_monster_name = "Gobelin"
+    game.current_monster_hp = 500
+    game.current_monster_max_hp = 500
+
+    print("\n📍 Test 1: Un combo de 30 Roses = 1 seule narration")
+    for _ in range(30):
+        await game.handle_gift("bob", "Rose")
+    assert game.api_queue.qsize() == 1, f"❌ {game.api_queue.qsize()} narrations en file"
+    prompt = game._pending_narrations[0].prompt
+    assert "@bob t'envoie 30 cadeaux: Rose" in prompt, f"❌ Prompt: {prompt}"
+    print("   ✅ PASS\n")
+
+    print("📍 Test 2: Le même cadeau d'autres viewers est fusionné")
+    await game.handle_gift("alice", "Rose")
+    await game.handle_gift("alice", "Rose")
+    prompt = game._pending_narrations[0].prompt
+    assert game.api_queue.qsize() == 1, "❌ Narration non fusionnée"
+    assert "@bob (x30), @alice (x2) t'envoient 32 cadeaux" in prompt, f"❌ Prompt: {prompt}"
+    assert "Remercie @bob et @alice" in prompt, "❌ Un viewer n'est pas remercié"
+    print("   ✅ PASS\n")
+
+    print("📍 Test 3: Un autre cadeau crée sa propre narration")
+    await game.handle_gift("bob", "Lion")
+    assert game.api_queue.qsize() == 2, "❌ Cadeaux différents fusionnés"
+    print("   ✅ PASS\n")
+
+    print("📍 Test 4: Une narration prise par un worker n'est plus fusionnée")
+    game._start_narration(game._pending_narrations[0])
+    await game.handle_gift("bob", "Rose")
+    assert len(game._pending_narrations) == 3, "❌ Fusion dans une narration déjà lancée"
+    print("   ✅ PASS\n")
+
+    print("📍 Test 5: Sans fusion entre viewers, chacun garde sa narration")
+    game.config = game.config.with_overrides(NARRATION_COALESCE_ACROSS_USERS=False)
+    await game.handle_gift("carol", "Heart")
+    await game.handle_gift("dave", "Heart")
+    await game.handle_gift("dave", "Heart")
+    assert len(game._pending_narrations) == 5, "❌ Fusion entre viewers désactivée non respectée"
+    print("   ✅ PASS\n")
+
+    print(f"📊 {game.narrations_coalesced} narrations économisées")
+    print("🎉 TOUS LES TESTS RÉUSSIS !")
+
+
+def test_narration_coalescing():
+    asyncio.run(run_coalescing_test())
+
+
+if __name__ == "__main__":
+    test_narration_coalescing()
@@ -0,0 +1,84 @@
+"""
+Test de la file de narrations à priorité (cadeaux de valeur d'abord, narrations expirées)
+Le LLM est remplacé par une fonction à latence fixe (sans Ollama)
+"""
+
+import asyncio
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.config import GameConfig
+from src.game_engine import GameEngine
+from src.gift_catalog import get_gift_priority
+
+
+async def run_priority_test():
+    print("=" * 60)
+    print("🧪 TEST: Priorités et dates limites des narrations")
+    print("=" * 60)
+
+    print("\n📍 Test 1: Priorité dérivée de la valeur du cadeau")
+    assert get_gift_priority("Drama Queen") > get_gift_priority("Swan") > get_gift_priority("Rose") > 0
+    print("   ✅ PASS\n")
+
+    game = GameEngine(GameConfig.with_overrides(
+        MIN_ACTION_DISPLAY_SECONDS=0.01,
+        NARRATION_WORKERS=1,
+        NARRATION_MAX_WAIT={**GameConfig.NARRATION_MAX_WAIT, 1: 0.15},  # Les cadeaux communs expirent vite
+    ))
+    game.current_monster_name = "Gobelin"
+    game.current_monster_hp = 5000
+    game.current_monster_max_hp = 5000
+
+    llm_calls = []
+
+    async def fake_llm(prompt, on_partial=None):
+        llm_calls.append(prompt)
+        await asyncio.sleep(0.05)
+        return prompt.split(":")[1].split(".")[0].strip()
+
+    game._call_ollama_api = fake_llm
+    displayed = []
+    write_action = game._write_action
+    game._write_action = lambda action: (displayed.append(action), write_action(action))
+
+    # Plusieurs cadeaux communs, puis un cadeau épique
+    common_gifts = ["Rose", "Heart", "TikTok", "Finger Heart", "Perfume", "Football"]
+    for i, gift_name in enumerate(common_gifts):
+        await game.handle_gift(f"viewer{i}", gift_name)
+    await game.handle_gift("whale", "Drama Queen")
+
+    game.is_running = True
+    worker = asyncio.create_task(game._process_api_queue())
+    while game._pending_narrations:
+        await asyncio.sleep(0.01)
+    game.is_running = False
+    await worker
+
+    print("📍 Test 2: Le cadeau épique passe devant les cadeaux communs")
+    assert displayed[0] == "Drama Queen", f"❌ Ordre d'affichage: {displayed}"
+    print("   ✅ PASS\n")
+
+    print("📍 Test 3: Les narrations expirées ont un texte de secours sans LLM")
+    fallbacks = [text for text in displayed if text.startswith("🎁 Merci")]
+    assert fallbacks, f"❌ Aucune narration expirée: {displayed}"
+    assert len(llm_calls) + len(fallbacks) == len(displayed), "❌ Narration perdue"
+    print(f"   {len(llm_calls)} appels LLM, {len(fallbacks)} textes de secours")
+    print("   ✅ PASS\n")
+
+    print("📍 Test 4: Statistiques par classe de priorité")
+    stats = game.api_queue.get_stats()
+    assert stats["épique"]["dequeued"] == 1 and stats["commun"]["expired"] == len(fallbacks), f"❌ {stats}"
+    assert stats["commun"]["wait_max"] >= stats["épique"]["wait_max"], "❌ Temps d'attente"
+    print("   ✅ PASS\n")
+
+    print("🎉 TOUS LES TESTS RÉUSSIS !")
+
+
+def test_narration_priority():
+    asyncio.run(run_priority_test())
+
+
+if __name__ == "__main__":
+    test_narration_priority()
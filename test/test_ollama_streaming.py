@@ -0,0 +1,90 @@
+"""
+Test du streaming des narrations Ollama (affichage progressif)
+Utilise un faux serveur /api/generate local, sans Ollama
+"""
+
+import asyncio
+import sys
+import os
+import json
+import time
+import threading
+import http.server
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import src.game_engine as game_engine_module
+from src.config import GameConfig
+from src.game_engine import GameEngine
+
+TOKENS = ["Merci ", "@Bob ", "pour ", "la ", "Rose ", "! ", "+5 ", "HP ", "!"]
+
+
+class FakeOllamaHandler(http.server.BaseHTTPRequestHandler):
+    """Renvoie un flux NDJSON chunké à la manière d'Ollama (un token toutes les 50 ms)"""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers["Content-Length"]))
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for token in TOKENS:
+            self._write_chunk({"response": token, "done": False})
+            time.sleep(0.05)
+        self._write_chunk({"response": "", "done": True, "eval_count": len(TOKENS), "eval_duration": 450_000_000})
+        self.wfile.write(b"0\r\n\r\n")
+
+    def _write_chunk(self, data):
+        line = (json.dumps(data) + "\n").encode()
+        self.wfile.write(f"{len(line):x}\r\n".encode() + line + b"\r\n")
+        self.wfile.flush()
+
+    def log_message(self, *args):
+        pass
+
+
+async def run_streaming_test():
+    print("=" * 60)
+    print("🧪 TEST: Streaming des narrations")
+    print("=" * 60)
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), FakeOllamaHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    game_engine_module.OLLAMA_API_URL = f"http://127.0.0.1:{server.server_port}/api/generate"
+
+    game = GameEngine()
+    partials = []
+
+    print("\n📍 Test 1: Le texte partiel arrive avant la fin de la génération")
+    started = time.perf_counter()
+    text = await game._call_ollama_api("test", on_partial=lambda t: partials.append((time.perf_counter() - started, t)))
+    assert text == "".join(TOKENS).strip(), f"❌ Texte incorrect: {text}"
+    assert partials and partials[0][0] < 0.2, "❌ Pas de texte partiel rapide"
+    assert all(text.startswith(p) for _, p in partials), "❌ Texte partiel incohérent"
+    print(f"   1er texte partiel après {partials[0][0] * 1000:.0f} ms ({len(partials)} mises à jour)")
+    print("   ✅ PASS\n")
+
+    print("📍 Test 2: Les mises à jour partielles sont limitées")
+    max_updates = int(0.5 / GameConfig.STREAM_UPDATE_INTERVAL) + 2
+    assert len(partials) <= max_updates, f"❌ Trop de mises à jour: {len(partials)}"
+    print("   ✅ PASS\n")
+
+    print("📍 Test 3: Durée et débit enregistrés")
+    stats = game.last_generation
+    assert stats["tokens"] == len(TOKENS) and stats["tokens_per_sec"] == 20.0, f"❌ Stats: {stats}"
+    assert stats["time_to_first_token"] < stats["duration"], "❌ Time-to-first-token"
+    print("   ✅ PASS\n")
+
+    await game.llm_client.close()
+    server.shutdown()
+    print("🎉 TOUS LES TESTS RÉUSSIS !")
+
+
+def test_ollama_streaming():
+    asyncio.run(run_streaming_test())
+
+
+if __name__ == "__main__":
+    test_ollama_streaming()
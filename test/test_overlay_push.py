@@ -0,0 +1,91 @@
+"""
+Test du push de l'état vers l'overlay (Server-Sent Events, deltas versionnés)
+"""
+
+import asyncio
+import sys
+import os
+import json
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.overlay_server import OverlayPushServer
+from src.state_channel import StateChannel
+
+
+async def read_event(reader):
+    """Lit le prochain événement SSE (type, données)"""
+    event = None
+    while True:
+        line = await asyncio.wait_for(reader.readline(), timeout=2)
+        if line.startswith(b"event: "):
+            event = line[7:].decode("utf-8").strip()
+        elif line.startswith(b"data: "):
+            return event, json.loads(line[6:].decode("utf-8"))
+
+
+async def http_get(port, target):
+    """Requête GET simple, retourne le corps JSON"""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(f"GET {target} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode("latin-1"))
+    await writer.drain()
+    response = await asyncio.wait_for(reader.read(), timeout=2)
+    writer.close()
+    return json.loads(response.split(b"\r\n\r\n", 1)[1])
+
+
+def run_state_channel_test():
+    print("📍 Test 1: Le canal ne versionne que les vrais changements")
+    channel = StateChannel()
+    assert channel.update({"hp": 100, "level": 1})["v"] == 1
+    assert channel.update({"hp": 100, "level": 1}) is None, "❌ Delta sans changement"
+    delta = channel.update({"hp": 90, "level": 1})
+    assert delta == {"v": 2, "since": 1, "changes": {"hp": 90}}, f"❌ Delta incorrect: {delta}"
+    channel.update({"hp": 90, "level": 2})
+    assert channel.changes_since(1)["changes"] == {"hp": 90, "level": 2}, "❌ Changements cumulés"
+    assert "state" in channel.changes_since(-5), "❌ Snapshot attendu pour une version inconnue"
+    print("   ✅ PASS\n")
+
+
+async def run_overlay_push_test():
+    print("=" * 60)
+    print("🧪 TEST: Push de l'état vers l'overlay")
+    print("=" * 60 + "\n")
+
+    run_state_channel_test()
+
+    server = OverlayPushServer("127.0.0.1", 0, StateChannel())
+    await server.start()
+    server.publish({"hp": 100, "level": 1})
+
+    reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+    writer.write(b"GET /events HTTP/1.1\r\nHost: localhost\r\n\r\n")
+    await writer.drain()
+
+    print("📍 Test 2: Un snapshot complet est envoyé à la connexion")
+    event, data = await read_event(reader)
+    assert event == "snapshot" and data == {"v": 1, "state": {"hp": 100, "level": 1}}, "❌ Snapshot"
+    print("   ✅ PASS\n")
+
+    print("📍 Test 3: Seuls les champs modifiés sont poussés")
+    server.publish({"hp": 75, "level": 1})
+    event, data = await read_event(reader)
+    assert event == "delta" and data == {"v": 2, "since": 1, "changes": {"hp": 75}}, "❌ Delta"
+    assert server.client_count == 1, "❌ Client non enregistré"
+    print("   ✅ PASS\n")
+
+    print("📍 Test 4: /state et /state?since=N")
+    assert (await http_get(server.port, "/state"))["state"] == {"hp": 75, "level": 1}
+    assert (await http_get(server.port, "/state?since=1"))["changes"] == {"hp": 75}
+    print("   ✅ PASS\n")
+
+    writer.close()
+    server.close()
+    print("🎉 TOUS LES TESTS RÉUSSIS !")
+
+
+def test_overlay_push():
+    asyncio.run(run_overlay_push_test())
+
+
+if __name__ == "__main__":
+    test_overlay_push()
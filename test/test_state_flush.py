@@ -0,0 +1,109 @@
+"""
+Test de l'écriture regroupée, atomique et hors boucle asyncio des fichiers OBS
+"""
+
+import asyncio
+import sys
+import os
+import json
+import tempfile
+import time
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.config import GameConfig
+from src.game_engine import GameEngine
+from src import obs_writer
+
+
+async def run_state_flush_test():
+    print("=" * 60)
+    print("🧪 TEST: Écriture regroupée des fichiers OBS")
+    print("=" * 60)
+
+    game = GameEngine()
+
+    # Simuler un moteur démarré (boucle de flush active)
+    game.is_running = True
+    writes_before = game.obs_writer.write_count
+
+    print("\n📍 Test 1: 50 cadeaux ne déclenchent aucune écriture avant le flush")
+    for _ in range(50):
+        await game.handle_gift("Bob", "Rose")
+    assert game.obs_writer.write_count == writes_before, "❌ Écriture avant le flush"
+    print("   ✅ PASS\n")
+
+    print("📍 Test 2: Un seul flush écrit l'état final")
+    game.flush_state()
+    assert game.obs_writer.write_count - writes_before <= 3, "❌ Trop d'écritures"
+    with open(GameConfig.OBS_JSON_STATE_FILE, "r", encoding="utf-8") as f:
+        state = json.load(f)
+    assert state["level"] == game.character.level, "❌ État JSON incorrect"
+    assert state["recent_items"] == ["Rose", "Rose", "Rose"], "❌ Objets récents incorrects"
+    assert not os.path.exists(GameConfig.OBS_JSON_STATE_FILE + ".tmp"), "❌ Fichier temporaire restant"
+    print("   ✅ PASS\n")
+
+    print("📍 Test 3: Un état inchangé n'est pas réécrit")
+    writes = game.obs_writer.write_count
+    game._write_stats()
+    game.flush_state()
+    assert game.obs_writer.write_count == writes, "❌ Contenu identique réécrit"
+    print("   ✅ PASS\n")
+
+    print("📍 Test 4: Le thread d'écriture ne garde que le dernier snapshot")
+    game.obs_writer.start()
+    for hp in range(1, 201):
+        game.character.hp = hp
+        game._write_stats()
+        game.flush_state()
+    game.obs_writer.stop()
+    stats = game.obs_writer.get_stats()
+    with open(GameConfig.OBS_JSON_STATE_FILE, "r", encoding="utf-8") as f:
+        state = json.load(f)
+    assert state["hp"] == 200, "❌ Le dernier snapshot n'a pas été écrit"
+    assert stats["pending"] == 0, "❌ Snapshots non écrits à l'arrêt"
+    print(f"   {stats['submitted']} snapshots, {stats['superseded']} remplacés, {stats['written']} écritures")
+    print("   ✅ PASS\n")
+
+    print("📍 Test 5: Fichier verrouillé réessayé par le thread, callbacks toujours appelés")
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "stats.txt")
+        writer = obs_writer.ObsWriter()
+        replace = obs_writer.os.replace
+        locked = True
+
+        def locked_replace(src, dst):
+            if locked:
+                raise PermissionError("fichier verrouillé")
+            replace(src, dst)
+
+        obs_writer.os.replace = locked_replace
+        written = []
+        try:
+            writer.start()
+            writer.submit({path: "HP: 42"}, on_written=lambda: written.append(True))
+            deadline = time.monotonic() + 2.0
+            while not written and time.monotonic() < deadline:
+                time.sleep(0.01)
+            assert written, "❌ Callback non appelé après un échec d'écriture"
+            assert writer.get_stats()["retrying"] == 1, "❌ Fichier en échec oublié"
+            locked = False
+            deadline = time.monotonic() + 3.0
+            while writer.get_stats()["retrying"] and time.monotonic() < deadline:
+                time.sleep(0.05)
+            writer.stop()
+        finally:
+            obs_writer.os.replace = replace
+        with open(path, "r", encoding="utf-8") as f:
+            assert f.read() == "HP: 42", "❌ Fichier non réécrit après déverrouillage"
+    print("   ✅ PASS\n")
+
+    game.is_running = False
+    print("🎉 TOUS LES TESTS RÉUSSIS !")
+
+
+def test_state_flush():
+    asyncio.run(run_state_flush_test())
+
+
+if __name__ == "__main__":
+    test_state_flush()
@@ -0,0 +1,122 @@
+"""
+Test de la sauvegarde de l'état (journal des changements, snapshots, reprise après crash)
+"""
+
+import asyncio
+import glob
+import json
+import sys
+import os
+import tempfile
+import time
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.config import GameConfig
+from src.game_engine import GameEngine
+from src.state_store import SNAPSHOT_FILE, StateStore
+
+
+def segments(directory):
+    """Segments du journal présents dans le dossier"""
+    return glob.glob(os.path.join(directory, "wal-*.jsonl"))
+
+
+async def run_state_store_test():
+    print("=" * 60)
+    print("🧪 TEST: Sauvegarde de l'état")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as directory:
+        print("\n📍 Test 1: Journal des seuls champs modifiés, crash au milieu d'une écriture")
+        store = StateStore(directory, snapshot_every=1000)
+        store.record({"hp": 100, "level": 1, "items": []})
+        store.record({"hp": 90, "level": 1, "items": []}, events=[{"k": "gift", "u": "Alice", "g": "Rose"}])
+        store.record({"hp": 90, "level": 1, "items": []})  # Rien de changé: pas d'entrée
+        with open(segments(directory)[0], "r", encoding="utf-8") as f:
+            records = [json.loads(line) for line in f]
+        assert [r["d"] for r in records] == [{"hp": 100, "level": 1, "items": []}, {"hp": 90}], f"❌ {records}"
+        assert records[1]["e"] == [{"k": "gift", "u": "Alice", "g": "Rose"}], "❌ Événement non journalisé"
+        # Crash simulé: pas de stop(), dernière ligne tronquée
+        store._wal.close()
+        with open(segments(directory)[0], "a", encoding="utf-8") as f:
+            f.write('{"s":3,"t":1.0,"d":{"hp":')
+
+        restored = StateStore(directory)
+        assert restored.load() == {"hp": 90, "level": 1, "items": []}, "❌ État non restauré"
+        assert restored.get_stats()["replayed"] == 2, f"❌ {restored.get_stats()}"
+        print("   ✅ PASS\n")
+
+    with tempfile.TemporaryDirectory() as directory:
+        print("📍 Test 2: Snapshot périodique, reprise = snapshot + fin du journal")
+        store = StateStore(directory, snapshot_every=10)
+        for hp in range(1, 26):
+            store.record({"hp": hp, "level": 1})
+        assert store.get_stats()["snapshots"] == 2, f"❌ {store.get_stats()}"
+        assert len(segments(directory)) == 1, "❌ Segments couverts par le snapshot non supprimés"
+        store._wal.close()  # Crash
+
+        restored = StateStore(directory)
+        assert restored.load() == {"hp": 25, "level": 1}, "❌ État non restauré"
+        assert restored.get_stats()["replayed"] == 5, f"❌ Fin du journal: {restored.get_stats()}"
+        # La reprise continue la numérotation du journal
+        restored.record({"hp": 30, "level": 1})
+        restored.stop()
+        assert StateStore(directory).load() == {"hp": 30, "level": 1}, "❌ Numérotation reprise"
+        print("   ✅ PASS\n")
+
+    with tempfile.TemporaryDirectory() as directory:
+        print("📍 Test 3: Écritures en arrière-plan, snapshot final à l'arrêt")
+        store = StateStore(directory, snapshot_interval=0.05, snapshot_every=100000)
+        store.start()
+        started = time.perf_counter()
+        for hp in range(2000):
+            store.record({"hp": hp, "xp": hp * 2})
+        per_record = (time.perf_counter() - started) / 2000
+        await asyncio.sleep(0.2)
+        assert store.get_stats()["snapshots"] >= 1, "❌ Snapshot périodique absent"
+        store.stop()
+        assert not segments(directory), "❌ Journal non compacté à l'arrêt"
+        with open(os.path.join(directory, SNAPSHOT_FILE), "r", encoding="utf-8") as f:
+            assert json.load(f)["state"] == {"hp": 1999, "xp": 3998}, "❌ Snapshot final"
+        restored = StateStore(directory)
+        assert restored.load() == {"hp": 1999, "xp": 3998}, "❌ État non restauré"
+        assert restored.get_stats()["replayed"] == 0, "❌ Entrées à rejouer après un arrêt propre"
+        print(f"   {per_record * 1e6:.1f} µs par entrée sur la boucle asyncio")
+        print("   ✅ PASS\n")
+
+    with tempfile.TemporaryDirectory() as directory:
+        print("📍 Test 4: Le moteur reprend l'état exact après un crash")
+        config = GameConfig.with_overrides(
+            STATE_DIR=os.path.join(directory, "state"), OVERLAY_PUSH_ENABLED=False, MONSTER_NAME_POOL_FILE=None,
+            OBS_LAST_ACTION_FILE=os.path.join(directory, "last_action.txt"),
+            OBS_STATS_FILE=os.path.join(directory, "stats.txt"),
+            OBS_JSON_STATE_FILE=os.path.join(directory, "game_state.json"),
+        )
+        game = GameEngine(config)
+        await game.handle_gift("Alice", "Lion")
+        await game.handle_gift("Bob", "Swan")
+        await game.handle_like(150)
+        expected = game.get_state()
+        assert expected["level"] > 1 and expected["monster"], f"❌ Scénario: {expected}"
+        game.state_store._wal.close()  # Crash: ni stop() ni snapshot
+
+        started = time.perf_counter()
+        restarted = GameEngine(config)
+        restore_time = time.perf_counter() - started
+        restarted.flush_state()  # Fichiers OBS initiaux (écrits au démarrage du moteur)
+        assert restarted.get_state() == expected, f"❌ {restarted.get_state()} != {expected}"
+        with open(config.OBS_JSON_STATE_FILE, "r", encoding="utf-8") as f:
+            assert json.load(f)["level"] == expected["level"], "❌ Fichiers OBS non mis à jour"
+        restarted.stop()
+        print(f"   Redémarrage en {restore_time * 1000:.1f} ms")
+        print("   ✅ PASS\n")
+
+    print("🎉 TOUS LES TESTS RÉUSSIS !")
+
+
+def test_state_store():
+    asyncio.run(run_state_store_test())
+
+
+if __name__ == "__main__":
+    test_state_store()
@@ -0,0 +1,167 @@
+"""
+Test de l'hébergement de plusieurs lives (configuration par live, pool de narration partagé)
+"""
+
+import asyncio
+import sys
+import os
+import tempfile
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.config import GameConfig
+from src.stream_host import StreamHost, overlay_url
+
+GIFTS = ["Rose", "Heart", "Perfume", "Swan", "Lion"]
+
+
+async def run_stream_host_test():
+    print("=" * 60)
+    print("🧪 TEST: Hébergement de plusieurs lives")
+    print("=" * 60)
+
+    print("\n📍 Test 1: Configuration dérivée")
+    config = GameConfig.with_overrides(MONSTER_ATTACK_DAMAGE=5)
+    assert config.MONSTER_ATTACK_DAMAGE == 5, "❌ Surcharge non appliquée"
+    assert GameConfig.MONSTER_ATTACK_DAMAGE == 25, "❌ GameConfig modifiée"
+    assert config.MAX_HP == GameConfig.MAX_HP, "❌ Valeur héritée perdue"
+    try:
+        GameConfig.with_overrides(MONSTER_ATACK_DAMAGE=5)
+        assert False, "❌ Paramètre inconnu accepté"
+    except ValueError:
+        pass
+    print("   ✅ PASS\n")
+
+    base = GameConfig.with_overrides(
+        OVERLAY_PUSH_ENABLED=False, MONSTER_NAME_POOL_FILE=None, NARRATION_CACHE_ENABLED=False,
+        NARRATION_COALESCE_ACROSS_USERS=False
+    )
+
+    with tempfile.TemporaryDirectory() as streams_dir:
+        print("📍 Test 2: Un dossier, un port et des surcharges par live")
+        host = StreamHost(workers=1, base_config=base, streams_dir=streams_dir)
+        alice = host.add_stream("alice", "@alice")
+        bob = host.add_stream("bob", "@bob", overrides={"MONSTER_ATTACK_DAMAGE": 10})
+        assert alice.engine.config.OBS_STATS_FILE == os.path.join(streams_dir, "alice", "stats.txt")
+        assert os.path.isdir(os.path.join(streams_dir, "bob")), "❌ Dossier du live non créé"
+        assert alice.engine.config.OVERLAY_PUSH_PORT != bob.engine.config.OVERLAY_PUSH_PORT
+        assert overlay_url("streams/bob/game_state.json", 8002).endswith(
+            "overlay.html?push=8002&state=streams/bob/game_state.json"), "❌ URL de l'overlay"
+        assert bob.engine.config.MONSTER_ATTACK_DAMAGE == 10, "❌ Surcharge du live ignorée"
+        assert alice.engine.config.MONSTER_ATTACK_DAMAGE == 25, "❌ Surcharge partagée entre lives"
+        assert alice.engine.llm_client is bob.engine.llm_client is host.llm_client, "❌ Client HTTP non partagé"
+        assert alice.listener.unique_id == "@alice", f"❌ Compte écouté: {alice.listener.unique_id}"
+        try:
+            host.add_stream("alice", "@autre")
+            assert False, "❌ Nom de live dupliqué accepté"
+        except ValueError:
+            pass
+        print("   ✅ PASS\n")
+
+        print("📍 Test 3: Tour de rôle entre les lives")
+        generated = []
+
+        def fake_llm(name):
+            async def call(prompt, on_partial=None):
+                generated.append(name)
+                await asyncio.sleep(0.01)
+                return f"Narration {name}"
+            return call
+
+        for stream in (alice, bob):
+            stream.engine._call_ollama_api = fake_llm(stream.name)
+            stream.engine.is_running = True
+        for i in range(10):
+            await alice.engine.handle_gift(f"viewer{i}", GIFTS[i % len(GIFTS)])
+        for i in range(2):
+            await bob.engine.handle_gift(f"viewer{i}", GIFTS[i])
+
+        pool_task = asyncio.create_task(host.pool.run())
+        while len(generated) < 12:
+            await asyncio.sleep(0.01)
+        host.pool.stop()
+        await pool_task
+        assert generated[:4].count("bob") == 2, f"❌ Live bob mis en attente: {generated}"
+        stats = host.pool.get_stats()
+        assert [s["completed"] for s in stats] == [10, 2], f"❌ Jobs traités: {stats}"
+        print("   ✅ PASS\n")
+
+        for stream in (alice, bob):
+            stream.engine.is_running = False
+            stream.engine.obs_writer.stop()
+
+    print("📍 Test 4: Générations simultanées max par live")
+    with tempfile.TemporaryDirectory() as streams_dir:
+        host = StreamHost(workers=3, max_per_stream=1, base_config=base, streams_dir=streams_dir)
+        stream = host.add_stream("solo", "@solo")
+        active = 0
+        peak = 0
+
+        async def slow_llm(prompt, on_partial=None):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.02)
+            active -= 1
+            return "Narration"
+
+        stream.engine._call_ollama_api = slow_llm
+        stream.engine.is_running = True
+        for i in range(4):
+            await stream.engine.handle_gift(f"viewer{i}", GIFTS[i])
+
+        pool = host.pool
+        pool_task = asyncio.create_task(pool.run())
+        while pool.get_stats()[0]["completed"] < 4:
+            await asyncio.sleep(0.01)
+        pool.stop()
+        await pool_task
+        assert peak == 1, f"❌ {peak} générations simultanées pour un live"
+        stream.engine.is_running = False
+        stream.engine.obs_writer.stop()
+    print("   ✅ PASS\n")
+
+    print("📍 Test 5: Noms de monstres générés par le pool, après les narrations")
+    with tempfile.TemporaryDirectory() as streams_dir:
+        host = StreamHost(workers=1, max_per_stream=1, base_config=base, streams_dir=streams_dir)
+        stream = host.add_stream("solo", "@solo")
+        calls = []
+
+        async def fake_llm(prompt, on_partial=None):
+            calls.append("narration")
+            await asyncio.sleep(0.01)
+            return "Narration"
+
+        async def fake_monster_name():
+            calls.append("monstre")
+            return "Gobelin"
+
+        stream.engine._call_ollama_api = fake_llm
+        stream.engine._request_monster_name = fake_monster_name
+        stream.engine.is_running = True
+        for i in range(3):
+            await stream.engine.handle_gift(f"viewer{i}", GIFTS[i])
+
+        pool = host.pool
+        pool_task = asyncio.create_task(pool.run())
+        await asyncio.sleep(0)  # Pool démarré, première narration en cours
+        prefetch = asyncio.create_task(stream.engine._prefetch_monster_name())
+        assert await prefetch == "Gobelin", "❌ Nom non généré"
+        assert calls == ["narration"] * 3 + ["monstre"], f"❌ Ordre: {calls}"
+        assert pool.background_count == 1, "❌ Génération hors du pool"
+        # Pool arrêté: pas de génération de fond en attente
+        pool.stop()
+        await pool_task
+        assert await stream.engine._prefetch_monster_name() is None, "❌ Génération en attente après l'arrêt"
+        stream.engine.is_running = False
+        stream.engine.obs_writer.stop()
+    print("   ✅ PASS\n")
+
+    print("🎉 TOUS LES TESTS RÉUSSIS !")
+
+
+def test_stream_host():
+    asyncio.run(run_stream_host_test())
+
+
+if __name__ == "__main__":
+    test_stream_host()
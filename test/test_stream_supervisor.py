@@ -0,0 +1,104 @@
+"""
+Test de la répartition des lives sur plusieurs processus (placement, relance, métriques agrégées)
+Les processus font tourner un faux hôte: ni TikTok ni Ollama ne sont nécessaires
+"""
+
+import asyncio
+import sys
+import os
+import time
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.stream_supervisor import SHARD_STATE_DIR, StreamSupervisor
+
+
+def fake_shard(conn, specs, workers, max_per_stream):
+    """Faux processus: un événement par live, répond aux commandes du superviseur"""
+    specs = list(specs)
+    while True:
+        command, payload = conn.recv()
+        if command == "add":
+            specs.append(payload)
+        elif command == "stats":
+            conn.send(("stats", {
+                spec["name"]: {"running": True, "events": {"gift": 1}, "events_per_second": 1.0,
+                               "narrations": {"pending": 1}}
+                for spec in specs
+            }))
+        elif command == "stop":
+            return
+
+
+def crashing_shard(conn, specs, workers, max_per_stream):
+    """Faux processus qui tombe aussitôt"""
+    sys.exit(3)
+
+
+async def wait_until(condition, timeout=20.0):
+    """Attend qu'une condition soit vraie (False après timeout)"""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        await asyncio.sleep(0.05)
+    return True
+
+
+async def run_stream_supervisor_test():
+    print("=" * 60)
+    print("🧪 TEST: Répartition des lives sur plusieurs processus")
+    print("=" * 60)
+
+    print("\n📍 Test 1: Placement sur le processus le moins chargé")
+    supervisor = StreamSupervisor(processes=2)
+    supervisor.shard_main = fake_shard
+    placed = [supervisor.add_stream({"name": f"live{i}", "username": f"@live{i}"}) for i in range(3)]
+    assert placed == [0, 1, 0], f"❌ Placement: {placed}"
+    ports = [spec["overlay_port"] for shard in supervisor.shards for spec in shard.specs]
+    assert len(set(ports)) == 3, f"❌ Ports d'overlay en double: {ports}"
+    state_dirs = [spec["config"]["STATE_DIR"] for spec in supervisor.shards[0].specs]
+    assert state_dirs == [os.path.join(SHARD_STATE_DIR, "live0"), os.path.join(SHARD_STATE_DIR, "live2")], \
+        f"❌ État des lives non sauvegardé: {state_dirs}"
+    try:
+        supervisor.add_stream({"name": "live0", "username": "@autre"})
+        assert False, "❌ Nom de live dupliqué accepté"
+    except ValueError:
+        pass
+    print("   ✅ PASS\n")
+
+    print("📍 Test 2: Métriques agrégées, live ajouté en cours de route")
+    run_task = asyncio.create_task(supervisor.run())
+    assert await wait_until(lambda: len(supervisor.get_stats()["streams"]) == 3), "❌ Métriques non reçues"
+    assert supervisor.add_stream({"name": "live3", "username": "@live3"}) == 1, "❌ Placement en cours de route"
+    assert await wait_until(lambda: len(supervisor.get_stats()["streams"]) == 4), "❌ Live ajouté absent"
+    totals = supervisor.get_stats()["totals"]
+    assert totals["events"] == {"gift": 4}, f"❌ Totaux: {totals}"
+    assert totals["narrations_pending"] == 4 and totals["running"] == 4, f"❌ Totaux: {totals}"
+    await supervisor.stop()
+    await run_task
+    assert not any(shard.alive for shard in supervisor.shards), "❌ Processus encore actifs"
+    print("   ✅ PASS\n")
+
+    print("📍 Test 3: Relance d'un processus tombé avec ses lives")
+    supervisor = StreamSupervisor(processes=1)
+    supervisor.shard_main = crashing_shard
+    supervisor.restart_delay = 0.05
+    supervisor.add_stream({"name": "fragile", "username": "@fragile"})
+    run_task = asyncio.create_task(supervisor.run())
+    shard = supervisor.shards[0]
+    assert await wait_until(lambda: shard.restarts >= 2), "❌ Processus non relancé"
+    assert [spec["name"] for spec in shard.specs] == ["fragile"], f"❌ Lives perdus: {shard.specs}"
+    assert shard.crashes >= 2, "❌ Délai de relance non augmenté"
+    await supervisor.stop()
+    await run_task
+    print("   ✅ PASS\n")
+
+    print("🎉 TOUS LES TESTS RÉUSSIS !")
+
+
+def test_stream_supervisor():
+    asyncio.run(run_stream_supervisor_test())
+
+
+if __name__ == "__main__":
+    test_stream_supervisor()